@@ -1,8 +1,25 @@
 # create_admin.py
+"""Alta de usuarios.
+
+Sin argumentos crea el usuario admin inicial. Con ``--csv`` da de alta en bloque
+los usuarios de un archivo con columnas ``nombre,user_name,password,perfil``
+(por ejemplo los cajeros de una sucursal nueva). Los hashes de bcrypt se
+calculan en paralelo en todos los núcleos y los usuarios se insertan en una
+sola transacción.
+
+Uso:
+    python a.py
+    python a.py --csv cajeros.csv [--workers 4]
+"""
+import argparse
+import csv
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from db.connection import Connection
 from models.user import User
 from db.user_dao import UserDAO
+from config import Config
 import bcrypt
 
 def create_admin_user():
@@ -33,9 +50,75 @@ def create_admin_user():
         print("Error al crear el usuario admin")
         return False
 
-if __name__ == "__main__":
+def hash_password(password: str, rounds: int) -> str:
+    # Función de módulo para que ProcessPoolExecutor pueda enviarla a otro proceso
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
+
+def read_users_csv(path: str):
+    """Lee el CSV y regresa [(número de línea, User con contraseña en claro)]."""
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        faltantes = {'nombre', 'user_name', 'password', 'perfil'} - set(reader.fieldnames or [])
+        if faltantes:
+            raise ValueError(f"Faltan columnas en el CSV: {', '.join(sorted(faltantes))}")
+        return [
+            (linea, User(
+                nombre=(row['nombre'] or '').strip(),
+                user_name=(row['user_name'] or '').strip(),
+                password=row['password'] or '',
+                perfil=(row['perfil'] or '').strip()
+            ))
+            for linea, row in enumerate(reader, start=2)
+        ]
+
+def create_users_from_csv(path: str, workers: int) -> bool:
+    try:
+        filas = read_users_csv(path)
+    except (OSError, ValueError) as e:
+        print(f"Error al leer {path}: {e}")
+        return False
+
+    if not filas:
+        print("El archivo no contiene usuarios")
+        return False
+
+    # Solo se hashean las filas válidas; las demás se reportan igual que en save_many
+    errores = {linea: "datos inválidos" for linea, user in filas if not user.validate()}
+    validas = [(linea, user) for linea, user in filas if linea not in errores]
+
+    print(f"Calculando {len(validas)} hashes (costo {Config.BCRYPT_ROUNDS}) con {workers} procesos...")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        hashes = executor.map(
+            hash_password,
+            [user.password for _, user in validas],
+            [Config.BCRYPT_ROUNDS] * len(validas)
+        )
+        for (_, user), hashed in zip(validas, hashes):
+            user.password = hashed
+
+    fallidos = UserDAO().save_many([user for _, user in validas])
+    for i, motivo in fallidos.items():
+        errores[validas[i][0]] = motivo
+
+    for linea, user in filas:
+        if linea in errores:
+            print(f"  Línea {linea} ({user.user_name or 'sin user_name'}): {errores[linea]}")
+    print(f"Usuarios creados: {len(filas) - len(errores)} de {len(filas)}")
+    return not errores
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Alta del usuario admin o de usuarios en bloque desde CSV")
+    parser.add_argument('--csv', help="archivo con columnas nombre,user_name,password,perfil")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="procesos para calcular los hashes (por omisión, todos los núcleos)")
+    args = parser.parse_args()
+
+    if args.csv:
+        print(f"Creando usuarios desde {args.csv}...")
+        return 0 if create_users_from_csv(args.csv, args.workers) else 1
+
     print("Creando usuario administrador inicial...")
-    if create_admin_user():
-        sys.exit(0)
-    else:
-        sys.exit(1)
\ No newline at end of file
+    return 0 if create_admin_user() else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
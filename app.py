@@ -1,23 +1,95 @@
+import time
+_T0 = time.perf_counter()  # antes de cualquier otra importación, para --profile-startup
+
+import argparse
 import tkinter as tk
 from tkinter import ttk
 from login import LoginForm
 from config import Config
+from views.styles import THEME, setup_styles
+from db.async_dao import submit
+
+def warm_up() -> None:
+    """Carga los módulos pesados y abre el pool (con migraciones) fuera del hilo de Tk."""
+    import bcrypt  # noqa: F401
+    import db.user_dao  # noqa: F401
+    from db.connection import Connection
+    Connection()
+
+def start_metrics() -> None:
+    """Expone /metrics en METRICS_PORT (0 lo deshabilita) en un hilo aparte del de Tk."""
+    if Config.METRICS_PORT <= 0:
+        return
+    import metrics
+    try:
+        metrics.start_http_server(Config.METRICS_PORT, Config.METRICS_HOST)
+    except OSError as e:
+        print(f"Error al iniciar el servidor de métricas: {e}")
+
+class StartupProfile:
+    """Registra los tiempos de arranque desde el inicio del proceso."""
+
+    def __init__(self, t0: float):
+        self.t0 = t0
+        self.marks = {}
+        self.reported = False
+
+    def mark(self, nombre: str) -> None:
+        self.marks.setdefault(nombre, (time.perf_counter() - self.t0) * 1000)
+        if not self.reported and 'primer cuadro' in self.marks and 'interactivo' in self.marks:
+            self.reported = True
+            self.report()
+
+    def report(self) -> None:
+        print("Perfil de arranque:")
+        for nombre, ms in sorted(self.marks.items(), key=lambda m: m[1]):
+            print(f"  {nombre:<16} {ms:8.1f} ms")
 
 class App:
-    def __init__(self):
+    def __init__(self, profile_startup: bool = False):
+        profile = StartupProfile(_T0) if profile_startup else None
+        if profile:
+            profile.mark('importaciones')
+
+        start_metrics()
+
+        # La base de datos se prepara mientras se dibuja la ventana de inicio de sesión
+        db_ready = submit(warm_up)
+
         self.root = tk.Tk()
         self.root.title(Config.APP_TITLE)
         self.root.geometry("400x300")
-        self.root.configure(bg=Config.THEME['bg'])
+        self.root.configure(bg=THEME['bg'])
         
         # Configurar el estilo
         style = ttk.Style()
-        Config.setup_styles(style)
+        setup_styles(style)
         
         # Mostrar el formulario de login
-        LoginForm(self.root)
+        login = LoginForm(self.root, db_ready)
+        if profile:
+            login.bind('<Map>', lambda event: profile.mark('primer cuadro'), add='+')
+            login.on_interactive = lambda: profile.mark('interactivo')
         
         self.root.mainloop()
 
 if __name__ == "__main__":
-    App()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=Config.APP_TITLE)
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="reporta el tiempo al primer cuadro y hasta que el login es utilizable")
+    parser.add_argument('--trace', metavar='ARCHIVO',
+                        help="escribe una traza (Perfetto / chrome://tracing) de callbacks, DAOs y SQL")
+    parser.add_argument('--profile-form', metavar='NOMBRE', action='append', default=[],
+                        help="perfila cada apertura del formulario (p. ej. VentaForm; '*' para todos)")
+    parser.add_argument('--sample-ms', type=float, default=0,
+                        help="muestreo continuo de pilas cada N ms (bajo costo)")
+    args = parser.parse_args()
+    if args.profile_form or args.sample_ms:
+        import profiling
+        profiling.form_names.update(args.profile_form)
+        if args.sample_ms:
+            profiling.start_sampling(args.sample_ms)
+    if args.trace:
+        import tracing
+        tracing.enable(args.trace)
+    App(profile_startup=args.profile_startup)
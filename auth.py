@@ -0,0 +1,70 @@
+# auth.py
+"""Autenticación fuera del hilo de la interfaz.
+
+bcrypt es deliberadamente lento (cientos de ms por intento con factores de costo
+de producción) y libera el GIL mientras calcula, así que basta un ejecutor de
+hilos propio para que la ventana siga respondiendo. Se mantiene separado del
+ejecutor de la base de datos para que un cambio de turno con varios intentos
+simultáneos no deje sin hilos a las consultas.
+"""
+import dataclasses
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+from models.user import User
+import metrics
+
+MAX_WORKERS = 2
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="bcrypt")
+        return _executor
+
+
+def authenticate(username: str, password: str) -> Optional[User]:
+    """Devuelve el usuario si las credenciales son válidas, o None.
+
+    Si el hash se generó con un costo distinto a ``Config.BCRYPT_ROUNDS`` se
+    programa su recálculo en segundo plano (solo aquí se conoce la contraseña).
+    """
+    from db.user_dao import UserDAO
+
+    inicio = time.perf_counter()
+    try:
+        user = UserDAO().get_by_username(username)
+        if user and user.check_password(password):
+            if user.needs_rehash():
+                get_executor().submit(rehash_password, dataclasses.replace(user), password)
+            return user
+        return None
+    finally:
+        metrics.LOGIN_SECONDS.observe(time.perf_counter() - inicio)
+
+
+def rehash_password(user: User, password: str) -> bool:
+    """Recalcula el hash con el costo configurado y lo guarda con ``UserDAO.update_password``.
+
+    Solo se guarda si el hash en la base sigue siendo el que se verificó; si
+    mientras tanto alguien cambió la contraseña, se respeta ese cambio.
+    """
+    from db.user_dao import UserDAO
+
+    old_hash = user.password
+    user.set_password(password)
+    if not UserDAO().update_password(user.usuario_id, user.password, old_hash):
+        print(f"No se actualizó el hash del usuario {user.user_name}: la contraseña cambió o hubo un error")
+        return False
+    return True
+
+
+def authenticate_async(username: str, password: str) -> Future:
+    """Como ``authenticate``, pero regresa un Future resuelto en un hilo del ejecutor."""
+    return get_executor().submit(authenticate, username, password)
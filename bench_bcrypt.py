@@ -0,0 +1,116 @@
+# bench_bcrypt.py
+"""Mide la latencia de inicio de sesión para distintos factores de costo de bcrypt.
+
+Para cada costo guarda un usuario con un hash de ese costo y mide
+``auth.authenticate_async`` hasta tener el resultado, el mismo camino que sigue
+la ventana de inicio de sesión: consulta del usuario y ``checkpw`` en el
+ejecutor de bcrypt, incluida la espera por un hilo libre. Reporta promedio y p95
+con una sola terminal y el tiempo por intento cuando ``--concurrencia``
+terminales inician sesión a la vez (cambio de turno). Al final sugiere el costo
+más alto cuyo p95 concurrente queda bajo ``--objetivo-ms``.
+
+Usa una base SQLite en memoria; no necesita servidor de base de datos.
+
+Uso:
+    python bench_bcrypt.py
+    python bench_bcrypt.py --costos 10 11 12 13 --repeticiones 10 --concurrencia 4 --objetivo-ms 300
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Antes de importar config: el benchmark nunca toca la base configurada
+os.environ['DB_BACKEND'] = 'sqlite'
+os.environ['SQLITE_PATH'] = ':memory:'
+
+import bcrypt
+from config import Config
+from db.user_dao import UserDAO
+from models.user import User
+import auth
+
+PASSWORD = "contrasena-de-prueba"
+
+
+def percentil(muestras: list, p: float) -> float:
+    ordenadas = sorted(muestras)
+    indice = min(len(ordenadas) - 1, max(0, round(p / 100 * len(ordenadas)) - 1))
+    return ordenadas[indice]
+
+
+def medir_login(user_name: str) -> float:
+    inicio = time.perf_counter()
+    if auth.authenticate_async(user_name, PASSWORD).result() is None:
+        raise RuntimeError(f"No se pudo autenticar a {user_name}")
+    return (time.perf_counter() - inicio) * 1000
+
+
+def crear_usuario(costo: int) -> str:
+    user = User(nombre=f"Costo {costo}", user_name=f"bench{costo}", perfil="cajero")
+    user.set_password(PASSWORD, rounds=costo)
+    if not UserDAO().save(user):
+        raise RuntimeError(f"No se pudo guardar el usuario {user.user_name}")
+    return user.user_name
+
+
+def medir_costo(costo: int, repeticiones: int, concurrencia: int) -> dict:
+    inicio = time.perf_counter()
+    bcrypt.hashpw(PASSWORD.encode('utf-8'), bcrypt.gensalt(rounds=costo))
+    hash_ms = (time.perf_counter() - inicio) * 1000
+
+    # Con el costo configurado igual al del hash, authenticate no programa recálculos
+    Config.BCRYPT_ROUNDS = costo
+    user_name = crear_usuario(costo)
+
+    secuencial = [medir_login(user_name) for _ in range(repeticiones)]
+
+    # Cada terminal hace `repeticiones` intentos al mismo tiempo que las demás
+    with ThreadPoolExecutor(max_workers=concurrencia) as terminales:
+        concurrente = list(terminales.map(medir_login, [user_name] * (repeticiones * concurrencia)))
+
+    return {
+        'costo': costo,
+        'hash_ms': hash_ms,
+        'promedio_ms': statistics.mean(secuencial),
+        'p95_ms': percentil(secuencial, 95),
+        'p95_concurrente_ms': percentil(concurrente, 95),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--costos', type=int, nargs='+', default=list(range(8, 15)),
+                        help="factores de costo a medir (por omisión 8 a 14)")
+    parser.add_argument('--repeticiones', type=int, default=5,
+                        help="intentos medidos por costo y por terminal")
+    parser.add_argument('--concurrencia', type=int, default=4,
+                        help="terminales iniciando sesión al mismo tiempo")
+    parser.add_argument('--objetivo-ms', type=float, default=250,
+                        help="latencia máxima aceptable por intento (p95 concurrente)")
+    args = parser.parse_args()
+
+    print(f"{'costo':>5} | {'hash ms':>9} | {'login ms':>10} | {'p95 ms':>9} | "
+          f"{'p95 x' + str(args.concurrencia) + ' ms':>12}")
+    resultados = []
+    for costo in sorted(args.costos):
+        r = medir_costo(costo, args.repeticiones, args.concurrencia)
+        resultados.append(r)
+        print(f"{r['costo']:>5} | {r['hash_ms']:>9.1f} | {r['promedio_ms']:>10.1f} | "
+              f"{r['p95_ms']:>9.1f} | {r['p95_concurrente_ms']:>12.1f}")
+
+    aceptables = [r['costo'] for r in resultados if r['p95_concurrente_ms'] <= args.objetivo_ms]
+    print()
+    if not aceptables:
+        print(f"Ningún costo queda bajo {args.objetivo_ms:.0f} ms con {args.concurrencia} terminales")
+        return 1
+
+    print(f"Costo sugerido: {max(aceptables)} "
+          f"(p95 <= {args.objetivo_ms:.0f} ms con {args.concurrencia} terminales simultáneas)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
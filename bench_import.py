@@ -0,0 +1,86 @@
+# bench_import.py
+"""Mide el tiempo de importación en frío de los módulos de línea de comandos.
+
+Ejecuta ``python -X importtime -c "import <módulo>"`` en un proceso nuevo por
+cada repetición y reporta la mediana del tiempo acumulado del módulo, el total
+de importaciones y si se cargó tkinter. Sirve para verificar que los DAOs y las
+herramientas sin interfaz (a.py, explain_queries.py, trabajos por lotes) no
+arrastren el toolkit gráfico.
+
+Uso:
+    python bench_import.py
+    python bench_import.py --repeticiones 10 db a config
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+MODULOS = ["config", "db", "db.user_dao", "a", "explain_queries"]
+TOOLKITS = ("tkinter", "_tkinter")
+
+
+def importtime(modulo: str) -> dict:
+    """Corre un proceso nuevo y devuelve {módulo importado: (µs acumulados, nivel)}.
+
+    El nivel es la sangría del nombre en la salida de -X importtime: 1 para las
+    importaciones de primer nivel.
+    """
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        capture_output=True, text=True
+    )
+    if proceso.returncode != 0:
+        raise RuntimeError(proceso.stderr.strip().splitlines()[-1])
+
+    tiempos = {}
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith("import time:") or "|" not in linea:
+            continue
+        _, acumulado, nombre = linea[len("import time:"):].split("|")
+        if acumulado.strip().isdigit():
+            nivel = len(nombre) - len(nombre.lstrip())
+            tiempos[nombre.strip()] = (int(acumulado), nivel)
+    return tiempos
+
+
+def medir(modulo: str, repeticiones: int) -> dict:
+    corridas = [importtime(modulo) for _ in range(repeticiones)]
+    ultima = corridas[-1]
+    return {
+        'modulo': modulo,
+        'ms': statistics.median(c.get(modulo, (0, 0))[0] for c in corridas) / 1000,
+        'total_ms': statistics.median(sum(us for us, nivel in c.values() if nivel == 1) for c in corridas) / 1000,
+        'tk': any(t in ultima for t in TOOLKITS),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('modulos', nargs='*', default=MODULOS)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'módulo':<18} | {'import ms':>10} | {'proceso ms':>10} | tkinter")
+    con_tk = []
+    for modulo in args.modulos:
+        try:
+            r = medir(modulo, args.repeticiones)
+        except RuntimeError as e:
+            print(f"{modulo:<18} | error: {e}")
+            con_tk.append(modulo)
+            continue
+        print(f"{r['modulo']:<18} | {r['ms']:>10.1f} | {r['total_ms']:>10.1f} | {'sí' if r['tk'] else 'no'}")
+        if r['tk']:
+            con_tk.append(modulo)
+
+    print()
+    if con_tk:
+        print("Módulos que cargan tkinter o fallan: " + ", ".join(con_tk))
+        return 1
+    print("Ningún módulo sin interfaz carga tkinter")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,50 +1,34 @@
 # config.py (farmacia)
+# Solo configuración; los estilos de la interfaz están en views/styles.py para que
+# los DAOs y las herramientas de línea de comandos no dependan de tkinter.
 import os
-from tkinter import ttk
 from dotenv import load_dotenv
-from typing import TypedDict
 
 load_dotenv()
 
-class ThemeConfig(TypedDict):
-    bg: str
-    fg: str
-    font: tuple[str, int]
-    button_bg: str
-    button_fg: str
-    error: str
-    success: str
-
 class Config:
     DB_HOST = os.getenv('DB_HOST', 'localhost')
     DB_USER = os.getenv('DB_USER', 'root')
     DB_PASSWORD = os.getenv('DB_PASSWORD', '')
     DB_NAME = os.getenv('DB_NAME', 'farmacia_db')
+    DB_BACKEND = os.getenv('DB_BACKEND', 'mysql')
+    SQLITE_PATH = os.getenv('SQLITE_PATH', 'farmacia.db')
+    DB_POOL_MIN = int(os.getenv('DB_POOL_MIN', '1'))
+    DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', '5'))
+    DB_POOL_IDLE_TIMEOUT = float(os.getenv('DB_POOL_IDLE_TIMEOUT', '300'))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '10'))
+    DB_POOL_VALIDATE_AFTER = float(os.getenv('DB_POOL_VALIDATE_AFTER', '5'))
+    CACHE_TTL = float(os.getenv('CACHE_TTL', '60'))
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '1024'))
+    SEARCH_INDEX_TTL = float(os.getenv('SEARCH_INDEX_TTL', '600'))
+    SEARCH_INDEX_WAIT = float(os.getenv('SEARCH_INDEX_WAIT', '10'))
+    BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', '12'))
+    DB_INSTRUMENTATION = os.getenv('DB_INSTRUMENTATION', '0') == '1'
+    DB_SLOW_QUERY_MS = float(os.getenv('DB_SLOW_QUERY_MS', '200'))
+    METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))
+    METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+    TRACE_FILE = os.getenv('TRACE_FILE', '')
+    PROFILE_FORMS = os.getenv('PROFILE_FORMS', '')
+    PROFILE_SAMPLE_MS = float(os.getenv('PROFILE_SAMPLE_MS', '0'))
+    PROFILE_DIR = os.getenv('PROFILE_DIR', 'perfiles')
     APP_TITLE = "Sistema de Farmacia"
-    
-    THEME: ThemeConfig = {
-        'bg': '#1E1E1E',
-        'fg': '#E0E0E0',
-        'font': ('Segoe UI', 11),
-        'button_bg': '#4CAF50',  # Verde farmacia
-        'button_fg': '#000000',
-        'error': '#FF5252',
-        'success': '#69F0AE',
-        'warning': '#FFD740',
-        'accent': '#8BC34A',     # Verde claro
-        'border': '#424242',
-    }
-    
-    @staticmethod
-    def setup_styles(style: ttk.Style) -> None:
-        style.configure('TFrame', background=Config.THEME['bg'])
-        style.configure('TLabel', 
-                      background=Config.THEME['bg'],
-                      foreground=Config.THEME['fg'],
-                      font=Config.THEME['font'])
-        style.configure('TButton',
-                      background=Config.THEME['button_bg'],
-                      foreground=Config.THEME['button_fg'],
-                      font=Config.THEME['font'])
-        style.configure('Error.TLabel', foreground=Config.THEME['error'])
-        style.configure('Success.TLabel', foreground=Config.THEME['success'])
\ No newline at end of file
@@ -1,17 +1,24 @@
-from .articulo_dao import ArticuloDAO
-from .compra_dao import CompraDAO
-from .proveedor_dao import ProveedorDAO
-from .user_dao import UserDAO
-from .connection import Connection
-from .descuento_dao import DescuentoDAO
-from .venta_dao import VentaDAO
+# Las exportaciones se cargan al primer uso (PEP 562): importar un submódulo como
+# db.async_dao no debe arrastrar mysql.connector ni todos los DAOs.
+_EXPORTS = {
+    "ArticuloDAO": ".articulo_dao",
+    "CompraDAO": ".compra_dao",
+    "ProveedorDAO": ".proveedor_dao",
+    "UserDAO": ".user_dao",
+    "Connection": ".connection",
+    "DescuentoDAO": ".descuento_dao",
+    "VentaDAO": ".venta_dao",
+    "catalog_cache": ".cache",
+    "AsyncDAO": ".async_dao",
+}
 
-__all__ = [
-    "ArticuloDAO",
-    "CompraDAO",
-    "ProveedorDAO",
-    "UserDAO",
-    "Connection",
-    "DescuentoDAO",
-    "VentaDAO",
-]
\ No newline at end of file
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
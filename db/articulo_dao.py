@@ -1,9 +1,102 @@
-from typing import List, Optional, Dict
-from mysql.connector import Error
+import threading
+import time
+from typing import Iterator, List, Optional, Dict, Tuple
+from db.errors import DatabaseError, Error
+from config import Config
 from models.articulo import Articulo
 from db.connection import Connection
+from db.cache import catalog_cache
+from db.keyset import page_query, split_page
+from db.batch import chunked, placeholders
+from db.search_index import TrigramIndex, normalize
+import metrics
+
+# Consultas de lectura y de inventario, compartidas con explain_queries.py para que
+# el plan que se revisa sea el de la sentencia que se ejecuta. {ids} se completa
+# con placeholders(n).
+ARTICULO_SELECT = """
+    SELECT a.articuloid, a.descripcion, a.precio_venta,
+           da.precio AS precio_compra, da.proveedorid, p.nombre
+    FROM articulos a
+    LEFT JOIN det_art da ON a.articuloid = da.articuloid
+    LEFT JOIN proveedor p ON da.proveedorid = p.proveedorid
+"""
+GET_MANY_QUERY = ARTICULO_SELECT + "WHERE a.articuloid IN ({ids})"
+ITER_ALL_QUERY = ARTICULO_SELECT + "ORDER BY a.descripcion"
+GET_ALL_QUERY = "SELECT * FROM articulos ORDER BY descripcion"
+GET_BY_ID_QUERY = """
+    SELECT a.articuloid AS articulo_id, a.descripcion, a.precio_venta,
+           da.precio AS precio_compra, da.proveedorid, p.nombre AS proveedor_nombre
+    FROM articulos a
+    LEFT JOIN det_art da ON a.articuloid = da.articuloid
+    LEFT JOIN proveedor p ON da.proveedorid = p.proveedorid
+    WHERE a.articuloid = %(articulo_id)s
+"""
+GET_BY_PROVEEDOR_QUERY = """
+    SELECT a.*, da.existencias, da.precio as precio_proveedor
+    FROM articulos a
+    JOIN det_art da ON a.articuloid = da.articuloid
+    WHERE da.proveedorid = %s AND da.existencias > 0
+"""
+# Resultados de search/search_fuzzy: los ids ya vienen ordenados del índice en memoria
+SEARCH_BY_IDS_QUERY = """
+    SELECT a.articuloid AS articulo_id, a.descripcion, a.precio_venta, da.precio AS precio_compra
+    FROM articulos a
+    LEFT JOIN det_art da ON a.articuloid = da.articuloid
+    WHERE a.articuloid IN ({ids})
+"""
+SEARCH_LIKE_QUERY = """
+    SELECT a.articuloid AS articulo_id, a.descripcion, a.precio_venta, da.precio AS precio_compra
+    FROM articulos a
+    LEFT JOIN det_art da ON a.articuloid = da.articuloid
+    WHERE a.descripcion LIKE %(term)s
+    ORDER BY a.descripcion
+    LIMIT %(limit)s
+"""
+SEARCH_INDEX_QUERY = "SELECT articuloid, descripcion FROM articulos"
+UPDATE_STOCK_QUERY = """
+    UPDATE det_art
+    SET existencias = existencias + %s
+    WHERE articuloid = %s AND existencias + %s >= 0
+"""
+# apply_stock_deltas (checkout): {casos} son n pares "WHEN %s THEN %s"
+LOCK_STOCK_QUERY = "SELECT articuloid, existencias FROM det_art WHERE articuloid IN ({ids}) FOR UPDATE"
+APPLY_STOCK_QUERY = """
+    UPDATE det_art
+    SET existencias = existencias + CASE articuloid {casos} END
+    WHERE articuloid IN ({ids})
+"""
+# Paginación de page(): columnas del orden y filtros permitidos
+PAGE_COLUMNS = ('a.descripcion', 'a.articuloid')
+PAGE_FILTERS = {
+    'proveedor_id': 'da.proveedorid = %s',
+    'con_existencias': 'da.existencias > %s',
+}
+
+# Índice de búsqueda por descripción, compartido por el proceso. Se construye en un
+# hilo aparte a partir de la primera búsqueda, se actualiza en save/update/delete y
+# se reconstruye completo cada SEARCH_INDEX_TTL segundos para recoger cambios hechos
+# desde otras estaciones. Mientras se reconstruye se sigue usando el anterior.
+_search_index: Optional[TrigramIndex] = None
+_search_built_at = 0.0
+_search_lock = threading.Lock()
+# Se avisa al terminar cada reconstrucción, bien o con error
+_search_built = threading.Condition(_search_lock)
+# Cambios hechos durante una reconstrucción, para aplicarlos al índice nuevo;
+# None cuando no hay reconstrucción en curso
+_search_pending: Optional[Dict[int, Optional[str]]] = None
+
+class StockInsuficienteError(DatabaseError):
+    """Un movimiento de inventario dejaría existencias negativas."""
+
+    def __init__(self, articulo_ids: List[int]):
+        self.articulo_ids = list(articulo_ids)
+        super().__init__(msg=f"Stock insuficiente para los artículos: {self.articulo_ids}")
 
 class ArticuloDAO:
+    # Términos más cortos coinciden con casi todo el catálogo
+    MIN_SEARCH_LENGTH = TrigramIndex.MIN_TOKEN
+
     def __init__(self):
         self.connection = Connection()
     
@@ -18,22 +111,24 @@ class ArticuloDAO:
                 VALUES (%s, %s)
             """
             params_articulos = (articulo.descripcion, articulo.precio_venta)
-            self.connection.cursor.execute(query_articulos, params_articulos)
-            articulo.articulo_id = self.connection.cursor.lastrowid
 
             # Insert into det_art table
             query_det_art = """
                 INSERT INTO det_art (proveedorid, articuloid, precio, existencias)
                 VALUES (%s, %s, %s, 0)
             """
-            params_det_art = (articulo.proveedor_id, articulo.articulo_id, articulo.precio_compra)
-            self.connection.cursor.execute(query_det_art, params_det_art)
 
-            self.connection.commit()
+            with self.connection.transaction() as cursor:
+                cursor.execute(query_articulos, params_articulos)
+                articulo.articulo_id = cursor.lastrowid
+
+                params_det_art = (articulo.proveedor_id, articulo.articulo_id, articulo.precio_compra)
+                cursor.execute(query_det_art, params_det_art)
+            self.invalidate_cache(articulo.articulo_id)
+            self._index_articulo(articulo.articulo_id, articulo.descripcion)
             return True
         except Error as e:
             print(f"Error al guardar artículo: {e}")
-            self.connection.rollback()
             return False
     
     def update(self, articulo: Articulo) -> bool:
@@ -48,7 +143,6 @@ class ArticuloDAO:
                 WHERE articuloid = %s
             """
             params_articulos = (articulo.descripcion, articulo.precio_venta, articulo.articulo_id)
-            self.connection.cursor.execute(query_articulos, params_articulos)
 
             # Update det_art table
             query_det_art = """
@@ -57,60 +151,67 @@ class ArticuloDAO:
                 WHERE articuloid = %s
             """
             params_det_art = (articulo.precio_compra, articulo.proveedor_id, articulo.articulo_id)
-            self.connection.cursor.execute(query_det_art, params_det_art)
 
-            self.connection.commit()
-            return self.connection.cursor.rowcount > 0
+            with self.connection.transaction() as cursor:
+                cursor.execute(query_articulos, params_articulos)
+                updated = cursor.rowcount > 0
+                cursor.execute(query_det_art, params_det_art)
+                updated = updated or cursor.rowcount > 0
+            self.invalidate_cache(articulo.articulo_id)
+            # Sin condición: la descripción pudo cambiar aunque det_art quedara igual
+            self._index_articulo(articulo.articulo_id, articulo.descripcion)
+            return updated
         except Error as e:
             print(f"Error al actualizar artículo: {e}")
-            self.connection.rollback()
             return False
     
     def delete(self, articulo_id: int) -> bool:
         query = "DELETE FROM articulos WHERE articuloid = %s"
         
         try:
-            self.connection.cursor.execute(query, (articulo_id,))
-            self.connection.commit()
-            return self.connection.cursor.rowcount > 0
+            with self.connection.transaction() as cursor:
+                cursor.execute(query, (articulo_id,))
+                deleted = cursor.rowcount > 0
+            self.invalidate_cache(articulo_id)
+            if deleted:
+                self._index_articulo(articulo_id, None)
+            return deleted
         except Error as e:
             print(f"Error al eliminar artículo: {e}")
-            self.connection.rollback()
             return False
     
     def get(self, articulo_id: int) -> Optional[Articulo]:
-        query = """
-            SELECT a.articuloid, a.descripcion, a.precio_venta, a.precio_compra, a.proveedor_id, p.nombre
-            FROM articulos a
-            JOIN proveedor p ON a.proveedor_id = p.proveedor_id
-            WHERE a.articuloid = %s
-        """
+        return self.get_many([articulo_id]).get(articulo_id)
+    
+    def get_many(self, articulo_ids: List[int]) -> Dict[int, Articulo]:
+        """Obtiene varios artículos con consultas IN por lotes; devuelve {id: Articulo} con los que existen."""
+        articulos = {}
         
         try:
-            self.connection.cursor.execute(query, (articulo_id,))
-            result = self.connection.cursor.fetchone()
-            
-            if result:
-                return Articulo(
-                    articulo_id=result['articuloid'],
-                    descripcion=result['descripcion'],
-                    precio_venta=result['precio_venta'],
-                    precio_compra=result['precio_compra'],
-                    proveedor_id=result['proveedor_id'],
-                    proveedor_nombre=result['nombre']
-                )
-            return None
+            with self.connection.cursor() as cursor:
+                for lote in chunked(dict.fromkeys(articulo_ids)):
+                    cursor.execute(GET_MANY_QUERY.format(ids=placeholders(len(lote))), lote)
+                    for result in cursor.fetchall():
+                        articulos[result['articuloid']] = Articulo(
+                            articulo_id=result['articuloid'],
+                            descripcion=result['descripcion'],
+                            precio_venta=result['precio_venta'],
+                            precio_compra=result['precio_compra'],
+                            proveedor_id=result['proveedorid'],
+                            proveedor_nombre=result['nombre']
+                        )
+            return articulos
         except Error as e:
-            print(f"Error al obtener artículo: {e}")
-            return None
+            print(f"Error al obtener artículos: {e}")
+            return {}
     
     def get_all(self) -> List[Articulo]:
-        query = "SELECT * FROM articulos ORDER BY descripcion"
         articulos = []
         
         try:
-            self.connection.cursor.execute(query)
-            results = self.connection.cursor.fetchall()
+            with self.connection.cursor() as cursor:
+                cursor.execute(GET_ALL_QUERY)
+                results = cursor.fetchall()
             
             for result in results:
                 articulos.append(Articulo(
@@ -125,49 +226,290 @@ class ArticuloDAO:
             print(f"Error al obtener artículos: {e}")
             return []
     
-    def get_by_proveedor(self, proveedor_id: int) -> List[Dict]:
-        query = """
-            SELECT a.*, da.existencias, da.precio as precio_proveedor
-            FROM articulos a
-            JOIN det_art da ON a.articuloid = da.articuloid
-            WHERE da.proveedorid = %s AND da.existencias > 0
+    def page(self, after: Optional[Tuple] = None, limit: int = 100,
+             filters: Optional[Dict] = None) -> Tuple[List[Articulo], Optional[Tuple]]:
+        """Página del catálogo ordenada por (descripcion, articuloid).
+
+        Filtros: proveedor_id, con_existencias (cualquier valor verdadero excluye
+        artículos agotados). Devuelve (artículos, cursor de la página siguiente o None).
         """
+        query, params = self.page_sql(after, limit, filters)
         
         try:
-            self.connection.cursor.execute(query, (proveedor_id,))
-            results = self.connection.cursor.fetchall()
-            return results
+            with self.connection.cursor() as cursor:
+                cursor.execute(query, params)
+                results = cursor.fetchall()
+            
+            results, siguiente = split_page(results, limit, ('descripcion', 'articuloid'))
+            articulos = [
+                Articulo(
+                    articulo_id=result['articuloid'],
+                    descripcion=result['descripcion'],
+                    precio_venta=result['precio_venta'],
+                    precio_compra=result['precio_compra'],
+                    proveedor_id=result['proveedorid'],
+                    proveedor_nombre=result['nombre']
+                )
+                for result in results
+            ]
+            return articulos, siguiente
+        except Error as e:
+            print(f"Error al obtener página de artículos: {e}")
+            return [], None
+    
+    @staticmethod
+    def page_sql(after: Optional[Tuple] = None, limit: int = 100,
+                 filters: Optional[Dict] = None) -> Tuple[str, list]:
+        """Consulta y parámetros de ``page``."""
+        filters = dict(filters or {})
+        if filters.pop('con_existencias', False):
+            filters['con_existencias'] = 0
+        return page_query(ARTICULO_SELECT, PAGE_COLUMNS, after, limit, filters, PAGE_FILTERS)
+    
+    def iter_all(self, batch_size: int = 500) -> Iterator[Articulo]:
+        """Recorre el catálogo completo en lotes, sin cargarlo en memoria. Los errores de la base se propagan."""
+        try:
+            for result in self.connection.stream(ITER_ALL_QUERY, batch_size=batch_size):
+                yield Articulo(
+                    articulo_id=result['articuloid'],
+                    descripcion=result['descripcion'],
+                    precio_venta=result['precio_venta'],
+                    precio_compra=result['precio_compra'],
+                    proveedor_id=result['proveedorid'],
+                    proveedor_nombre=result['nombre']
+                )
+        except Error as e:
+            print(f"Error al recorrer artículos: {e}")
+            raise
+    
+    def get_by_proveedor(self, proveedor_id: int) -> List[Dict]:
+        articulos = catalog_cache.get(('articulos_proveedor', proveedor_id))
+        if articulos is not None:
+            # Copias: los dicts en caché se comparten entre llamadas
+            return [dict(articulo) for articulo in articulos]
+
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(GET_BY_PROVEEDOR_QUERY, (proveedor_id,))
+                articulos = cursor.fetchall()
         except Error as e:
             print(f"Error al obtener artículos por proveedor: {e}")
             return []
+
+        catalog_cache.set(('articulos_proveedor', proveedor_id), articulos)
+        return [dict(articulo) for articulo in articulos]
     
     def update_stock(self, articulo_id: int, cantidad: int) -> bool:
-        query = """
-            UPDATE det_art
-            SET existencias = existencias + %s
-            WHERE articuloid = %s AND existencias + %s >= 0
-        """
-        
         try:
-            self.connection.cursor.execute(query, (cantidad, articulo_id, cantidad))
-            self.connection.commit()
-            return self.connection.cursor.rowcount > 0
+            with self.connection.transaction() as cursor:
+                cursor.execute(UPDATE_STOCK_QUERY, (cantidad, articulo_id, cantidad))
+                updated = cursor.rowcount > 0
+            if updated:
+                self.invalidate_cache()
+            else:
+                metrics.STOCK_REJECTIONS.inc(origen='update_stock')
+            return updated
         except Error as e:
             print(f"Error al actualizar stock: {e}")
-            self.connection.rollback()
             return False
 
-    def search(self, term: str):
-        query = """
-            SELECT a.articuloid AS articulo_id, a.descripcion, a.precio_venta, da.precio AS precio_compra
-            FROM articulos a
-            LEFT JOIN det_art da ON a.articuloid = da.articuloid
-            WHERE a.descripcion LIKE %(term)s
+    def update_stock_many(self, deltas: Dict[int, int]) -> List[int]:
+        """
+        Aplica varios movimientos de inventario en una sola transacción.
+
+        :param deltas: Diccionario {articulo_id: cantidad a sumar/restar}.
+        :return: Lista de ids que no pasaron la validación existencias + delta >= 0
+                 (o que no existen). Si no está vacía no se aplicó ningún cambio.
+        """
+        if not deltas:
+            return []
+
+        try:
+            with self.connection.transaction() as cursor:
+                rechazados = self.apply_stock_deltas(cursor, deltas)
+                if rechazados:
+                    raise StockInsuficienteError(rechazados)
+            self.invalidate_cache()
+            return []
+        except StockInsuficienteError as e:
+            print(f"Error al actualizar stock: {e}")
+            metrics.STOCK_REJECTIONS.inc(len(e.articulo_ids), origen='update_stock_many')
+            return e.articulo_ids
+        except Error as e:
+            print(f"Error al actualizar stock: {e}")
+            return list(deltas)
+
+    @staticmethod
+    def invalidate_cache(articulo_id: Optional[int] = None) -> None:
+        """
+        Descarta del caché de catálogo los listados por proveedor (incluyen existencias)
+        y, si se indica, el detalle del artículo modificado.
+        """
+        catalog_cache.invalidate_kind('articulos_proveedor')
+        if articulo_id is not None:
+            catalog_cache.invalidate(('articulo', articulo_id))
+
+    @staticmethod
+    def apply_stock_deltas(cursor, deltas: Dict[int, int]) -> List[int]:
+        """
+        Bloquea las filas de det_art involucradas, valida que ninguna quede en
+        negativo y aplica todos los movimientos con un solo UPDATE.
+
+        Debe llamarse dentro de una transacción abierta. Devuelve los ids
+        rechazados; en ese caso no ejecuta el UPDATE.
+        """
+        ids = list(deltas)
+        marcadores = placeholders(len(ids))
+
+        cursor.execute(LOCK_STOCK_QUERY.format(ids=marcadores), ids)
+        existencias = {row['articuloid']: row['existencias'] for row in cursor.fetchall()}
+        rechazados = [
+            articulo_id for articulo_id in ids
+            if articulo_id not in existencias or existencias[articulo_id] + deltas[articulo_id] < 0
+        ]
+        if rechazados:
+            return rechazados
+
+        casos = " ".join(["WHEN %s THEN %s"] * len(ids))
+        params = [valor for articulo_id in ids for valor in (articulo_id, deltas[articulo_id])]
+        cursor.execute(APPLY_STOCK_QUERY.format(casos=casos, ids=marcadores), params + ids)
+        return []
+
+    @staticmethod
+    def _index_articulo(articulo_id: int, descripcion: Optional[str]) -> None:
+        """Refleja un alta, cambio (descripcion) o baja (None) en el índice de búsqueda, si ya existe."""
+        with _search_lock:
+            if _search_pending is not None:
+                _search_pending[articulo_id] = descripcion
+            if _search_index is None:
+                return
+            if descripcion is None:
+                _search_index.remove(articulo_id)
+            else:
+                _search_index.add(articulo_id, descripcion)
+
+    def _get_search_index(self) -> Optional[TrigramIndex]:
+        """Devuelve el índice de búsqueda actual; si falta o venció, lanza su reconstrucción en segundo plano.
+
+        Devuelve None mientras se construye el primero.
+        """
+        global _search_pending
+        with _search_lock:
+            vencido = time.monotonic() - _search_built_at > Config.SEARCH_INDEX_TTL
+            if (_search_index is None or vencido) and _search_pending is None:
+                _search_pending = {}
+                threading.Thread(
+                    target=self._rebuild_search_index, name="search-index", daemon=True
+                ).start()
+            return _search_index
+
+    def _rebuild_search_index(self) -> None:
+        """Construye un índice nuevo desde la base y lo pone en lugar del actual."""
+        global _search_index, _search_built_at, _search_pending
+        index = TrigramIndex()
+        try:
+            index.build(
+                (row['articuloid'], row['descripcion'])
+                for row in self.connection.stream(SEARCH_INDEX_QUERY)
+            )
+        except Error as e:
+            print(f"Error al construir índice de búsqueda: {e}")
+            with _search_lock:
+                _search_pending = None
+                _search_built.notify_all()
+            return
+
+        with _search_lock:
+            # Lo guardado desde esta estación mientras se leía la tabla
+            for articulo_id, descripcion in _search_pending.items():
+                if descripcion is None:
+                    index.remove(articulo_id)
+                else:
+                    index.add(articulo_id, descripcion)
+            _search_index = index
+            _search_built_at = time.monotonic()
+            _search_pending = None
+            _search_built.notify_all()
+
+    @staticmethod
+    def _wait_search_index(timeout: float) -> Optional[TrigramIndex]:
+        """Espera hasta ``timeout`` segundos a que termine la reconstrucción en curso y devuelve el índice."""
+        with _search_built:
+            _search_built.wait_for(lambda: _search_pending is None, timeout)
+            return _search_index
+
+    def search(self, term: str, limit: int = 100):
         """
-        params = {'term': f"%{term}%"}
-        cursor = self.connection.cursor
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+        Busca artículos cuya descripción contenga todas las palabras de ``term``
+        (sin distinguir mayúsculas ni acentos), ordenados por relevancia: primero
+        los que empiezan con el término, luego los que tienen una palabra que
+        empieza con él y al final las coincidencias internas. Las palabras de
+        menos de ``MIN_SEARCH_LENGTH`` letras solo acotan el resultado de las
+        demás; un término sin palabras de ese largo no devuelve nada.
+        """
+        if not any(len(t) >= self.MIN_SEARCH_LENGTH for t in normalize(term).split()):
+            return []
+
+        index = self._get_search_index()
+        if index is None:
+            return self._search_like(term, limit)
+
+        ids = [articulo_id for articulo_id, _ in index.search(term, limit)]
+        if not ids:
+            return []
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(SEARCH_BY_IDS_QUERY.format(ids=placeholders(len(ids))), ids)
+            rows = {row['articulo_id']: row for row in cursor.fetchall()}
+        return [
+            {
+                'articulo_id': rows[articulo_id]['articulo_id'],
+                'descripcion': rows[articulo_id]['descripcion'],
+                'precio_venta': rows[articulo_id]['precio_venta'],
+                'precio_compra': rows[articulo_id]['precio_compra']
+            }
+            for articulo_id in ids if articulo_id in rows
+        ]
+
+    def search_fuzzy(self, term: str, limit: int = 20):
+        """
+        Búsqueda tolerante a errores de captura ("paracetamo1", "ibuprofen").
+        Devuelve los ``limit`` artículos más parecidos con su calificación
+        (``score``, de 0 a 1), de mayor a menor.
+
+        A diferencia de ``search``, si el índice todavía no existe espera a que
+        termine de construirse (hasta ``SEARCH_INDEX_WAIT`` segundos): LIKE no
+        encuentra nada con un error de captura. Si aun así no hay índice, cae a
+        LIKE con calificación 1.0.
+        """
+        index = self._get_search_index() or self._wait_search_index(Config.SEARCH_INDEX_WAIT)
+        if index is None:
+            return [dict(articulo, score=1.0) for articulo in self._search_like(term, limit)]
+
+        scores = {articulo_id: score for articulo_id, _, score in index.search_fuzzy(term, limit)}
+        if not scores:
+            return []
+
+        with self.connection.cursor() as cursor:
+            cursor.execute(SEARCH_BY_IDS_QUERY.format(ids=placeholders(len(scores))), list(scores))
+            rows = {row['articulo_id']: row for row in cursor.fetchall()}
+        return [
+            {
+                'articulo_id': rows[articulo_id]['articulo_id'],
+                'descripcion': rows[articulo_id]['descripcion'],
+                'precio_venta': rows[articulo_id]['precio_venta'],
+                'precio_compra': rows[articulo_id]['precio_compra'],
+                'score': score
+            }
+            for articulo_id, score in scores.items() if articulo_id in rows
+        ]
+
+    def _search_like(self, term: str, limit: int):
+        """Búsqueda directa con LIKE, para cuando no se pudo construir el índice."""
+        params = {'term': f"%{term}%", 'limit': limit}
+        with self.connection.cursor() as cursor:
+            cursor.execute(SEARCH_LIKE_QUERY, params)
+            rows = cursor.fetchall()
         return [
             {
                 'articulo_id': row['articulo_id'],
@@ -179,23 +521,22 @@ class ArticuloDAO:
         ]
 
     def get_by_id(self, articulo_id: int):
-        query = """
-            SELECT a.articuloid AS articulo_id, a.descripcion, a.precio_venta, 
-                   da.precio AS precio_compra, da.proveedorid, p.nombre AS proveedor_nombre
-            FROM articulos a
-            LEFT JOIN det_art da ON a.articuloid = da.articuloid
-            LEFT JOIN proveedor p ON da.proveedorid = p.proveedorid
-            WHERE a.articuloid = %(articulo_id)s
-        """
+        articulo = catalog_cache.get(('articulo', articulo_id))
+        if articulo is not None:
+            # Copia: el dict en caché se comparte entre llamadas
+            return dict(articulo)
+
         params = {'articulo_id': articulo_id}
-        cursor = self.connection.cursor
-        cursor.execute(query, params)
-        row = cursor.fetchone()
-        return {
+        with self.connection.cursor() as cursor:
+            cursor.execute(GET_BY_ID_QUERY, params)
+            row = cursor.fetchone()
+        articulo = {
             'articulo_id': row['articulo_id'],
             'descripcion': row['descripcion'],
             'precio_venta': row['precio_venta'],
             'precio_compra': row['precio_compra'],
             'proveedor_id': row['proveedorid'],
             'proveedor_nombre': row['proveedor_nombre']
-        } if row else None
\ No newline at end of file
+        } if row else None
+        catalog_cache.set(('articulo', articulo_id), articulo)
+        return dict(articulo) if articulo else None
\ No newline at end of file
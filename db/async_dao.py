@@ -0,0 +1,59 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from config import Config
+import tracing
+
+# Un hilo por conexión del pool: así ninguna tarea espera turno dentro del pool
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=Config.DB_POOL_MAX, thread_name_prefix="dao")
+        return _executor
+
+
+def submit(fn: Callable, *args, **kwargs) -> Future:
+    """Ejecuta ``fn(*args, **kwargs)`` en el ejecutor de la base de datos."""
+    return get_executor().submit(tracing.propagate(fn), *args, **kwargs)
+
+
+def shutdown(wait: bool = True) -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
+
+
+class AsyncDAO:
+    """Fachada que ejecuta los métodos de un DAO fuera del hilo que la llama.
+
+    Cada llamada regresa un ``concurrent.futures.Future`` con el mismo resultado
+    que daría el método síncrono::
+
+        clientes = AsyncDAO(ClienteDAO())
+        future = clientes.get_all()
+
+    No depende de Tk: las vistas entregan el resultado al hilo de la interfaz
+    con ``BaseForm.run_async``.
+    """
+
+    def __init__(self, dao: Any):
+        self._dao = dao
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._dao, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs) -> Future:
+            return submit(attr, *args, **kwargs)
+
+        call.__name__ = name
+        call.__doc__ = attr.__doc__
+        return call
@@ -0,0 +1,17 @@
+# Cada backend se importa al elegirlo: el de SQLite no requiere mysql.connector.
+from config import Config
+from db.backends.base import Backend
+
+__all__ = ["Backend", "get_backend"]
+
+
+def get_backend(name: str = None) -> Backend:
+    """Devuelve el backend indicado o el de ``Config.DB_BACKEND`` ('mysql' o 'sqlite')."""
+    name = (name or Config.DB_BACKEND).lower()
+    if name == 'mysql':
+        from db.backends.mysql import MySQLBackend
+        return MySQLBackend()
+    if name == 'sqlite':
+        from db.backends.sqlite import SQLiteBackend
+        return SQLiteBackend()
+    raise ValueError(f"Backend de base de datos no soportado: {name}")
@@ -0,0 +1,60 @@
+from contextlib import contextmanager
+from config import Config
+from db.pool import ConnectionPool
+
+
+class Backend:
+    """Lo que ``Connection``, ``ConnectionPool`` y las migraciones necesitan de un driver.
+
+    Los DAOs no lo usan directamente: siguen escribiendo SQL de MySQL con
+    marcadores ``%s`` y cada backend entrega cursores que lo entienden.
+    """
+
+    name = ""
+    # Excepciones que indican que la conexión quedó inutilizable
+    broken_errors: tuple = ()
+
+    def connect(self):
+        raise NotImplementedError
+
+    def create_pool(self) -> ConnectionPool:
+        return ConnectionPool(
+            self,
+            min_size=Config.DB_POOL_MIN,
+            max_size=Config.DB_POOL_MAX,
+            idle_timeout=Config.DB_POOL_IDLE_TIMEOUT,
+            checkout_timeout=Config.DB_POOL_TIMEOUT,
+            validate_after=Config.DB_POOL_VALIDATE_AFTER
+        )
+
+    def cursor(self, con, dictionary: bool = True, buffered: bool = True):
+        raise NotImplementedError
+
+    def begin(self, con) -> None:
+        """Abre una transacción explícita en ``con``."""
+        raise NotImplementedError
+
+    def ping(self, con) -> bool:
+        raise NotImplementedError
+
+    def has_unread_result(self, con) -> bool:
+        return False
+
+    def reset(self, con) -> None:
+        """Deja ``con`` lista para volver al pool (resultados pendientes, transacción abierta)."""
+        if con.in_transaction:
+            con.rollback()
+
+    def index_exists(self, cursor, table: str, index: str) -> bool:
+        raise NotImplementedError
+
+    def is_missing_database(self, error) -> bool:
+        return False
+
+    def create_database(self) -> None:
+        pass
+
+    @contextmanager
+    def migration_lock(self, cursor):
+        """Impide que dos procesos apliquen migraciones al mismo tiempo."""
+        yield
@@ -0,0 +1,93 @@
+from contextlib import contextmanager
+import mysql.connector
+from mysql.connector import Error, errorcode
+from mysql.connector.constants import ClientFlag
+from mysql.connector.errors import InterfaceError, OperationalError
+from config import Config
+from db.backends.base import Backend
+from db.errors import DatabaseError
+
+LOCK_NAME = "farmacia_migraciones"
+LOCK_TIMEOUT = 30
+
+
+class MySQLBackend(Backend):
+    name = "mysql"
+    broken_errors = (InterfaceError, OperationalError)
+
+    def __init__(self):
+        self.connect_args = {
+            'host': Config.DB_HOST,
+            'user': Config.DB_USER,
+            'password': Config.DB_PASSWORD,
+            'database': Config.DB_NAME,
+            # rowcount de un UPDATE cuenta las filas encontradas, no solo las que
+            # cambiaron (como en SQLite): guardar sin cambios no es "no existe"
+            'client_flags': [ClientFlag.FOUND_ROWS],
+        }
+
+    def connect(self):
+        con = mysql.connector.connect(**self.connect_args)
+        # Las lecturas no deben dejar transacciones abiertas en la conexión prestada;
+        # las escrituras abren la suya explícitamente con start_transaction().
+        con.autocommit = True
+        return con
+
+    def cursor(self, con, dictionary: bool = True, buffered: bool = True):
+        return con.cursor(dictionary=dictionary, buffered=buffered)
+
+    def begin(self, con) -> None:
+        con.start_transaction()
+
+    def ping(self, con) -> bool:
+        try:
+            con.ping(reconnect=False)
+            return True
+        except Error:
+            return False
+
+    def has_unread_result(self, con) -> bool:
+        return con.unread_result
+
+    def reset(self, con) -> None:
+        if con.unread_result:
+            con.consume_results()
+        if con.in_transaction:
+            con.rollback()
+
+    def index_exists(self, cursor, table: str, index: str) -> bool:
+        cursor.execute(
+            """
+            SELECT COUNT(*) AS n FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+            """,
+            (table, index)
+        )
+        return cursor.fetchone()['n'] > 0
+
+    def is_missing_database(self, error) -> bool:
+        return getattr(error, 'errno', None) == errorcode.ER_BAD_DB_ERROR
+
+    def create_database(self) -> None:
+        con = mysql.connector.connect(
+            host=Config.DB_HOST,
+            user=Config.DB_USER,
+            password=Config.DB_PASSWORD
+        )
+        try:
+            cursor = con.cursor()
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {Config.DB_NAME}")
+            cursor.close()
+        finally:
+            con.close()
+
+    @contextmanager
+    def migration_lock(self, cursor):
+        # Otra terminal podría estar migrando al mismo tiempo
+        cursor.execute("SELECT GET_LOCK(%s, %s) AS adquirido", (LOCK_NAME, LOCK_TIMEOUT))
+        if not cursor.fetchone()['adquirido']:
+            raise DatabaseError(msg="No se pudo obtener el candado de migraciones")
+        try:
+            yield
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (LOCK_NAME,))
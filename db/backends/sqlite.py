@@ -0,0 +1,179 @@
+"""Backend SQLite para pruebas, benchmarks y terminales sin servidor.
+
+Los DAOs siguen escribiendo SQL de MySQL; ``translate`` lo adapta al vuelo:
+
+* marcadores ``%s`` / ``%(nombre)s`` -> ``?`` / ``:nombre``
+* ``INT AUTO_INCREMENT PRIMARY KEY`` -> ``INTEGER PRIMARY KEY AUTOINCREMENT``
+* ``ENUM(...)`` -> ``TEXT`` con ``CHECK (... IN (...))``
+* ``VARCHAR(n)`` -> ``VARCHAR(n) COLLATE NOCASE``: las comparaciones, ``UNIQUE`` y
+  ``ORDER BY`` ignoran mayúsculas como con la colación por omisión de MySQL
+* ``CURDATE()`` / ``NOW()`` -> ``CURRENT_DATE`` / ``CURRENT_TIMESTAMP``
+* ``FOR UPDATE`` se omite: las transacciones abren con ``BEGIN IMMEDIATE``, que
+  ya toma el candado de escritura de toda la base
+* ``MATCH(col) AGAINST (... IN BOOLEAN MODE)`` -> función ``fulltext_match``
+  (sin índice, recorre la tabla); ``CREATE FULLTEXT INDEX`` no hace nada
+* ``LIKE`` usa ``\\`` como escape, como en MySQL
+
+``SQLITE_PATH=:memory:`` crea una base en memoria; como cada conexión tendría
+su propia base, el pool se limita a una conexión compartida.
+"""
+import datetime
+import re
+import sqlite3
+from decimal import Decimal
+from functools import lru_cache
+from typing import Optional
+from config import Config
+from db.backends.base import Backend
+from db.pool import ConnectionPool
+
+# Conversiones de tipos declarados en el esquema a los que entrega mysql.connector
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_adapter(datetime.date, lambda d: d.isoformat())
+sqlite3.register_adapter(datetime.datetime, lambda d: d.isoformat(" "))
+sqlite3.register_converter("DECIMAL", lambda b: Decimal(b.decode()))
+sqlite3.register_converter("DATE", lambda b: datetime.date.fromisoformat(b.decode()))
+sqlite3.register_converter("TIMESTAMP", lambda b: datetime.datetime.fromisoformat(b.decode()))
+
+_PARAM = r"(?:%s|%\(\w+\)s)"
+_REWRITES = [
+    (re.compile(r"\bDROP\s+INDEX\s+(\w+)\s+ON\s+\w+", re.I), r"DROP INDEX IF EXISTS \1"),
+    (re.compile(r"\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b", re.I), "INTEGER PRIMARY KEY AUTOINCREMENT"),
+    (re.compile(r"(\w+)\s+ENUM\s*\(([^)]*)\)", re.I), r"\1 TEXT CHECK (\1 IN (\2))"),
+    (re.compile(r"\bVARCHAR\s*\((\d+)\)", re.I), r"VARCHAR(\1) COLLATE NOCASE"),
+    (re.compile(r"\bCURDATE\(\)", re.I), "CURRENT_DATE"),
+    (re.compile(r"\bNOW\(\)", re.I), "CURRENT_TIMESTAMP"),
+    (re.compile(r"\s+FOR\s+UPDATE\b", re.I), ""),
+    (re.compile(rf"\bMATCH\s*\((\w+)\)\s*AGAINST\s*\(\s*({_PARAM})\s+IN\s+BOOLEAN\s+MODE\s*\)", re.I),
+     r"fulltext_match(\1, \2)"),
+    (re.compile(rf"\bLIKE\s+({_PARAM})", re.I), r"LIKE \1 ESCAPE '\\'"),
+    # Marcadores de parámetros al final, una vez que ya no se buscan en los patrones
+    (re.compile(r"%\((\w+)\)s"), r":\1"),
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"%%"), "%"),
+]
+_SKIP = re.compile(r"^\s*CREATE\s+FULLTEXT\s+INDEX\b", re.I)
+
+
+@lru_cache(maxsize=1024)
+def translate(sql: str) -> Optional[str]:
+    """Convierte una sentencia del dialecto de MySQL; None si no tiene equivalente."""
+    if _SKIP.match(sql):
+        return None
+    for pattern, replacement in _REWRITES:
+        sql = pattern.sub(replacement, sql)
+    return sql
+
+
+def fulltext_match(texto: Optional[str], consulta: Optional[str]) -> float:
+    """Relevancia de ``texto`` para una búsqueda booleana de MySQL (``+palabra*``, ``-palabra``)."""
+    if not texto or not consulta:
+        return 0.0
+    palabras = re.findall(r"\w+", texto.lower())
+    relevancia = 0.0
+    for termino in consulta.lower().split():
+        operador = termino[0] if termino[0] in "+-" else ""
+        raiz = termino.lstrip("+-")
+        prefijo = raiz.endswith("*")
+        raiz = raiz.rstrip("*")
+        if not raiz:
+            continue
+        encontrada = any(p.startswith(raiz) if prefijo else p == raiz for p in palabras)
+        if operador == "-" and encontrada:
+            return 0.0
+        if operador == "+" and not encontrada:
+            return 0.0
+        if encontrada and operador != "-":
+            relevancia += 1
+    return relevancia
+
+
+def _row_dict(cursor, row) -> dict:
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+class SQLiteCursor:
+    """Cursor de sqlite3 que acepta el SQL y los parámetros de mysql.connector."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def execute(self, operation, params=None):
+        sql = translate(operation)
+        if sql is not None:
+            self._cursor.execute(sql, self._params(params))
+
+    def executemany(self, operation, seq_params):
+        sql = translate(operation)
+        if sql is not None:
+            self._cursor.executemany(sql, [self._params(p) for p in seq_params])
+
+    @staticmethod
+    def _params(params):
+        if params is None:
+            return ()
+        return params if isinstance(params, dict) else tuple(params)
+
+
+class SQLiteBackend(Backend):
+    name = "sqlite"
+    broken_errors = (sqlite3.InterfaceError,)
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or Config.SQLITE_PATH
+
+    @property
+    def in_memory(self) -> bool:
+        return self.path == ":memory:"
+
+    def connect(self):
+        # El pool garantiza que solo un hilo use la conexión a la vez
+        con = sqlite3.connect(
+            self.path,
+            timeout=Config.DB_POOL_TIMEOUT,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        con.execute("PRAGMA foreign_keys = ON")
+        if not self.in_memory:
+            # Lectores y un escritor simultáneos entre conexiones del pool
+            con.execute("PRAGMA journal_mode = WAL")
+        con.create_function("fulltext_match", 2, fulltext_match, deterministic=True)
+        return con
+
+    def create_pool(self) -> ConnectionPool:
+        if not self.in_memory:
+            return super().create_pool()
+        return ConnectionPool(self, min_size=1, max_size=1, idle_timeout=float('inf'),
+                              checkout_timeout=Config.DB_POOL_TIMEOUT, validate_after=float('inf'))
+
+    def cursor(self, con, dictionary: bool = True, buffered: bool = True):
+        cursor = con.cursor()
+        if dictionary:
+            cursor.row_factory = _row_dict
+        return SQLiteCursor(cursor)
+
+    def begin(self, con) -> None:
+        con.execute("BEGIN IMMEDIATE")
+
+    def index_exists(self, cursor, table: str, index: str) -> bool:
+        # Los nombres de índice son únicos en toda la base de SQLite
+        cursor.execute(
+            "SELECT COUNT(*) AS n FROM sqlite_master WHERE type = 'index' AND name = %s AND tbl_name = %s",
+            (index, table)
+        )
+        return cursor.fetchone()['n'] > 0
+
+    def ping(self, con) -> bool:
+        try:
+            con.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
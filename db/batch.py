@@ -0,0 +1,25 @@
+from itertools import islice
+from typing import Iterable, Iterator, List, TypeVar
+
+T = TypeVar('T')
+
+# Máximo de valores por cláusula IN / lote de executemany; mantiene cada
+# sentencia muy por debajo de max_allowed_packet
+DEFAULT_CHUNK_SIZE = 500
+
+
+def chunked(items: Iterable[T], size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[T]]:
+    """Divide ``items`` en listas de a lo más ``size`` elementos."""
+    if size <= 0:
+        raise ValueError("El tamaño del lote debe ser mayor a cero")
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def placeholders(n: int) -> str:
+    """Marcadores para una lista IN de ``n`` valores: ``%s, %s, ...``."""
+    return ", ".join(["%s"] * n)
@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+from config import Config
+
+class CatalogCache:
+    """Caché en memoria para datos de catálogo (proveedores, artículos).
+
+    Las entradas expiran tras ``ttl`` segundos y, al superar ``max_entries``, se
+    desaloja la usada hace más tiempo (LRU). Las llaves son tuplas cuyo primer
+    elemento es el tipo de entidad, p. ej. ``('proveedor', 3)``, lo que permite
+    invalidar una entrada o todas las de un tipo. Nunca se guarda ``None``.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Devuelve el valor guardado o None si no existe o ya expiró."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if value is None:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *keys: Hashable) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def invalidate_kind(self, *kinds: str) -> None:
+        """Elimina todas las entradas cuyas llaves empiezan con alguno de los tipos dados."""
+        with self._lock:
+            for key in [k for k in self._data if k[0] in kinds]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else 0.0,
+                'entries': len(self._data),
+                'evictions': self.evictions,
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+
+# Instancia compartida por todos los DAOs del proceso
+catalog_cache = CatalogCache(Config.CACHE_MAX_ENTRIES, Config.CACHE_TTL)
@@ -1,7 +1,37 @@
-from typing import List, Optional
-from mysql.connector import Error
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+from db.errors import Error
 from models.cliente import Cliente
 from db.connection import Connection
+from db.keyset import page_query, split_page
+from db.batch import chunked, placeholders
+
+# RFC: 3 letras (moral) o 4 (física), la fecha AAMMDD y la homoclave. Se acepta
+# incompleto, pero con al menos un dígito de la fecha: solo letras ("JUAN") es un nombre.
+RFC_PATTERN = re.compile(r'^[A-ZÑ&]{3,4}(?:\d{1,5}|\d{6}[A-Z0-9]{0,3})$')
+# InnoDB no indexa palabras más cortas que innodb_ft_min_token_size (3 por omisión)
+FT_MIN_TOKEN = 3
+
+# Consultas de lectura, compartidas con explain_queries.py. {ids} se completa con placeholders(n).
+GET_QUERY = "SELECT * FROM clientes WHERE clienteid = %s"
+GET_MANY_QUERY = "SELECT * FROM clientes WHERE clienteid IN ({ids})"
+GET_ALL_QUERY = "SELECT * FROM clientes ORDER BY nombre"
+# Una consulta por tipo de término en search(), cada una con su índice
+TELEFONO_QUERY = "SELECT * FROM clientes WHERE telefono = %s"
+TELEFONO_PREFIX_QUERY = "SELECT * FROM clientes WHERE telefono LIKE %s LIMIT %s"
+RFC_QUERY = "SELECT * FROM clientes WHERE RFC = %s"
+RFC_PREFIX_QUERY = "SELECT * FROM clientes WHERE RFC LIKE %s LIMIT %s"
+NOMBRE_PREFIX_QUERY = "SELECT * FROM clientes WHERE nombre LIKE %s ORDER BY nombre LIMIT %s"
+NOMBRE_FULLTEXT_QUERY = """
+    SELECT *, MATCH(nombre) AGAINST (%s IN BOOLEAN MODE) AS relevancia
+    FROM clientes
+    WHERE MATCH(nombre) AGAINST (%s IN BOOLEAN MODE)
+    ORDER BY relevancia DESC
+    LIMIT %s
+"""
+PAGE_SELECT = "SELECT * FROM clientes"
+PAGE_COLUMNS = ('nombre', 'clienteid')
+PAGE_FILTERS = {'usuario_id': 'usuarioid = %s'}
 
 class ClienteDAO:
     def __init__(self):
@@ -23,13 +53,12 @@ class ClienteDAO:
         }
         
         try:
-            self.connection.cursor.execute(query, params)
-            cliente.cliente_id = self.connection.cursor.lastrowid
-            self.connection.commit()
+            with self.connection.transaction() as cursor:
+                cursor.execute(query, params)
+                cliente.cliente_id = cursor.lastrowid
             return True
         except Error as e:
             print(f"Error al guardar cliente: {e}")
-            self.connection.rollback()
             return False
     
     def update(self, cliente: Cliente) -> bool:
@@ -51,32 +80,29 @@ class ClienteDAO:
         }
         
         try:
-            self.connection.cursor.execute(query, params)
-            self.connection.commit()
-            return self.connection.cursor.rowcount > 0
+            with self.connection.transaction() as cursor:
+                cursor.execute(query, params)
+                return cursor.rowcount > 0
         except Error as e:
             print(f"Error al actualizar cliente: {e}")
-            self.connection.rollback()
             return False
     
     def delete(self, cliente_id: int) -> bool:
         query = "DELETE FROM clientes WHERE clienteid = %s"
         
         try:
-            self.connection.cursor.execute(query, (cliente_id,))
-            self.connection.commit()
-            return self.connection.cursor.rowcount > 0
+            with self.connection.transaction() as cursor:
+                cursor.execute(query, (cliente_id,))
+                return cursor.rowcount > 0
         except Error as e:
             print(f"Error al eliminar cliente: {e}")
-            self.connection.rollback()
             return False
     
     def get(self, cliente_id: int) -> Optional[Cliente]:
-        query = "SELECT * FROM clientes WHERE clienteid = %s"
-        
         try:
-            self.connection.cursor.execute(query, (cliente_id,))
-            result = self.connection.cursor.fetchone()
+            with self.connection.cursor() as cursor:
+                cursor.execute(GET_QUERY, (cliente_id,))
+                result = cursor.fetchone()
             
             if result:
                 return Cliente(
@@ -91,13 +117,34 @@ class ClienteDAO:
             print(f"Error al obtener cliente: {e}")
             return None
     
+    def get_many(self, cliente_ids: List[int]) -> Dict[int, Cliente]:
+        """Obtiene varios clientes con consultas IN por lotes; devuelve {id: Cliente} con los que existen."""
+        clientes = {}
+        
+        try:
+            with self.connection.cursor() as cursor:
+                for lote in chunked(dict.fromkeys(cliente_ids)):
+                    cursor.execute(GET_MANY_QUERY.format(ids=placeholders(len(lote))), lote)
+                    for result in cursor.fetchall():
+                        clientes[result['clienteid']] = Cliente(
+                            cliente_id=result['clienteid'],
+                            usuario_id=result['usuarioid'],
+                            nombre=result['nombre'],
+                            telefono=result['telefono'],
+                            rfc=result['RFC']
+                        )
+            return clientes
+        except Error as e:
+            print(f"Error al obtener clientes: {e}")
+            return {}
+    
     def get_all(self) -> List[Cliente]:
-        query = "SELECT * FROM clientes ORDER BY nombre"
         clientes = []
         
         try:
-            self.connection.cursor.execute(query)
-            results = self.connection.cursor.fetchall()
+            with self.connection.cursor() as cursor:
+                cursor.execute(GET_ALL_QUERY)
+                results = cursor.fetchall()
             
             for result in results:
                 clientes.append(Cliente(
@@ -112,28 +159,127 @@ class ClienteDAO:
             print(f"Error al obtener clientes: {e}")
             return []
     
-    def search(self, term: str) -> List[Cliente]:
-        query = """
-            SELECT * FROM clientes 
-            WHERE nombre LIKE %s OR telefono LIKE %s OR RFC LIKE %s
-            ORDER BY nombre
+    def page(self, after: Optional[Tuple] = None, limit: int = 100,
+             filters: Optional[Dict] = None) -> Tuple[List[Cliente], Optional[Tuple]]:
+        """Página de clientes ordenada por (nombre, clienteid).
+
+        Filtros: usuario_id. Devuelve (clientes, cursor de la página siguiente o None).
         """
-        term = f"%{term}%"
-        clientes = []
+        query, params = self.page_sql(after, limit, filters)
         
         try:
-            self.connection.cursor.execute(query, (term, term, term))
-            results = self.connection.cursor.fetchall()
+            with self.connection.cursor() as cursor:
+                cursor.execute(query, params)
+                results = cursor.fetchall()
             
-            for result in results:
-                clientes.append(Cliente(
+            results, siguiente = split_page(results, limit, ('nombre', 'clienteid'))
+            clientes = [
+                Cliente(
                     cliente_id=result['clienteid'],
                     usuario_id=result['usuarioid'],
                     nombre=result['nombre'],
                     telefono=result['telefono'],
                     rfc=result['RFC']
-                ))
-            return clientes
+                )
+                for result in results
+            ]
+            return clientes, siguiente
+        except Error as e:
+            print(f"Error al obtener página de clientes: {e}")
+            return [], None
+    
+    @staticmethod
+    def page_sql(after: Optional[Tuple] = None, limit: int = 100,
+                 filters: Optional[Dict] = None) -> Tuple[str, list]:
+        """Consulta y parámetros de ``page``."""
+        return page_query(PAGE_SELECT, PAGE_COLUMNS, after, limit, filters, PAGE_FILTERS)
+    
+    def iter_all(self, batch_size: int = 500) -> Iterator[Cliente]:
+        """Recorre todos los clientes en lotes, sin cargar la tabla completa en memoria; un error corta el recorrido con excepción."""
+        try:
+            for result in self.connection.stream(GET_ALL_QUERY, batch_size=batch_size):
+                yield Cliente(
+                    cliente_id=result['clienteid'],
+                    usuario_id=result['usuarioid'],
+                    nombre=result['nombre'],
+                    telefono=result['telefono'],
+                    rfc=result['RFC']
+                )
+        except Error as e:
+            print(f"Error al recorrer clientes: {e}")
+            raise
+    
+    def search(self, term: str, limit: int = 50) -> List[Cliente]:
+        """
+        Busca clientes por teléfono, RFC o nombre usando el índice adecuado a cada
+        tipo de término, y combina los resultados ordenados por relevancia:
+
+        0. teléfono o RFC exactos
+        1. teléfono o RFC que empiezan con el término
+        2. nombre que empieza con el término
+        3. nombre con todas las palabras del término (índice FULLTEXT)
+        """
+        term = term.strip()
+        if not term:
+            return []
+
+        encontrados: Dict[int, Tuple[int, float, dict]] = {}
+        try:
+            with self.connection.cursor() as cursor:
+                for nivel, query, params in self._lookup_queries(term, limit):
+                    cursor.execute(query, params)
+                    for row in cursor.fetchall():
+                        if row['clienteid'] not in encontrados:
+                            encontrados[row['clienteid']] = (nivel, row.get('relevancia') or 0, row)
         except Error as e:
             print(f"Error al buscar clientes: {e}")
-            return []
\ No newline at end of file
+            return []
+
+        ordenados = sorted(
+            encontrados.values(),
+            key=lambda r: (r[0], -r[1], r[2]['nombre'], r[2]['clienteid'])
+        )
+        return [
+            Cliente(
+                cliente_id=result['clienteid'],
+                usuario_id=result['usuarioid'],
+                nombre=result['nombre'],
+                telefono=result['telefono'],
+                rfc=result['RFC']
+            )
+            for _, _, result in ordenados[:limit]
+        ]
+
+    @staticmethod
+    def _lookup_queries(term: str, limit: int) -> List[Tuple[int, str, tuple]]:
+        """Consultas (nivel, sql, parámetros) que aplican al término, de la más a la menos precisa."""
+        queries = []
+        prefijo = ClienteDAO._like_prefix(term)
+
+        if term.isdigit():
+            if len(term) == 10:
+                queries.append((0, TELEFONO_QUERY, (term,)))
+            else:
+                queries.append((1, TELEFONO_PREFIX_QUERY, (prefijo, limit)))
+            return queries
+
+        rfc = term.upper()
+        if RFC_PATTERN.match(rfc):
+            if len(rfc) in (12, 13):
+                queries.append((0, RFC_QUERY, (rfc,)))
+            queries.append((1, RFC_PREFIX_QUERY, (ClienteDAO._like_prefix(rfc), limit)))
+
+        queries.append((2, NOMBRE_PREFIX_QUERY, (prefijo, limit)))
+
+        palabras = [p for p in re.findall(r'\w+', term) if len(p) >= FT_MIN_TOKEN]
+        if palabras:
+            # +palabra* : todas las palabras son obligatorias y cada una puede ser prefijo
+            boolean = " ".join(f"+{p}*" for p in palabras)
+            queries.append((3, NOMBRE_FULLTEXT_QUERY, (boolean, boolean, limit)))
+        return queries
+
+    @staticmethod
+    def _like_prefix(term: str) -> str:
+        """Patrón LIKE 'term%' con los comodines del término escapados."""
+        escapado = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return f"{escapado}%"
@@ -1,7 +1,25 @@
-from typing import List, Optional, Dict
-from mysql.connector import Error
+from typing import Iterator, List, Optional, Dict, Tuple
+from db.errors import Error
 from models.compra import Compra
 from db.connection import Connection
+from db.keyset import page_query, split_page
+
+# Consultas de lectura, compartidas con explain_queries.py
+COMPRA_SELECT = """
+    SELECT c.*, p.nombre as proveedor_nombre, u.nombre as usuario_nombre
+    FROM compras c
+    JOIN proveedor p ON c.proveedorid = p.proveedorid
+    JOIN usuarios u ON c.usuarioid = u.usuarioid
+"""
+GET_QUERY = COMPRA_SELECT + "WHERE c.folio = %s"
+GET_ALL_QUERY = COMPRA_SELECT + "ORDER BY c.fecha DESC"
+PAGE_COLUMNS = ('c.fecha', 'c.folio')
+PAGE_FILTERS = {
+    'proveedor_id': 'c.proveedorid = %s',
+    'usuario_id': 'c.usuarioid = %s',
+    'desde': 'c.fecha >= %s',
+    'hasta': 'c.fecha <= %s',
+}
 
 class CompraDAO:
     def __init__(self):
@@ -22,56 +40,72 @@ class CompraDAO:
         }
         
         try:
-            self.connection.cursor.execute(query, params)
-            compra.folio = self.connection.cursor.lastrowid
-            self.connection.commit()
+            with self.connection.transaction() as cursor:
+                cursor.execute(query, params)
+                compra.folio = cursor.lastrowid
             return True
         except Error as e:
             print(f"Error al guardar compra: {e}")
-            self.connection.rollback()
             return False
     
     def delete(self, folio: int) -> bool:
         query = "DELETE FROM compras WHERE folio = %s"
         
         try:
-            self.connection.cursor.execute(query, (folio,))
-            self.connection.commit()
-            return self.connection.cursor.rowcount > 0
+            with self.connection.transaction() as cursor:
+                cursor.execute(query, (folio,))
+                return cursor.rowcount > 0
         except Error as e:
             print(f"Error al eliminar compra: {e}")
-            self.connection.rollback()
             return False
     
     def get(self, folio: int) -> Optional[Dict]:
-        query = """
-            SELECT c.*, p.nombre as proveedor_nombre, u.nombre as usuario_nombre
-            FROM compras c
-            JOIN proveedor p ON c.proveedorid = p.proveedorid
-            JOIN usuarios u ON c.usuarioid = u.usuarioid
-            WHERE c.folio = %s
-        """
-        
         try:
-            self.connection.cursor.execute(query, (folio,))
-            result = self.connection.cursor.fetchone()
+            with self.connection.cursor() as cursor:
+                cursor.execute(GET_QUERY, (folio,))
+                result = cursor.fetchone()
             return result
         except Error as e:
             print(f"Error al obtener compra: {e}")
             return None
     
     def get_all(self) -> List[Dict]:
-        query = """
-            SELECT c.*, p.nombre as proveedor_nombre, u.nombre as usuario_nombre
-            FROM compras c
-            JOIN proveedor p ON c.proveedorid = p.proveedorid
-            JOIN usuarios u ON c.usuarioid = u.usuarioid
-            ORDER BY c.fecha DESC
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(GET_ALL_QUERY)
+                return cursor.fetchall()
+        except Error as e:
+            print(f"Error al obtener compras: {e}")
+            return []
+    
+    def page(self, after: Optional[Tuple] = None, limit: int = 100,
+             filters: Optional[Dict] = None) -> Tuple[List[Dict], Optional[Tuple]]:
+        """Página de compras por llave (fecha, folio) descendente.
+
+        Filtros: proveedor_id, usuario_id, desde, hasta. Devuelve (compras, cursor siguiente).
         """
+        query, params = self.page_sql(after, limit, filters)
         
         try:
-            self.connection.cursor.execute(query)
-            return self.connection.cursor.fetchall()
+            with self.connection.cursor() as cursor:
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
+            return split_page(rows, limit, ('fecha', 'folio'))
         except Error as e:
-            print(f"Error al obtener compras: {e}")
-            return []
\ No newline at end of file
+            print(f"Error al obtener página de compras: {e}")
+            return [], None
+    
+    @staticmethod
+    def page_sql(after: Optional[Tuple] = None, limit: int = 100,
+                 filters: Optional[Dict] = None) -> Tuple[str, list]:
+        """Consulta y parámetros de ``page``."""
+        return page_query(COMPRA_SELECT, PAGE_COLUMNS, after, limit, filters, PAGE_FILTERS,
+                          descending=True)
+    
+    def iter_all(self, batch_size: int = 500) -> Iterator[Dict]:
+        """Recorre el historial de compras en lotes, sin cargarlo completo en memoria (ver VentaDAO.iter_all)."""
+        try:
+            yield from self.connection.stream(GET_ALL_QUERY, batch_size=batch_size)
+        except Error as e:
+            print(f"Error al recorrer compras: {e}")
+            raise
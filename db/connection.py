@@ -1,164 +1,134 @@
-import mysql.connector
-from mysql.connector import Error
+import threading
+from contextlib import contextmanager
 from typing import Optional
-from config import Config
+from db import instrumentation
+from db.backends import Backend, get_backend
+from db.errors import Error
+from db.migrations import migrate
+from db.pool import ConnectionPool
+import tracing
 
 class Connection:
+    """Punto de acceso compartido a la base de datos.
+
+    Cada operación toma una conexión del pool con ``cursor()`` (lecturas) o
+    ``transaction()`` (escrituras) y la devuelve al terminar. El driver lo decide
+    ``Config.DB_BACKEND`` (MySQL en producción, SQLite para pruebas y benchmarks).
+    """
     _instance: Optional['Connection'] = None
+    _lock = threading.Lock()
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialize()
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._initialize()
+                    cls._instance = instance
         return cls._instance
 
     def _initialize(self):
+        self.backend: Backend = get_backend()
         try:
-            self.con = mysql.connector.connect(
-                host=Config.DB_HOST,
-                user=Config.DB_USER,
-                password=Config.DB_PASSWORD
-            )
-            self.cursor = self.con.cursor(dictionary=True)
-
-            self.cursor.execute(f"CREATE DATABASE IF NOT EXISTS {Config.DB_NAME}")
-            self.cursor.execute(f"USE {Config.DB_NAME}")
-
-            self._create_tables()
+            try:
+                self.pool: ConnectionPool = self.backend.create_pool()
+                migrate(self)
+            except Error as e:
+                if not self.backend.is_missing_database(e):
+                    raise
+                # Primera ejecución: la base de datos aún no existe
+                self.backend.create_database()
+                self.pool = self.backend.create_pool()
+                migrate(self)
         except Error as e:
             raise ConnectionError(f"Error al conectar a la base de datos: {e}")
 
-    def _create_tables(self):
-        tables = [
-            """
-            CREATE TABLE IF NOT EXISTS usuarios (
-                usuarioid INT AUTO_INCREMENT PRIMARY KEY,
-                nombre VARCHAR(50) NOT NULL,
-                user_name VARCHAR(50) NOT NULL UNIQUE,
-                password VARCHAR(100) NOT NULL,
-                perfil ENUM('admin', 'cajero', 'gerente') NOT NULL
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS clientes (
-                clienteid INT AUTO_INCREMENT PRIMARY KEY,
-                usuarioid INT NOT NULL,
-                nombre VARCHAR(50) NOT NULL,
-                telefono VARCHAR(10) NOT NULL,
-                RFC VARCHAR(13) NOT NULL UNIQUE,
-                FOREIGN KEY (usuarioid) REFERENCES usuarios(usuarioid)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS proveedor (
-                proveedorid INT AUTO_INCREMENT PRIMARY KEY,
-                nombre VARCHAR(50) NOT NULL,
-                empresa VARCHAR(50),
-                direccion VARCHAR(100),
-                telefono VARCHAR(10)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS articulos (
-                articuloid INT AUTO_INCREMENT PRIMARY KEY,
-                descripcion VARCHAR(100) NOT NULL,
-                precio_venta DECIMAL(10,2) NOT NULL
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS det_art (
-                detid INT AUTO_INCREMENT PRIMARY KEY,
-                proveedorid INT NOT NULL,
-                articuloid INT NOT NULL,
-                precio DECIMAL(10,2) NOT NULL,
-                existencias INT NOT NULL,
-                FOREIGN KEY (proveedorid) REFERENCES proveedor(proveedorid),
-                FOREIGN KEY (articuloid) REFERENCES articulos(articuloid)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS ventas (
-                folio INT AUTO_INCREMENT PRIMARY KEY,
-                fecha DATE NOT NULL DEFAULT CURRENT_DATE,
-                usuarioid INT NOT NULL,
-                clienteid INT NOT NULL,
-                FOREIGN KEY (usuarioid) REFERENCES usuarios(usuarioid),
-                FOREIGN KEY (clienteid) REFERENCES clientes(clienteid)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS det_venta (
-                detid INT AUTO_INCREMENT PRIMARY KEY,
-                folio INT NOT NULL,
-                articuloid INT NOT NULL,
-                cantidad INT NOT NULL,
-                FOREIGN KEY (folio) REFERENCES ventas(folio),
-                FOREIGN KEY (articuloid) REFERENCES articulos(articuloid)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS compras (
-                folio INT AUTO_INCREMENT PRIMARY KEY,
-                fecha DATE NOT NULL DEFAULT CURRENT_DATE,
-                usuarioid INT NOT NULL,
-                proveedorid INT NOT NULL,
-                FOREIGN KEY (proveedorid) REFERENCES proveedor(proveedorid)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS det_compra (
-                detid INT AUTO_INCREMENT PRIMARY KEY,
-                folio INT NOT NULL,
-                articuloid INT NOT NULL,
-                cantidad INT NOT NULL,
-                FOREIGN KEY (folio) REFERENCES compras(folio),
-                FOREIGN KEY (articuloid) REFERENCES articulos(articuloid)
-            )
-            """,
-            """
-            CREATE TABLE IF NOT EXISTS descuento_puntos (
-                descuentoid INT AUTO_INCREMENT PRIMARY KEY,
-                puntos_minimos INT NOT NULL,
-                puntos_maximos INT NOT NULL,
-                porcentaje_descuento DECIMAL(5,2) NOT NULL
-            )
-            """
-        ]
+    @contextmanager
+    def cursor(self, dictionary: bool = True, buffered: bool = True):
+        """Presta una conexión del pool y entrega un cursor para lecturas.
 
-        try:
-            for table in tables:
-                self.cursor.execute(table)
-            self.con.commit()
-        except Error as e:
-            print(f"Error al crear tablas: {e}")
-            self.con.rollback()
+        Con ``buffered=False`` las filas se leen del servidor conforme se piden.
+        """
+        with tracing.dao_span():
+            con = self.pool.acquire()
+            broken = False
+            try:
+                cursor = self._wrap(self.backend.cursor(con, dictionary=dictionary, buffered=buffered))
+                try:
+                    yield cursor
+                finally:
+                    if self.backend.has_unread_result(con):
+                        # Recorrido sin buffer abandonado a medias: drenar el resto del
+                        # resultado puede costar más que abrir una conexión nueva
+                        broken = True
+                    else:
+                        cursor.close()
+            except self.backend.broken_errors:
+                broken = True
+                raise
+            finally:
+                self.pool.release(con, broken)
 
-    def _get_cursor(self):
-        """Obtiene un cursor de la conexión."""
-        if not self.con.is_connected():
-            self._initialize()
-        return self.con.cursor(dictionary=True)
+    @contextmanager
+    def transaction(self):
+        """Presta una conexión del pool dentro de una transacción.
+
+        Hace commit al salir del bloque y rollback si ocurre cualquier excepción.
+        """
+        with tracing.dao_span():
+            con = self.pool.acquire()
+            broken = False
+            try:
+                self.backend.begin(con)
+                cursor = self._wrap(self.backend.cursor(con, dictionary=True, buffered=True))
+                try:
+                    yield cursor
+                    with tracing.span('COMMIT', 'sql'):
+                        con.commit()
+                except BaseException:
+                    try:
+                        with tracing.span('ROLLBACK', 'sql'):
+                            con.rollback()
+                    except Error:
+                        broken = True
+                    raise
+                finally:
+                    cursor.close()
+            except self.backend.broken_errors:
+                broken = True
+                raise
+            finally:
+                self.pool.release(con, broken)
+
+    @staticmethod
+    def _wrap(cursor):
+        if instrumentation.enabled:
+            cursor = instrumentation.InstrumentedCursor(cursor)
+        if tracing.enabled:
+            cursor = tracing.TracedCursor(cursor)
+        return cursor
 
     def close(self):
         try:
-            if hasattr(self, 'cursor') and self.cursor:
-                self.cursor.close()
-        except Exception:
-            pass
-        try:
-            if hasattr(self, 'con') and self.con and self.con.is_connected():
-                self.con.close()
+            self.pool.close()
         except Exception:
             pass
 
-    def commit(self):
-        self.con.commit()
+    def stream(self, query, params=None, batch_size: int = 500):
+        """Genera las filas de una consulta en lotes de ``batch_size`` sin cargarlas todas.
 
-    def rollback(self):
-        self.con.rollback()
+        La conexión queda prestada mientras el generador no se agote o se cierre.
+        """
+        with self.cursor(buffered=False) as cursor:
+            cursor.execute(query, params or ())
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
 
     def fetch_all(self, query, params=None):
         """Ejecuta una consulta y devuelve todas las filas."""
-        cursor = self._get_cursor()
-        cursor.execute(query, params or ())
-        return cursor.fetchall()
+        with self.cursor() as cursor:
+            cursor.execute(query, params or ())
+            return cursor.fetchall()
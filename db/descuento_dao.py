@@ -1,7 +1,17 @@
-from typing import List, Optional
-from mysql.connector import Error
+import threading
+from typing import Dict, List, Optional
+from db.errors import Error
 from models.descuento_puntos import DescuentoPuntos
 from db.connection import Connection
+from db.descuento_index import DescuentoIndex
+
+# Los niveles de descuento se cargan una sola vez por proceso y solo se recargan
+# cuando este DAO modifica la tabla.
+_index: Optional[DescuentoIndex] = None
+_index_lock = threading.Lock()
+
+# Única consulta de lectura (carga del índice), compartida con explain_queries.py
+GET_ALL_QUERY = "SELECT * FROM descuento_puntos ORDER BY puntos_minimos"
 
 class DescuentoDAO:
     def __init__(self):
@@ -22,75 +32,107 @@ class DescuentoDAO:
         }
         
         try:
-            self.connection.cursor.execute(query, params)
-            descuento.descuento_id = self.connection.cursor.lastrowid
-            self.connection.commit()
+            with self.connection.transaction() as cursor:
+                cursor.execute(query, params)
+                descuento.descuento_id = cursor.lastrowid
+            self._invalidate_index()
             return True
         except Error as e:
             print(f"Error al guardar descuento: {e}")
-            self.connection.rollback()
             return False
     
-    def get_all(self) -> List[DescuentoPuntos]:
-        query = "SELECT * FROM descuento_puntos ORDER BY puntos_minimos"
-        descuentos = []
-        
-        try:
-            self.connection.cursor.execute(query)
-            results = self.connection.cursor.fetchall()
+    def update(self, descuento: DescuentoPuntos) -> bool:
+        if not descuento.validate() or not descuento.descuento_id:
+            return False
             
-            for result in results:
-                descuentos.append(DescuentoPuntos(
-                    descuento_id=result['descuentoid'],
-                    puntos_minimos=result['puntos_minimos'],
-                    puntos_maximos=result['puntos_maximos'],
-                    porcentaje_descuento=result['porcentaje_descuento']
-                ))
-            return descuentos
-        except Error as e:
-            print(f"Error al obtener descuentos: {e}")
-            return []
-    
-    def get_for_puntos(self, puntos: int) -> List[DescuentoPuntos]:
         query = """
-            SELECT * FROM descuento_puntos 
-            WHERE %s BETWEEN puntos_minimos AND puntos_maximos
-            ORDER BY porcentaje_descuento DESC
+            UPDATE descuento_puntos
+            SET puntos_minimos = %(puntos_minimos)s,
+                puntos_maximos = %(puntos_maximos)s,
+                porcentaje_descuento = %(porcentaje_descuento)s
+            WHERE descuentoid = %(descuento_id)s
         """
-        descuentos = []
+        params = {
+            'descuento_id': descuento.descuento_id,
+            'puntos_minimos': descuento.puntos_minimos,
+            'puntos_maximos': descuento.puntos_maximos,
+            'porcentaje_descuento': descuento.porcentaje_descuento
+        }
         
         try:
-            self.connection.cursor.execute(query, (puntos,))
-            results = self.connection.cursor.fetchall()
-            
-            for result in results:
-                descuentos.append(DescuentoPuntos(
-                    descuento_id=result['descuentoid'],
-                    puntos_minimos=result['puntos_minimos'],
-                    puntos_maximos=result['puntos_maximos'],
-                    porcentaje_descuento=result['porcentaje_descuento']
-                ))
-            return descuentos
+            with self.connection.transaction() as cursor:
+                cursor.execute(query, params)
+                updated = cursor.rowcount > 0
+            self._invalidate_index()
+            return updated
         except Error as e:
-            print(f"Error al obtener descuentos por puntos: {e}")
-            return []
+            print(f"Error al actualizar descuento: {e}")
+            return False
     
-    def get(self, descuento_id: int) -> Optional[DescuentoPuntos]:
-        query = "SELECT * FROM descuento_puntos WHERE descuentoid = %(descuento_id)s"
-        params = {'descuento_id': descuento_id}
+    def delete(self, descuento_id: int) -> bool:
+        query = "DELETE FROM descuento_puntos WHERE descuentoid = %s"
         
         try:
-            self.connection.cursor.execute(query, params)
-            result = self.connection.cursor.fetchone()
+            with self.connection.transaction() as cursor:
+                cursor.execute(query, (descuento_id,))
+                deleted = cursor.rowcount > 0
+            self._invalidate_index()
+            return deleted
+        except Error as e:
+            print(f"Error al eliminar descuento: {e}")
+            return False
+    
+    def _invalidate_index(self) -> None:
+        global _index
+        with _index_lock:
+            _index = None
+    
+    def _get_index(self) -> Optional[DescuentoIndex]:
+        """Devuelve el índice de niveles, cargándolo de la base de datos si hace falta."""
+        global _index
+        with _index_lock:
+            if _index is not None:
+                return _index
             
-            if result:
-                return DescuentoPuntos(
+            try:
+                with self.connection.cursor() as cursor:
+                    cursor.execute(GET_ALL_QUERY)
+                    results = cursor.fetchall()
+            except Error as e:
+                print(f"Error al obtener descuentos: {e}")
+                return None
+            
+            _index = DescuentoIndex([
+                DescuentoPuntos(
                     descuento_id=result['descuentoid'],
                     puntos_minimos=result['puntos_minimos'],
                     puntos_maximos=result['puntos_maximos'],
                     porcentaje_descuento=result['porcentaje_descuento']
                 )
-            return None
-        except Error as e:
-            print(f"Error al obtener descuento: {e}")
-            return None
\ No newline at end of file
+                for result in results
+            ])
+            return _index
+    
+    def get_all(self) -> List[DescuentoPuntos]:
+        index = self._get_index()
+        return index.all() if index else []
+    
+    def get_for_puntos(self, puntos: int) -> List[DescuentoPuntos]:
+        index = self._get_index()
+        return index.for_puntos(puntos) if index else []
+    
+    def get(self, descuento_id: int) -> Optional[DescuentoPuntos]:
+        index = self._get_index()
+        return index.get(descuento_id) if index else None
+    
+    def get_many(self, descuento_ids: List[int]) -> Dict[int, DescuentoPuntos]:
+        """Devuelve {id: DescuentoPuntos} con los niveles que existen (resuelto en el índice, sin consultas)."""
+        index = self._get_index()
+        if not index:
+            return {}
+        descuentos = {}
+        for descuento_id in descuento_ids:
+            descuento = index.get(descuento_id)
+            if descuento:
+                descuentos[descuento_id] = descuento
+        return descuentos
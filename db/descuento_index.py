@@ -0,0 +1,42 @@
+from bisect import bisect_right
+from typing import Dict, List, Optional
+from models.descuento_puntos import DescuentoPuntos
+
+class DescuentoIndex:
+    """Índice en memoria de los niveles de descuento por puntos.
+
+    Divide la recta de puntos en segmentos elementales a partir de los límites de
+    todos los niveles (``puntos_minimos`` y ``puntos_maximos + 1``) y guarda, para
+    cada segmento, los niveles que lo cubren ordenados por porcentaje descendente.
+    Así la búsqueda por puntos es una bisección (O(log n)) aunque los niveles se
+    traslapen, y la búsqueda por id es un diccionario (O(1)).
+    """
+
+    def __init__(self, descuentos: List[DescuentoPuntos]):
+        self._descuentos = sorted(descuentos, key=lambda d: (d.puntos_minimos, d.descuento_id))
+        self._by_id: Dict[int, DescuentoPuntos] = {d.descuento_id: d for d in descuentos}
+
+        limites = set()
+        for d in descuentos:
+            limites.add(d.puntos_minimos)
+            limites.add(d.puntos_maximos + 1)
+        self._limites = sorted(limites)
+
+        self._segmentos: List[List[DescuentoPuntos]] = []
+        for inicio in self._limites:
+            cubren = [d for d in descuentos if d.puntos_minimos <= inicio <= d.puntos_maximos]
+            cubren.sort(key=lambda d: d.porcentaje_descuento, reverse=True)
+            self._segmentos.append(cubren)
+
+    def for_puntos(self, puntos: int) -> List[DescuentoPuntos]:
+        """Niveles aplicables a ``puntos`` (equivale a ``puntos BETWEEN min AND max``)."""
+        i = bisect_right(self._limites, puntos) - 1
+        if i < 0:
+            return []
+        return list(self._segmentos[i])
+
+    def get(self, descuento_id: int) -> Optional[DescuentoPuntos]:
+        return self._by_id.get(descuento_id)
+
+    def all(self) -> List[DescuentoPuntos]:
+        return list(self._descuentos)
@@ -0,0 +1,35 @@
+# db/errors.py
+"""Excepciones de la capa de datos, independientes del driver.
+
+Los DAOs capturan ``Error``, una tupla con la excepción base de cada driver
+disponible más ``DatabaseError`` (las que lanza nuestro propio código). Así el
+mismo ``except Error`` funciona con MySQL y con SQLite. ``IntegrityError`` agrupa
+igual las violaciones de llaves (únicas, foráneas) de cada driver.
+"""
+import sqlite3
+
+
+class DatabaseError(Exception):
+    """Error propio de la capa de datos (validaciones, pool, migraciones)."""
+
+    def __init__(self, msg: str = "", errno=None):
+        self.msg = msg
+        self.errno = errno
+        super().__init__(msg)
+
+
+class PoolError(DatabaseError):
+    """No hay conexiones disponibles en el pool."""
+
+
+_driver_errors = [sqlite3.Error]
+_integrity_errors = [sqlite3.IntegrityError]
+try:
+    from mysql.connector import Error as _MySQLError, IntegrityError as _MySQLIntegrityError
+    _driver_errors.append(_MySQLError)
+    _integrity_errors.append(_MySQLIntegrityError)
+except ImportError:  # terminales o pruebas solo con SQLite
+    pass
+
+Error = (DatabaseError, *_driver_errors)
+IntegrityError = tuple(_integrity_errors)
@@ -0,0 +1,245 @@
+import atexit
+import logging
+import math
+import re
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Módulos que no cuentan como "quien llama" al buscar el método del DAO en la pila
+_SKIP_MODULES = {__name__, 'db.connection', 'contextlib', 'tracing'}
+
+
+class Histogram:
+    """Histograma de latencias con cubetas logarítmicas (4 por cada duplicación).
+
+    Los percentiles se estiman con el límite superior de la cubeta, así que el
+    error relativo es a lo más ~19%, con memoria fija sin importar las muestras.
+    """
+
+    BASE_MS = 0.05
+    PER_DOUBLING = 4
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def _bucket(self, ms: float) -> int:
+        if ms <= self.BASE_MS:
+            return 0
+        return math.ceil(math.log2(ms / self.BASE_MS) * self.PER_DOUBLING)
+
+    def _upper(self, bucket: int) -> float:
+        return self.BASE_MS * 2 ** (bucket / self.PER_DOUBLING)
+
+    def add(self, ms: float) -> None:
+        bucket = self._bucket(ms)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, p: float) -> float:
+        if not self.count:
+            return 0.0
+        objetivo = math.ceil(p / 100 * self.count)
+        acumulado = 0
+        for bucket in sorted(self.buckets):
+            acumulado += self.buckets[bucket]
+            if acumulado >= objetivo:
+                return min(self._upper(bucket), self.max_ms)
+        return self.max_ms
+
+
+class QueryStats:
+    """Estadísticas por método de DAO: latencia, filas y número de sentencias."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Tuple[Histogram, List[int]]] = {}
+
+    def record(self, method: str, ms: float, rows: int) -> None:
+        with self._lock:
+            entry = self._stats.get(method)
+            if entry is None:
+                entry = self._stats[method] = (Histogram(), [0])
+            entry[0].add(ms)
+            if rows > 0:
+                entry[1][0] += rows
+
+    def add_rows(self, method: str, rows: int) -> None:
+        """Suma filas leídas después de la sentencia (fetch*) a las de ``method``."""
+        with self._lock:
+            entry = self._stats.get(method)
+            if entry is not None:
+                entry[1][0] += rows
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                method: {
+                    'count': hist.count,
+                    'rows': rows[0],
+                    'total_ms': hist.total_ms,
+                    'p50_ms': hist.percentile(50),
+                    'p95_ms': hist.percentile(95),
+                    'p99_ms': hist.percentile(99),
+                    'max_ms': hist.max_ms,
+                }
+                for method, (hist, rows) in self._stats.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def report(self) -> str:
+        """Tabla de texto ordenada por tiempo total."""
+        lineas = [f"{'método':<36} {'n':>7} {'filas':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"]
+        for method, s in sorted(self.snapshot().items(), key=lambda m: -m[1]['total_ms']):
+            lineas.append(
+                f"{method:<36} {s['count']:>7} {s['rows']:>9} {s['p50_ms']:>8.2f} "
+                f"{s['p95_ms']:>8.2f} {s['p99_ms']:>8.2f} {s['max_ms']:>8.2f}"
+            )
+        return "\n".join(lineas)
+
+
+# Estado compartido del proceso. Connection solo envuelve sus cursores si
+# `enabled` es verdadero; deshabilitado no hay ningún costo por sentencia.
+enabled = False
+slow_query_ms = Config.DB_SLOW_QUERY_MS
+stats = QueryStats()
+_report_registered = False
+
+
+def enable(slow_ms: Optional[float] = None) -> None:
+    """Activa la medición; al terminar el proceso se imprime el resumen en stderr."""
+    global enabled, slow_query_ms, _report_registered
+    enabled = True
+    if slow_ms is not None:
+        slow_query_ms = slow_ms
+    if not _report_registered:
+        _report_registered = True
+        atexit.register(_log_report)
+
+
+def _log_report() -> None:
+    # A stderr y no al log: la aplicación no configura logging y se perdería
+    if stats.snapshot():
+        print(f"Consultas por método:\n{stats.report()}", file=sys.stderr)
+
+
+def disable() -> None:
+    global enabled
+    enabled = False
+
+
+def caller_method() -> str:
+    """Nombre calificado (p. ej. ``ArticuloDAO.get_many``) del primer llamador fuera de la capa de conexión.
+
+    Un ayudante privado (``ProveedorDAO._execute_query``) se atribuye al método de
+    su mismo módulo que lo llamó.
+    """
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_globals.get('__name__') in _SKIP_MODULES:
+        frame = frame.f_back
+    if frame is None:
+        return '?'
+    while _is_private(frame.f_code.co_name) and frame.f_back is not None \
+            and frame.f_back.f_globals.get('__name__') == frame.f_globals.get('__name__'):
+        frame = frame.f_back
+    code = frame.f_code
+    return getattr(code, 'co_qualname', code.co_name)
+
+
+def _is_private(name: str) -> bool:
+    return name.startswith('_') and not name.startswith('__')
+
+
+def params_shape(params) -> str:
+    """Describe los parámetros sin sus valores (pueden traer contraseñas o datos personales)."""
+    if params is None:
+        return "()"
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in params.items()) + "}"
+    if isinstance(params, (list, tuple)):
+        if len(params) > 5:
+            tipos = sorted({type(v).__name__ for v in params})
+            return f"[{len(params)} x {'|'.join(tipos)}]"
+        return "(" + ", ".join(type(v).__name__ for v in params) + ")"
+    return type(params).__name__
+
+
+def _compact(sql: str) -> str:
+    return re.sub(r'\s+', ' ', sql).strip()
+
+
+class InstrumentedCursor:
+    """Envuelve un cursor de mysql.connector midiendo cada execute/executemany."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        # Método de la última sentencia, al que se suman las filas leídas
+        self._method: Optional[str] = None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        for row in self._cursor:
+            self._count(1)
+            yield row
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._count(1)
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._count(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._count(len(rows))
+        return rows
+
+    def _count(self, rows: int) -> None:
+        if rows and self._method is not None:
+            stats.add_rows(self._method, rows)
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        return self._measure(self._cursor.execute, operation, params, args, kwargs)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        return self._measure(self._cursor.executemany, operation, seq_params, args, kwargs)
+
+    def _measure(self, fn, operation, params, args, kwargs):
+        method = self._method = caller_method()
+        inicio = time.perf_counter()
+        try:
+            return fn(operation, params, *args, **kwargs)
+        finally:
+            ms = (time.perf_counter() - inicio) * 1000
+            # rowcount solo vale para escrituras (en un SELECT es 0 o -1);
+            # las filas de una consulta se cuentan al leerlas
+            rows = self._cursor.rowcount if self._cursor.description is None else 0
+            stats.record(method, ms, rows)
+            if ms >= slow_query_ms:
+                logger.warning(
+                    "Consulta lenta (%.1f ms) en %s: %s params=%s",
+                    ms, method, _compact(operation), params_shape(params)
+                )
+
+
+if Config.DB_INSTRUMENTATION:
+    enable()
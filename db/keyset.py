@@ -0,0 +1,65 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+def keyset_condition(columns: Sequence[str], after: Sequence, descending: bool = False) -> Tuple[str, list]:
+    """Construye la condición "después del cursor" para un orden compuesto.
+
+    Para columnas (a, b) y cursor (x, y) en orden ascendente genera
+    ``a >= x AND (a > x OR (a = x AND b > y))``; la primera parte mantiene la
+    condición utilizable como rango sobre el índice.
+    """
+    if len(columns) != len(after):
+        raise ValueError("El cursor no coincide con las columnas de ordenamiento")
+
+    op = "<" if descending else ">"
+    clauses = []
+    params: list = []
+    for i, column in enumerate(columns):
+        parts = [f"{c} = %s" for c in columns[:i]] + [f"{column} {op} %s"]
+        clauses.append("(" + " AND ".join(parts) + ")")
+        params.extend(list(after[:i]) + [after[i]])
+
+    condition = f"{columns[0]} {op}= %s AND ({' OR '.join(clauses)})"
+    return condition, [after[0]] + params
+
+
+def page_query(select: str, columns: Sequence[str], after: Optional[Sequence], limit: int,
+               filters: Optional[Dict], allowed_filters: Dict[str, str],
+               descending: bool = False) -> Tuple[str, list]:
+    """Arma la consulta de una página: filtros, condición de cursor, orden y límite.
+
+    ``allowed_filters`` relaciona el nombre público del filtro con su condición SQL
+    (con un solo marcador %s). Se pide una fila de más para saber si hay otra página.
+    """
+    if limit <= 0:
+        raise ValueError("El límite debe ser mayor a cero")
+
+    conditions: List[str] = []
+    params: list = []
+    for nombre, valor in (filters or {}).items():
+        if nombre not in allowed_filters:
+            raise ValueError(f"Filtro no soportado: {nombre}")
+        conditions.append(allowed_filters[nombre])
+        params.append(valor)
+
+    if after is not None:
+        condition, cursor_params = keyset_condition(columns, after, descending)
+        conditions.append(condition)
+        params.extend(cursor_params)
+
+    direction = "DESC" if descending else "ASC"
+    query = select
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY " + ", ".join(f"{c} {direction}" for c in columns)
+    query += " LIMIT %s"
+    params.append(limit + 1)
+    return query, params
+
+
+def split_page(rows: list, limit: int, keys: Sequence[str]) -> Tuple[list, Optional[tuple]]:
+    """Separa la fila extra y devuelve (filas, cursor de la página siguiente o None)."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, tuple(last[k] for k in keys)
@@ -0,0 +1,219 @@
+import re
+from typing import List, Tuple
+from db.errors import Error
+
+# Las tablas se crean con IF NOT EXISTS para que la migración 1 también pueda
+# registrarse sobre bases de datos creadas antes de existir schema_version.
+
+BASELINE_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS usuarios (
+        usuarioid INT AUTO_INCREMENT PRIMARY KEY,
+        nombre VARCHAR(50) NOT NULL,
+        user_name VARCHAR(50) NOT NULL UNIQUE,
+        password VARCHAR(100) NOT NULL,
+        perfil ENUM('admin', 'cajero', 'gerente') NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS clientes (
+        clienteid INT AUTO_INCREMENT PRIMARY KEY,
+        usuarioid INT NOT NULL,
+        nombre VARCHAR(50) NOT NULL,
+        telefono VARCHAR(10) NOT NULL,
+        RFC VARCHAR(13) NOT NULL UNIQUE,
+        FOREIGN KEY (usuarioid) REFERENCES usuarios(usuarioid)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS proveedor (
+        proveedorid INT AUTO_INCREMENT PRIMARY KEY,
+        nombre VARCHAR(50) NOT NULL,
+        empresa VARCHAR(50),
+        direccion VARCHAR(100),
+        telefono VARCHAR(10)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS articulos (
+        articuloid INT AUTO_INCREMENT PRIMARY KEY,
+        descripcion VARCHAR(100) NOT NULL,
+        precio_venta DECIMAL(10,2) NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS det_art (
+        detid INT AUTO_INCREMENT PRIMARY KEY,
+        proveedorid INT NOT NULL,
+        articuloid INT NOT NULL,
+        precio DECIMAL(10,2) NOT NULL,
+        existencias INT NOT NULL,
+        FOREIGN KEY (proveedorid) REFERENCES proveedor(proveedorid),
+        FOREIGN KEY (articuloid) REFERENCES articulos(articuloid)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ventas (
+        folio INT AUTO_INCREMENT PRIMARY KEY,
+        fecha DATE NOT NULL DEFAULT CURRENT_DATE,
+        usuarioid INT NOT NULL,
+        clienteid INT NOT NULL,
+        FOREIGN KEY (usuarioid) REFERENCES usuarios(usuarioid),
+        FOREIGN KEY (clienteid) REFERENCES clientes(clienteid)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS det_venta (
+        detid INT AUTO_INCREMENT PRIMARY KEY,
+        folio INT NOT NULL,
+        articuloid INT NOT NULL,
+        cantidad INT NOT NULL,
+        FOREIGN KEY (folio) REFERENCES ventas(folio),
+        FOREIGN KEY (articuloid) REFERENCES articulos(articuloid)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS compras (
+        folio INT AUTO_INCREMENT PRIMARY KEY,
+        fecha DATE NOT NULL DEFAULT CURRENT_DATE,
+        usuarioid INT NOT NULL,
+        proveedorid INT NOT NULL,
+        FOREIGN KEY (proveedorid) REFERENCES proveedor(proveedorid)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS det_compra (
+        detid INT AUTO_INCREMENT PRIMARY KEY,
+        folio INT NOT NULL,
+        articuloid INT NOT NULL,
+        cantidad INT NOT NULL,
+        FOREIGN KEY (folio) REFERENCES compras(folio),
+        FOREIGN KEY (articuloid) REFERENCES articulos(articuloid)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS descuento_puntos (
+        descuentoid INT AUTO_INCREMENT PRIMARY KEY,
+        puntos_minimos INT NOT NULL,
+        puntos_maximos INT NOT NULL,
+        porcentaje_descuento DECIMAL(5,2) NOT NULL
+    )
+    """
+]
+
+# Lista ordenada de migraciones: (versión, descripción, sentencias).
+# Nunca se modifica una migración ya publicada; los cambios al esquema
+# (índices, columnas nuevas, etc.) se agregan como una versión nueva al final.
+# Índices secundarios alineados con las consultas de los DAOs (ver explain_queries.py)
+SECONDARY_INDEXES = [
+    # ArticuloDAO.get_by_proveedor: igualdad en proveedorid + rango en existencias,
+    # cubre articuloid y precio para no volver a la tabla
+    "CREATE INDEX idx_det_art_proveedor_stock ON det_art (proveedorid, existencias, articuloid, precio)",
+    # ArticuloDAO.get_all y ArticuloDAO.page: ORDER BY descripcion, articuloid
+    "CREATE INDEX idx_articulos_descripcion ON articulos (descripcion, articuloid)",
+    # VentaDAO.get_all / CompraDAO.get_all: ORDER BY fecha DESC
+    "CREATE INDEX idx_ventas_fecha ON ventas (fecha, folio)",
+    "CREATE INDEX idx_compras_fecha ON compras (fecha, folio)",
+    # VentaDAO.get_detalles y el detalle de compras: filtro por folio, cubriendo las líneas
+    "CREATE INDEX idx_det_venta_folio ON det_venta (folio, articuloid, cantidad)",
+    "CREATE INDEX idx_det_compra_folio ON det_compra (folio, articuloid, cantidad)",
+    # ClienteDAO.get_all / UserDAO.get_all: ORDER BY nombre
+    "CREATE INDEX idx_clientes_nombre ON clientes (nombre)",
+    "CREATE INDEX idx_usuarios_nombre ON usuarios (nombre)",
+    # DescuentoDAO.get_for_puntos / get_all: rango sobre los límites del nivel
+    "CREATE INDEX idx_descuento_rango ON descuento_puntos "
+    "(puntos_minimos, puntos_maximos, porcentaje_descuento)",
+]
+
+# Paginación por llave: el orden de cada página debe coincidir con un índice
+KEYSET_INDEXES = [
+    # ArticuloDAO.page usa idx_articulos_descripcion (migración 2)
+    # VentaDAO.page con filtro por cliente: igualdad + orden (fecha, folio)
+    "CREATE INDEX idx_ventas_cliente_fecha ON ventas (clienteid, fecha, folio)",
+]
+
+# ClienteDAO.search: cada tipo de término va a su propio índice
+CLIENTE_SEARCH_INDEXES = [
+    # Teléfono exacto o por prefijo (el RFC ya tiene índice por ser UNIQUE)
+    "CREATE INDEX idx_clientes_telefono ON clientes (telefono)",
+    # Nombre por palabras en cualquier posición (MATCH ... IN BOOLEAN MODE)
+    "CREATE FULLTEXT INDEX ft_clientes_nombre ON clientes (nombre)",
+]
+
+MIGRATIONS: List[Tuple[int, str, List[str]]] = [
+    (1, "Esquema inicial", BASELINE_TABLES),
+    (2, "Índices secundarios para consultas frecuentes", SECONDARY_INDEXES),
+    (3, "Índices para paginación por llave", KEYSET_INDEXES),
+    (4, "Índices para búsqueda de clientes", CLIENTE_SEARCH_INDEXES),
+]
+
+SCHEMA_VERSION_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INT PRIMARY KEY,
+        descripcion VARCHAR(100) NOT NULL,
+        aplicada_en TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+# MySQL confirma cada DDL por separado: si una migración falla a la mitad, los
+# índices ya creados se quedan aunque la versión no se registre. Por eso cada
+# CREATE/DROP INDEX se omite si el índice ya está (o ya no está) y la migración
+# se puede reintentar completa.
+_CREATE_INDEX = re.compile(r"^\s*CREATE\s+(?:UNIQUE\s+|FULLTEXT\s+)?INDEX\s+(\w+)\s+ON\s+(\w+)", re.I)
+_DROP_INDEX = re.compile(r"^\s*DROP\s+INDEX\s+(\w+)\s+ON\s+(\w+)", re.I)
+
+
+def _apply(backend, cursor, statement: str) -> None:
+    """Ejecuta una sentencia de migración, omitiendo los cambios de índices ya aplicados."""
+    create = _CREATE_INDEX.match(statement)
+    if create and backend.index_exists(cursor, create.group(2), create.group(1)):
+        return
+    drop = _DROP_INDEX.match(statement)
+    if drop and not backend.index_exists(cursor, drop.group(2), drop.group(1)):
+        return
+    cursor.execute(statement)
+
+
+def _current_version(cursor) -> int:
+    try:
+        cursor.execute("SELECT MAX(version) AS version FROM schema_version")
+    except Error:
+        # Base de datos nueva o anterior al control de versiones
+        cursor.execute(SCHEMA_VERSION_TABLE)
+        return 0
+    row = cursor.fetchone()
+    return row['version'] or 0
+
+
+def latest_version() -> int:
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+
+def migrate(connection) -> int:
+    """Aplica las migraciones pendientes y devuelve la versión resultante del esquema.
+
+    En el caso normal (esquema al día) solo consulta la versión actual.
+    """
+    with connection.cursor() as cursor:
+        version = _current_version(cursor)
+        if version >= latest_version():
+            return version
+
+        with connection.backend.migration_lock(cursor):
+            version = _current_version(cursor)
+            for numero, descripcion, statements in MIGRATIONS:
+                if numero <= version:
+                    continue
+                try:
+                    for statement in statements:
+                        _apply(connection.backend, cursor, statement)
+                    cursor.execute(
+                        "INSERT INTO schema_version (version, descripcion) VALUES (%s, %s)",
+                        (numero, descripcion)
+                    )
+                except Error as e:
+                    print(f"Error al aplicar migración {numero} ({descripcion}): {e}")
+                    raise
+                version = numero
+
+    return version
@@ -0,0 +1,155 @@
+import threading
+import time
+from collections import deque
+from typing import Deque, Tuple
+from db.errors import Error, PoolError
+
+class ConnectionPool:
+    """Pool de conexiones del backend configurado (ver db.backends).
+
+    Mantiene entre ``min_size`` y ``max_size`` conexiones abiertas. Las conexiones
+    inactivas por más de ``idle_timeout`` segundos se cierran (respetando el mínimo)
+    y las que llevan más de ``validate_after`` segundos sin usarse se validan con un
+    ping antes de prestarse.
+    """
+
+    def __init__(self, backend, min_size: int = 1, max_size: int = 5,
+                 idle_timeout: float = 300, checkout_timeout: float = 10,
+                 validate_after: float = 5):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Tamaño de pool inválido")
+
+        self.backend = backend
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self.validate_after = validate_after
+
+        self._idle: Deque[Tuple[object, float]] = deque()
+        self._size = 0
+        self._cond = threading.Condition()
+        # Para medir saturación: hilos esperando conexión y esperas agotadas
+        self._waiting = 0
+        self._timeouts = 0
+
+        for _ in range(min_size):
+            self._idle.append((self._connect(), time.monotonic()))
+            self._size += 1
+
+    def _connect(self):
+        return self.backend.connect()
+
+    def _close(self, con) -> None:
+        try:
+            con.close()
+        except Exception:
+            pass
+
+    def _prune(self) -> list:
+        """Retira del pool las conexiones inactivas que excedieron idle_timeout.
+
+        Debe llamarse con el candado tomado; devuelve las conexiones a cerrar.
+        """
+        expired = []
+        now = time.monotonic()
+        # Las conexiones más antiguas quedan a la izquierda (se prestan en orden LIFO)
+        while self._idle and self._size > self.min_size:
+            con, last_used = self._idle[0]
+            if now - last_used < self.idle_timeout:
+                break
+            self._idle.popleft()
+            self._size -= 1
+            expired.append(con)
+        return expired
+
+    def acquire(self):
+        """Presta una conexión validada. Lanza PoolError si no hay una disponible a tiempo."""
+        deadline = time.monotonic() + self.checkout_timeout
+
+        while True:
+            candidate = None
+            create = False
+            with self._cond:
+                expired = self._prune()
+                while not self._idle and self._size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolError(
+                            f"No hay conexiones disponibles (máximo {self.max_size})"
+                        )
+                    self._waiting += 1
+                    try:
+                        self._cond.wait(remaining)
+                    finally:
+                        self._waiting -= 1
+
+                if self._idle:
+                    candidate = self._idle.pop()
+                else:
+                    self._size += 1
+                    create = True
+
+            for con in expired:
+                self._close(con)
+
+            if create:
+                try:
+                    return self._connect()
+                except Exception:
+                    self._discard(None)
+                    raise
+
+            con, last_used = candidate
+            if time.monotonic() - last_used < self.validate_after or self._is_valid(con):
+                return con
+            self._discard(con)
+
+    def _is_valid(self, con) -> bool:
+        return self.backend.ping(con)
+
+    def _discard(self, con) -> None:
+        if con is not None:
+            self._close(con)
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def release(self, con, broken: bool = False) -> None:
+        """Devuelve una conexión al pool, deshaciendo cualquier transacción pendiente.
+
+        Las conexiones marcadas como ``broken`` se cierran en lugar de reutilizarse.
+        """
+        if broken:
+            self._discard(con)
+            return
+
+        try:
+            self.backend.reset(con)
+        except Error:
+            self._discard(con)
+            return
+
+        with self._cond:
+            self._idle.append((con, time.monotonic()))
+            self._cond.notify()
+
+    def close(self) -> None:
+        with self._cond:
+            idle = [con for con, _ in self._idle]
+            self._size -= len(idle)
+            self._idle.clear()
+        for con in idle:
+            self._close(con)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                'max_size': self.max_size,
+                'waiting': self._waiting,
+                'timeouts': self._timeouts,
+            }
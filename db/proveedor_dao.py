@@ -1,7 +1,15 @@
-from typing import List, Optional
-from mysql.connector import Error
+from dataclasses import replace
+from typing import Dict, List, Optional, Union
+from db.errors import Error
 from models.proveedor import Proveedor
 from db.connection import Connection
+from db.cache import catalog_cache
+from db.batch import chunked, placeholders
+
+# Consultas de lectura, compartidas con explain_queries.py. {ids} se completa con placeholders(n).
+GET_QUERY = "SELECT * FROM proveedor WHERE proveedorid = %(proveedorid)s"
+GET_MANY_QUERY = "SELECT * FROM proveedor WHERE proveedorid IN ({ids})"
+GET_ALL_QUERY = "SELECT proveedorid AS proveedor_id, nombre, empresa, direccion, telefono FROM proveedor ORDER BY proveedorid"
 
 class ProveedorDAO:
     def __init__(self):
@@ -23,42 +31,131 @@ class ProveedorDAO:
         }
         
         try:
-            cursor = self.connection.cursor
-            cursor.execute(query, params)
-            proveedor.proveedor_id = cursor.lastrowid
-            self.connection.commit()
+            with self.connection.transaction() as cursor:
+                cursor.execute(query, params)
+                proveedor.proveedor_id = cursor.lastrowid
+            self._invalidate(proveedor.proveedor_id)
             return True
         except Error as e:
             print(f"Error al guardar proveedor: {e}")
-            self.connection.rollback()
             return False
 
+    def update(self, proveedor: Proveedor) -> bool:
+        if not proveedor.validate() or not proveedor.proveedor_id:
+            return False
+
+        query = """
+            UPDATE proveedor
+            SET nombre = %(nombre)s,
+                empresa = %(empresa)s,
+                direccion = %(direccion)s,
+                telefono = %(telefono)s
+            WHERE proveedorid = %(proveedor_id)s
+        """
+        params = {
+            'proveedor_id': proveedor.proveedor_id,
+            'nombre': proveedor.nombre,
+            'empresa': proveedor.empresa,
+            'direccion': proveedor.direccion,
+            'telefono': proveedor.telefono
+        }
+
+        try:
+            with self.connection.transaction() as cursor:
+                cursor.execute(query, params)
+                updated = cursor.rowcount > 0
+            self._invalidate(proveedor.proveedor_id)
+            return updated
+        except Error as e:
+            print(f"Error al actualizar proveedor: {e}")
+            return False
+
+    def delete(self, proveedor_id: int) -> bool:
+        query = "DELETE FROM proveedor WHERE proveedorid = %s"
+
+        try:
+            with self.connection.transaction() as cursor:
+                cursor.execute(query, (proveedor_id,))
+                deleted = cursor.rowcount > 0
+            self._invalidate(proveedor_id)
+            return deleted
+        except Error as e:
+            print(f"Error al eliminar proveedor: {e}")
+            return False
+
+    def _invalidate(self, proveedor_id: int) -> None:
+        catalog_cache.invalidate(('proveedores',), ('proveedor', proveedor_id))
+        # El nombre del proveedor también viaja en el detalle de cada artículo
+        catalog_cache.invalidate_kind('articulo')
+
+    # Los objetos en caché se comparten entre llamadas: se entregan copias para
+    # que un formulario que edita el que recibió no altere lo que ven los demás.
+
     def get_all(self):
-        query = "SELECT proveedorid AS proveedor_id, nombre, empresa, direccion, telefono FROM proveedor ORDER BY proveedorid"
-        rows = self._execute_query(query)
-        return [Proveedor(proveedor_id=row['proveedor_id'], nombre=row['nombre'], empresa=row['empresa'], direccion=row['direccion'], telefono=row['telefono']) for row in rows]
-
-    def _execute_query(self, query: str, params: Optional[dict] = None) -> List[dict]:
-        cursor = self.connection.cursor
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        rows = cursor.fetchall()
+        proveedores = catalog_cache.get(('proveedores',))
+        if proveedores is not None:
+            return [replace(proveedor) for proveedor in proveedores]
+
+        rows = self._execute_query(GET_ALL_QUERY)
+        proveedores = [Proveedor(proveedor_id=row['proveedor_id'], nombre=row['nombre'], empresa=row['empresa'], direccion=row['direccion'], telefono=row['telefono']) for row in rows]
+        catalog_cache.set(('proveedores',), proveedores)
+        for proveedor in proveedores:
+            catalog_cache.set(('proveedor', proveedor.proveedor_id), proveedor)
+        return [replace(proveedor) for proveedor in proveedores]
+
+    def _execute_query(self, query: str, params: Optional[Union[dict, list]] = None) -> List[dict]:
+        with self.connection.cursor() as cursor:
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            rows = cursor.fetchall()
         return rows
         
+    def get_many(self, proveedor_ids: List[int]) -> Dict[int, Proveedor]:
+        """
+        Obtiene varios proveedores; devuelve {id: Proveedor} con los que existen.
+        Los que están en caché no se consultan; el resto se pide con IN por lotes.
+        """
+        proveedores = {}
+        faltantes = []
+        for proveedor_id in dict.fromkeys(proveedor_ids):
+            proveedor = catalog_cache.get(('proveedor', proveedor_id))
+            if proveedor is not None:
+                proveedores[proveedor_id] = replace(proveedor)
+            else:
+                faltantes.append(proveedor_id)
+
+        for lote in chunked(faltantes):
+            for row in self._execute_query(GET_MANY_QUERY.format(ids=placeholders(len(lote))), lote):
+                proveedor = Proveedor(
+                    proveedor_id=row['proveedorid'],
+                    nombre=row['nombre'],
+                    empresa=row['empresa'],
+                    direccion=row['direccion'],
+                    telefono=row['telefono']
+                )
+                catalog_cache.set(('proveedor', proveedor.proveedor_id), proveedor)
+                proveedores[proveedor.proveedor_id] = replace(proveedor)
+        return proveedores
+
     def get(self, proveedor_id: int) -> Optional[Proveedor]:
-        query = "SELECT * FROM proveedor WHERE proveedorid = %(proveedorid)s"
+        proveedor = catalog_cache.get(('proveedor', proveedor_id))
+        if proveedor is not None:
+            return replace(proveedor)
+
         params = {'proveedorid': proveedor_id}
-        rows = self._execute_query(query, params)
+        rows = self._execute_query(GET_QUERY, params)
         
         if rows:
             row = rows[0]
-            return Proveedor(
+            proveedor = Proveedor(
                 proveedor_id=row['proveedorid'],
                 nombre=row['nombre'],
                 empresa=row['empresa'],
                 direccion=row['direccion'],
                 telefono=row['telefono']
             )
+            catalog_cache.set(('proveedor', proveedor_id), proveedor)
+            return replace(proveedor)
         return None
\ No newline at end of file
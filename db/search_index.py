@@ -0,0 +1,236 @@
+import heapq
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, Set, Tuple
+
+def normalize(text: str) -> str:
+    """Minúsculas, sin acentos y con espacios simples."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(text.lower().split())
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """Índice invertido en memoria para buscar artículos por subcadena.
+
+    Guarda dos niveles: palabra -> documentos y trigrama -> palabras del
+    vocabulario. Una palabra del término se resuelve primero contra el
+    vocabulario (mucho más pequeño que el catálogo) y luego se expande a los
+    documentos que contienen alguna de las palabras encontradas. Cada palabra del
+    término debe aparecer como subcadena (equivalente a varios
+    ``LIKE '%palabra%'`` unidos con AND).
+
+    Orden de los resultados: primero los textos cuya primera palabra empieza con
+    el término, luego los que tienen alguna palabra que empieza con él y al final
+    las coincidencias internas; dentro de cada grupo, los textos más cortos.
+    """
+
+    # Largo mínimo de una palabra para buscarla en el índice (un trigrama)
+    MIN_TOKEN = 3
+
+    def __init__(self):
+        self._docs: Dict[int, str] = {}
+        self._orden: Dict[int, Tuple[int, int]] = {}
+        self._words: Dict[str, Set[int]] = {}
+        self._word_grams: Dict[str, int] = {}
+        self._first: Dict[str, Set[int]] = {}
+        self._grams: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def build(self, items: Iterable[Tuple[int, str]]) -> None:
+        with self._lock:
+            self._docs.clear()
+            self._orden.clear()
+            self._words.clear()
+            self._word_grams.clear()
+            self._first.clear()
+            self._grams.clear()
+            for doc_id, text in items:
+                self._add(doc_id, text)
+
+    def add(self, doc_id: int, text: str) -> None:
+        """Agrega o reemplaza el texto de un documento."""
+        with self._lock:
+            self._remove(doc_id)
+            self._add(doc_id, text)
+
+    def remove(self, doc_id: int) -> None:
+        with self._lock:
+            self._remove(doc_id)
+
+    def _add(self, doc_id: int, text: str) -> None:
+        text = normalize(text)
+        self._docs[doc_id] = text
+        self._orden[doc_id] = (len(text), doc_id)
+        words = text.split()
+        if words:
+            self._first.setdefault(words[0], set()).add(doc_id)
+        for word in set(words):
+            docs = self._words.get(word)
+            if docs is None:
+                docs = self._words[word] = set()
+                grams = trigrams(word)
+                self._word_grams[word] = len(grams)
+                for gram in grams:
+                    self._grams.setdefault(gram, set()).add(word)
+            docs.add(doc_id)
+
+    def _remove(self, doc_id: int) -> None:
+        text = self._docs.pop(doc_id, None)
+        if text is None:
+            return
+        del self._orden[doc_id]
+        words = text.split()
+        if words:
+            self._discard(self._first, words[0], doc_id)
+        for word in set(words):
+            if self._discard(self._words, word, doc_id):
+                del self._word_grams[word]
+                for gram in trigrams(word):
+                    self._discard(self._grams, gram, word)
+
+    @staticmethod
+    def _discard(mapping: dict, key, value) -> bool:
+        """Quita ``value`` del conjunto ``mapping[key]``; devuelve True si el conjunto quedó vacío."""
+        values = mapping.get(key)
+        if values is None:
+            return False
+        values.discard(value)
+        if not values:
+            del mapping[key]
+            return True
+        return False
+
+    def _matching_words(self, token: str) -> List[str]:
+        """Palabras del vocabulario que contienen ``token``."""
+        grams = trigrams(token)
+        if not grams:
+            # Palabras de 1-2 letras: el vocabulario es pequeño, se recorre completo
+            return [w for w in self._words if token in w]
+
+        listas = sorted((self._grams.get(g, set()) for g in grams), key=len)
+        candidatas = set(listas[0])
+        for words in listas[1:]:
+            if not candidatas:
+                break
+            candidatas &= words
+        return [w for w in candidatas if token in w]
+
+    def search(self, term: str, limit: int = 100) -> List[Tuple[int, str]]:
+        """Devuelve hasta ``limit`` pares (id, texto normalizado) ordenados por relevancia.
+
+        Las palabras de menos de ``MIN_TOKEN`` letras coinciden con casi todo el
+        catálogo; no se buscan en el índice, solo filtran los documentos que
+        encontraron las demás. Si ninguna palabra alcanza ese largo no hay resultados.
+        """
+        tokens = normalize(term).split()
+        cortos = [t for t in tokens if len(t) < self.MIN_TOKEN]
+        tokens = [t for t in tokens if len(t) >= self.MIN_TOKEN]
+        if not tokens:
+            return []
+
+        with self._lock:
+            coinciden = None
+            for token in tokens[1:]:
+                docs = set()
+                for word in self._matching_words(token):
+                    docs |= self._words[word]
+                coinciden = docs if coinciden is None else coinciden & docs
+                if not coinciden:
+                    return []
+
+            # La primera palabra del término define el grupo de relevancia
+            token = tokens[0]
+            prefijo, interno = set(), set()
+            inicio = set()
+            for word in self._matching_words(token):
+                if word.startswith(token):
+                    prefijo |= self._words[word]
+                    inicio |= self._first.get(word, set())
+                else:
+                    interno |= self._words[word]
+
+            grupos = [inicio, prefijo - inicio, interno - prefijo]
+            docs = self._docs
+            resultados: List[Tuple[int, str]] = []
+            for grupo in grupos:
+                if coinciden is not None:
+                    grupo &= coinciden
+                if cortos:
+                    grupo = {d for d in grupo if all(t in docs[d] for t in cortos)}
+                faltan = limit - len(resultados)
+                if faltan <= 0:
+                    break
+                for doc_id in heapq.nsmallest(faltan, grupo, key=self._orden.__getitem__):
+                    resultados.append((doc_id, docs[doc_id]))
+            return resultados
+
+    def _similar_words(self, token: str, min_score: float, max_words: int) -> List[Tuple[str, float]]:
+        """Palabras del vocabulario parecidas a ``token`` con su similitud (0-1).
+
+        La similitud es el coeficiente de Dice entre los trigramas de ambas
+        palabras; una palabra que empieza con ``token`` vale 1.0 para que la
+        búsqueda siga funcionando mientras se escribe.
+        """
+        grams = trigrams(token)
+        if not grams:
+            return [(w, 1.0) for w in self._words if w.startswith(token)][:max_words]
+
+        comunes: Dict[str, int] = {}
+        for gram in grams:
+            for word in self._grams.get(gram, ()):
+                comunes[word] = comunes.get(word, 0) + 1
+
+        parecidas = []
+        for word, n in comunes.items():
+            if word.startswith(token):
+                score = 1.0
+            else:
+                score = 2.0 * n / (len(grams) + self._word_grams[word])
+            if score >= min_score:
+                parecidas.append((word, score))
+        return heapq.nlargest(max_words, parecidas, key=lambda p: p[1])
+
+    def search_fuzzy(self, term: str, limit: int = 20, min_score: float = 0.4,
+                     max_words: int = 50) -> List[Tuple[int, str, float]]:
+        """Búsqueda tolerante a errores de captura ("paracetamo1", "ibuprofen").
+
+        Cada palabra del término se compara contra el vocabulario por similitud de
+        trigramas y se queda con las ``max_words`` más parecidas. La calificación de
+        un documento es el promedio, por palabra del término, de la mejor similitud
+        encontrada en su texto; todas las palabras deben tener alguna coincidencia.
+        Devuelve hasta ``limit`` tuplas (id, texto normalizado, calificación).
+        """
+        tokens = normalize(term).split()
+        if not tokens:
+            return []
+
+        with self._lock:
+            total: Dict[int, float] = {}
+            for i, token in enumerate(tokens):
+                mejor: Dict[int, float] = {}
+                # De mayor a menor similitud: cada documento conserva la primera que ve
+                for word, score in self._similar_words(token, min_score, max_words):
+                    nuevos = self._words[word].difference(mejor)
+                    if i > 0:
+                        nuevos &= total.keys()
+                    mejor.update(dict.fromkeys(nuevos, score))
+                if i == 0:
+                    total = mejor
+                else:
+                    total = {d: total[d] + score for d, score in mejor.items()}
+                if not total:
+                    return []
+
+            orden = self._orden
+            mejores = heapq.nsmallest(
+                limit, total, key=lambda d: (-total[d], orden[d])
+            )
+            return [(d, self._docs[d], total[d] / len(tokens)) for d in mejores]
@@ -1,8 +1,21 @@
 # db/user_dao.py
-from typing import List, Optional
-from mysql.connector import Error
+from typing import Dict, Iterator, List, Optional
+from db.errors import Error, IntegrityError
 from models.user import User
 from db.connection import Connection
+from db.batch import chunked, placeholders
+
+# Consultas de lectura, compartidas con explain_queries.py. {ids} se completa con placeholders(n).
+GET_QUERY = "SELECT * FROM usuarios WHERE usuarioid = %s"
+GET_MANY_QUERY = "SELECT * FROM usuarios WHERE usuarioid IN ({ids})"
+GET_BY_USERNAME_QUERY = "SELECT * FROM usuarios WHERE user_name = %s"
+GET_ALL_QUERY = "SELECT * FROM usuarios ORDER BY nombre"
+INSERT_QUERY = """
+    INSERT INTO usuarios (nombre, user_name, password, perfil)
+    VALUES (%s, %s, %s, %s)
+"""
+# save_many: ids de un lote insertado con executemany
+IDS_BY_USER_NAME_QUERY = "SELECT usuarioid, user_name FROM usuarios WHERE user_name IN ({ids})"
 
 class UserDAO:
     def __init__(self):
@@ -24,15 +37,102 @@ class UserDAO:
         }
         
         try:
-            self.connection.cursor.execute(query, params)
-            user.usuario_id = self.connection.cursor.lastrowid
-            self.connection.commit()
+            with self.connection.transaction() as cursor:
+                cursor.execute(query, params)
+                user.usuario_id = cursor.lastrowid
             return True
         except Error as e:
             print(f"Error al guardar usuario: {e}")
-            self.connection.rollback()
             return False
     
+    def save_many(self, users: List[User]) -> Dict[int, str]:
+        """
+        Inserta varios usuarios (con la contraseña ya hasheada) en una sola transacción.
+
+        Descarta los inválidos y los ``user_name`` repetidos, ya sea dentro del lote
+        o en la tabla. Qué cuenta como repetido lo decide la llave única de la base
+        (con su colación: mayúsculas, acentos, espacios), no una comparación en
+        Python. Cada lote se inserta con executemany dentro de un savepoint; si
+        choca con la llave única se deshace y se inserta fila por fila, cada una en
+        su propio savepoint, para apartar solo las repetidas.
+
+        :return: Diccionario {posición en ``users``: motivo} con los que no se
+                 guardaron. Si falla la transacción, contiene a todos los que se
+                 intentaron insertar.
+        """
+        fallidos: Dict[int, str] = {}
+        validos = []
+        for i, user in enumerate(users):
+            if user.validate():
+                validos.append(i)
+            else:
+                fallidos[i] = "datos inválidos"
+
+        # usuarioid -> posición en ``users`` de los insertados en esta llamada
+        posiciones: Dict[int, int] = {}
+        try:
+            with self.connection.transaction() as cursor:
+                for lote in chunked(validos):
+                    cursor.execute("SAVEPOINT save_many_lote")
+                    try:
+                        cursor.executemany(INSERT_QUERY, [self._insert_params(users[i]) for i in lote])
+                    except IntegrityError:
+                        cursor.execute("ROLLBACK TO SAVEPOINT save_many_lote")
+                        for i in lote:
+                            self._insert_one(cursor, users, i, posiciones, fallidos)
+                        continue
+                    self._read_ids(cursor, users, lote, posiciones)
+        except Error as e:
+            print(f"Error al guardar usuarios: {e}")
+            for i in validos:
+                users[i].usuario_id = None
+                fallidos.setdefault(i, f"error de base de datos: {e}")
+
+        return dict(sorted(fallidos.items()))
+
+    @staticmethod
+    def _insert_params(user: User) -> tuple:
+        return (user.nombre, user.user_name, user.password, user.perfil)
+
+    @staticmethod
+    def _read_ids(cursor, users: List[User], lote: List[int], posiciones: Dict[int, int]) -> None:
+        """Asigna ``usuario_id`` a un lote insertado completo con executemany.
+
+        executemany no garantiza ids consecutivos: se leen por user_name. Como el
+        lote entró sin chocar con la llave única, cada fila encontrada es
+        exactamente una de las recién insertadas, con el mismo texto.
+        """
+        por_nombre = {users[i].user_name: i for i in lote}
+        cursor.execute(IDS_BY_USER_NAME_QUERY.format(ids=placeholders(len(lote))), list(por_nombre))
+        for row in cursor.fetchall():
+            i = por_nombre[row['user_name']]
+            users[i].usuario_id = row['usuarioid']
+            posiciones[row['usuarioid']] = i
+
+    @staticmethod
+    def _insert_one(cursor, users: List[User], i: int, posiciones: Dict[int, int],
+                    fallidos: Dict[int, str]) -> None:
+        """Inserta ``users[i]`` en su propio savepoint; si ya existe lo anota en ``fallidos``."""
+        cursor.execute("SAVEPOINT save_many_fila")
+        try:
+            cursor.execute(INSERT_QUERY, UserDAO._insert_params(users[i]))
+        except IntegrityError:
+            cursor.execute("ROLLBACK TO SAVEPOINT save_many_fila")
+            # La fila con la que chocó, buscada con la misma comparación de la base
+            cursor.execute(GET_BY_USERNAME_QUERY, (users[i].user_name,))
+            existente = cursor.fetchone()
+            if existente is None:
+                raise  # otra restricción: no es un user_name repetido
+            j = posiciones.get(existente['usuarioid'])
+            if j is None:
+                fallidos[i] = "user_name ya existe"
+            else:
+                fallidos[i] = f"user_name repetido en el lote (igual que la posición {j})"
+            return
+        cursor.execute("RELEASE SAVEPOINT save_many_fila")
+        users[i].usuario_id = cursor.lastrowid
+        posiciones[users[i].usuario_id] = i
+
     def update(self, user: User) -> bool:
         if not user.validate() or not user.usuario_id:
             return False
@@ -54,32 +154,47 @@ class UserDAO:
         }
         
         try:
-            self.connection.cursor.execute(query, params)
-            self.connection.commit()
-            return self.connection.cursor.rowcount > 0
+            with self.connection.transaction() as cursor:
+                cursor.execute(query, params)
+                return cursor.rowcount > 0
         except Error as e:
             print(f"Error al actualizar usuario: {e}")
-            self.connection.rollback()
+            return False
+    
+    def update_password(self, usuario_id: int, new_hash: str, old_hash: str) -> bool:
+        """
+        Cambia solo el hash de la contraseña, y solo si sigue siendo ``old_hash``.
+
+        No toca los demás campos, así que no pisa cambios hechos mientras tanto
+        (por ejemplo, un administrador que editó al usuario o cambió su contraseña).
+        Devuelve False si el hash ya había cambiado o el usuario no existe.
+        """
+        query = "UPDATE usuarios SET password = %s WHERE usuarioid = %s AND password = %s"
+        
+        try:
+            with self.connection.transaction() as cursor:
+                cursor.execute(query, (new_hash, usuario_id, old_hash))
+                return cursor.rowcount > 0
+        except Error as e:
+            print(f"Error al actualizar contraseña: {e}")
             return False
     
     def delete(self, usuario_id: int) -> bool:
         query = "DELETE FROM usuarios WHERE usuarioid = %s"
         
         try:
-            self.connection.cursor.execute(query, (usuario_id,))
-            self.connection.commit()
-            return self.connection.cursor.rowcount > 0
+            with self.connection.transaction() as cursor:
+                cursor.execute(query, (usuario_id,))
+                return cursor.rowcount > 0
         except Error as e:
             print(f"Error al eliminar usuario: {e}")
-            self.connection.rollback()
             return False
     
     def get(self, usuario_id: int) -> Optional[User]:
-        query = "SELECT * FROM usuarios WHERE usuarioid = %s"
-        
         try:
-            self.connection.cursor.execute(query, (usuario_id,))
-            result = self.connection.cursor.fetchone()
+            with self.connection.cursor() as cursor:
+                cursor.execute(GET_QUERY, (usuario_id,))
+                result = cursor.fetchone()
             
             if result:
                 return User(
@@ -94,12 +209,32 @@ class UserDAO:
             print(f"Error al obtener usuario: {e}")
             return None
     
-    def get_by_username(self, username: str) -> Optional[User]:
-        query = "SELECT * FROM usuarios WHERE user_name = %s"
+    def get_many(self, usuario_ids: List[int]) -> Dict[int, User]:
+        """Obtiene varios usuarios con consultas IN por lotes; devuelve {id: User} con los que existen."""
+        users = {}
         
         try:
-            self.connection.cursor.execute(query, (username,))
-            result = self.connection.cursor.fetchone()
+            with self.connection.cursor() as cursor:
+                for lote in chunked(dict.fromkeys(usuario_ids)):
+                    cursor.execute(GET_MANY_QUERY.format(ids=placeholders(len(lote))), lote)
+                    for result in cursor.fetchall():
+                        users[result['usuarioid']] = User(
+                            usuario_id=result['usuarioid'],
+                            nombre=result['nombre'],
+                            user_name=result['user_name'],
+                            password=result['password'],
+                            perfil=result['perfil']
+                        )
+            return users
+        except Error as e:
+            print(f"Error al obtener usuarios: {e}")
+            return {}
+    
+    def get_by_username(self, username: str) -> Optional[User]:
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(GET_BY_USERNAME_QUERY, (username,))
+                result = cursor.fetchone()
             
             if result:
                 return User(
@@ -115,12 +250,12 @@ class UserDAO:
             return None
     
     def get_all(self) -> List[User]:
-        query = "SELECT * FROM usuarios ORDER BY nombre"
         users = []
         
         try:
-            self.connection.cursor.execute(query)
-            results = self.connection.cursor.fetchall()
+            with self.connection.cursor() as cursor:
+                cursor.execute(GET_ALL_QUERY)
+                results = cursor.fetchall()
             
             for result in results:
                 users.append(User(
@@ -133,4 +268,19 @@ class UserDAO:
             return users
         except Error as e:
             print(f"Error al obtener usuarios: {e}")
-            return []
\ No newline at end of file
+            return []
+    
+    def iter_all(self, batch_size: int = 500) -> Iterator[User]:
+        """Recorre todos los usuarios en lotes, sin cargar la tabla completa en memoria. Los errores de la base se propagan."""
+        try:
+            for result in self.connection.stream(GET_ALL_QUERY, batch_size=batch_size):
+                yield User(
+                    usuario_id=result['usuarioid'],
+                    nombre=result['nombre'],
+                    user_name=result['user_name'],
+                    password=result['password'],
+                    perfil=result['perfil']
+                )
+        except Error as e:
+            print(f"Error al recorrer usuarios: {e}")
+            raise
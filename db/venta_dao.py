@@ -1,7 +1,49 @@
-from typing import List, Optional, Dict
-from mysql.connector import Error
+import time
+from typing import Iterator, List, Optional, Dict, Tuple
+from db.errors import Error
 from models.venta import Venta
+from models.cliente import Cliente
 from db.connection import Connection
+from db.keyset import page_query, split_page
+from db.batch import chunked, placeholders
+from db.articulo_dao import ArticuloDAO, StockInsuficienteError
+import metrics
+
+# Consultas de lectura, compartidas con explain_queries.py. {ids} se completa con placeholders(n).
+VENTA_SELECT = """
+    SELECT v.*, c.nombre as cliente_nombre, u.nombre as usuario_nombre
+    FROM ventas v
+    JOIN clientes c ON v.clienteid = c.clienteid
+    JOIN usuarios u ON v.usuarioid = u.usuarioid
+"""
+GET_QUERY = VENTA_SELECT + "WHERE v.folio = %s"
+GET_ALL_QUERY = VENTA_SELECT + "ORDER BY v.fecha DESC"
+GET_FULL_MANY_QUERY = """
+    SELECT v.*, c.nombre AS cliente_nombre, u.nombre AS usuario_nombre,
+           c.usuarioid AS cliente_usuarioid, c.telefono AS cliente_telefono,
+           c.RFC AS cliente_rfc,
+           dv.articuloid AS det_articuloid, a.descripcion AS det_descripcion,
+           dv.cantidad AS det_cantidad, a.precio_venta AS det_precio
+    FROM ventas v
+    JOIN clientes c ON v.clienteid = c.clienteid
+    JOIN usuarios u ON v.usuarioid = u.usuarioid
+    LEFT JOIN det_venta dv ON dv.folio = v.folio
+    LEFT JOIN articulos a ON dv.articuloid = a.articuloid
+    WHERE v.folio IN ({ids}) ORDER BY v.folio, dv.detid
+"""
+GET_DETALLES_QUERY = """
+    SELECT dv.articuloid, a.descripcion, dv.cantidad, a.precio_venta
+    FROM det_venta dv
+    JOIN articulos a ON dv.articuloid = a.articuloid
+    WHERE dv.folio = %s
+"""
+PAGE_COLUMNS = ('v.fecha', 'v.folio')
+PAGE_FILTERS = {
+    'cliente_id': 'v.clienteid = %s',
+    'usuario_id': 'v.usuarioid = %s',
+    'desde': 'v.fecha >= %s',
+    'hasta': 'v.fecha <= %s',
+}
 
 class VentaDAO:
     def __init__(self):
@@ -22,65 +64,204 @@ class VentaDAO:
         }
         
         try:
-            self.connection.cursor.execute(query, params)
-            venta.folio = self.connection.cursor.lastrowid
-            self.connection.commit()
+            with self.connection.transaction() as cursor:
+                cursor.execute(query, params)
+                venta.folio = cursor.lastrowid
             return True
         except Error as e:
             print(f"Error al guardar venta: {e}")
-            self.connection.rollback()
             return False
     
     def cancel(self, folio: int) -> bool:
         try:
-            # Eliminar detalles de venta primero
-            query = "DELETE FROM det_venta WHERE folio = %s"
-            self.connection.cursor.execute(query, (folio,))
-            
-            # Luego eliminar la venta
-            query = "DELETE FROM ventas WHERE folio = %s"
-            self.connection.cursor.execute(query, (folio,))
+            with self.connection.transaction() as cursor:
+                # Eliminar detalles de venta primero
+                query = "DELETE FROM det_venta WHERE folio = %s"
+                cursor.execute(query, (folio,))
+                
+                # Luego eliminar la venta
+                query = "DELETE FROM ventas WHERE folio = %s"
+                cursor.execute(query, (folio,))
             
-            self.connection.commit()
             return True
         except Error as e:
             print(f"Error al cancelar venta: {e}")
-            self.connection.rollback()
             return False
     
     def get(self, folio: int) -> Optional[Dict]:
-        query = """
-            SELECT v.*, c.nombre as cliente_nombre, u.nombre as usuario_nombre
-            FROM ventas v
-            JOIN clientes c ON v.clienteid = c.clienteid
-            JOIN usuarios u ON v.usuarioid = u.usuarioid
-            WHERE v.folio = %s
-        """
-        
         try:
-            self.connection.cursor.execute(query, (folio,))
-            result = self.connection.cursor.fetchone()
+            with self.connection.cursor() as cursor:
+                cursor.execute(GET_QUERY, (folio,))
+                result = cursor.fetchone()
             return result
         except Error as e:
             print(f"Error al obtener venta: {e}")
             return None
     
-    def get_all(self) -> List[Dict]:
-        query = """
-            SELECT v.*, c.nombre as cliente_nombre, u.nombre as usuario_nombre
-            FROM ventas v
-            JOIN clientes c ON v.clienteid = c.clienteid
-            JOIN usuarios u ON v.usuarioid = u.usuarioid
-            ORDER BY v.fecha DESC
+    def get_full(self, folio: int) -> Optional[Dict]:
+        """
+        Obtiene una venta completa en una sola consulta: encabezado (como ``get``),
+        ``cliente`` (Cliente) y ``detalles`` (lista de dicts con articulo_id,
+        descripcion, cantidad y precio_unitario).
         """
+        return self.get_full_many([folio]).get(folio)
+    
+    def get_full_many(self, folios: List[int]) -> Dict[int, Dict]:
+        """Como ``get_full`` para varios folios; devuelve {folio: venta} con los que existen."""
+        ventas: Dict[int, Dict] = {}
         
         try:
-            self.connection.cursor.execute(query)
-            return self.connection.cursor.fetchall()
+            with self.connection.cursor() as cursor:
+                for lote in chunked(dict.fromkeys(folios)):
+                    cursor.execute(GET_FULL_MANY_QUERY.format(ids=placeholders(len(lote))), lote)
+                    for row in cursor.fetchall():
+                        self._add_full_row(ventas, row)
+            return ventas
+        except Error as e:
+            print(f"Error al obtener ventas completas: {e}")
+            return {}
+    
+    @staticmethod
+    def _add_full_row(ventas: Dict[int, Dict], row: Dict) -> None:
+        """Acumula una fila del JOIN (encabezado repetido + una línea) en ``ventas``."""
+        linea = {
+            'articulo_id': row.pop('det_articuloid'),
+            'descripcion': row.pop('det_descripcion'),
+            'cantidad': row.pop('det_cantidad'),
+            'precio_unitario': row.pop('det_precio'),
+        }
+        venta = ventas.get(row['folio'])
+        if venta is None:
+            venta = row
+            venta['cliente'] = Cliente(
+                cliente_id=row['clienteid'],
+                usuario_id=row.pop('cliente_usuarioid'),
+                nombre=row['cliente_nombre'],
+                telefono=row.pop('cliente_telefono'),
+                rfc=row.pop('cliente_rfc')
+            )
+            venta['detalles'] = []
+            ventas[row['folio']] = venta
+        # LEFT JOIN: una venta sin líneas trae una sola fila con la línea en NULL
+        if linea['articulo_id'] is not None:
+            venta['detalles'].append(linea)
+    
+    def get_all(self) -> List[Dict]:
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(GET_ALL_QUERY)
+                return cursor.fetchall()
         except Error as e:
             print(f"Error al obtener ventas: {e}")
             return []
 
+    def iter_all(self, batch_size: int = 500) -> Iterator[Dict]:
+        """
+        Recorre el historial de ventas en lotes, sin cargarlo completo en memoria.
+
+        :param batch_size: Número de filas que se piden al servidor por lote.
+        :return: Generador de diccionarios con los mismos campos que get_all.
+        :raises Error: Si la base falla a medio recorrido. A diferencia de get_all
+                       no se devuelve vacío: el llamador ya pudo recibir filas y
+                       debe poder distinguir un recorrido truncado de uno completo.
+        """
+        try:
+            yield from self.connection.stream(GET_ALL_QUERY, batch_size=batch_size)
+        except Error as e:
+            print(f"Error al recorrer ventas: {e}")
+            raise
+
+    def checkout(self, venta: Venta, detalles: List[Dict]) -> bool:
+        """
+        Registra una venta completa en una sola transacción: encabezado, líneas
+        de detalle y descuento de existencias. Si algún artículo no tiene stock
+        suficiente no se guarda nada.
+
+        :param venta: Objeto Venta a registrar; recibe el folio asignado.
+        :param detalles: Lista de diccionarios con 'articulo_id' y 'cantidad'.
+        :return: True si la venta se registró completa, False en caso contrario.
+        """
+        if not venta.validate() or not detalles:
+            return False
+
+        cantidades: Dict[int, int] = {}
+        for detalle in detalles:
+            cantidades[detalle['articulo_id']] = cantidades.get(detalle['articulo_id'], 0) + detalle['cantidad']
+
+        inicio = time.perf_counter()
+        try:
+            with self.connection.transaction() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO ventas (fecha, usuarioid, clienteid)
+                    VALUES (%(fecha)s, %(usuario_id)s, %(cliente_id)s)
+                    """,
+                    {
+                        'fecha': venta.fecha,
+                        'usuario_id': venta.usuario_id,
+                        'cliente_id': venta.cliente_id
+                    }
+                )
+                folio = cursor.lastrowid
+
+                # Un solo INSERT de varias filas para todas las líneas
+                cursor.executemany(
+                    "INSERT INTO det_venta (folio, articuloid, cantidad) VALUES (%s, %s, %s)",
+                    [(folio, d['articulo_id'], d['cantidad']) for d in detalles]
+                )
+
+                # Descuento de stock validado y en una sola sentencia
+                faltantes = ArticuloDAO.apply_stock_deltas(
+                    cursor, {articulo_id: -cantidad for articulo_id, cantidad in cantidades.items()}
+                )
+                if faltantes:
+                    raise StockInsuficienteError(faltantes)
+
+            venta.folio = folio
+            ArticuloDAO.invalidate_cache()
+            metrics.CHECKOUT_SECONDS.observe(time.perf_counter() - inicio)
+            metrics.CHECKOUT_LINES.observe(len(detalles))
+            metrics.CHECKOUTS.inc(resultado='ok')
+            return True
+        except StockInsuficienteError as e:
+            print(f"Error al registrar venta: {e}")
+            metrics.STOCK_REJECTIONS.inc(len(e.articulo_ids), origen='checkout')
+            metrics.CHECKOUTS.inc(resultado='sin_stock')
+            return False
+        except Error as e:
+            print(f"Error al registrar venta: {e}")
+            metrics.CHECKOUTS.inc(resultado='error')
+            return False
+
+    def page(self, after: Optional[Tuple] = None, limit: int = 100,
+             filters: Optional[Dict] = None) -> Tuple[List[Dict], Optional[Tuple]]:
+        """
+        Obtiene una página del historial de ventas, de la más reciente a la más antigua,
+        usando paginación por llave (fecha, folio) en lugar de OFFSET.
+
+        :param after: Cursor devuelto por la página anterior (None para la primera).
+        :param limit: Número máximo de ventas por página.
+        :param filters: Filtros opcionales: cliente_id, usuario_id, desde, hasta.
+        :return: Tupla (ventas, cursor de la siguiente página o None si no hay más).
+        """
+        query, params = self.page_sql(after, limit, filters)
+
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
+            return split_page(rows, limit, ('fecha', 'folio'))
+        except Error as e:
+            print(f"Error al obtener página de ventas: {e}")
+            return [], None
+
+    @staticmethod
+    def page_sql(after: Optional[Tuple] = None, limit: int = 100,
+                 filters: Optional[Dict] = None) -> Tuple[str, list]:
+        """Consulta y parámetros de ``page``."""
+        return page_query(VENTA_SELECT, PAGE_COLUMNS, after, limit, filters, PAGE_FILTERS,
+                          descending=True)
+
     def save_detalle(self, detalle: Dict) -> bool:
         """
         Guarda un detalle de venta en la base de datos.
@@ -99,7 +280,8 @@ class VentaDAO:
                 detalle['cantidad'],
             )
             # Ejecutar la consulta
-            self._execute_query(query, params)
+            with self.connection.transaction() as cursor:
+                cursor.execute(query, params)
             return True
         except Exception as e:
             print(f"Error al guardar el detalle de venta: {e}")
@@ -113,12 +295,12 @@ class VentaDAO:
         :param params: Parámetros opcionales para la consulta.
         :return: Lista de diccionarios con los resultados.
         """
-        cursor = self.connection.cursor
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        rows = cursor.fetchall()
+        with self.connection.cursor() as cursor:
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            rows = cursor.fetchall()
         return rows
 
     def update(self, venta: Venta) -> bool:
@@ -141,12 +323,11 @@ class VentaDAO:
         }
         
         try:
-            self.connection.cursor.execute(query, params)
-            self.connection.commit()
+            with self.connection.transaction() as cursor:
+                cursor.execute(query, params)
             return True
         except Error as e:
             print(f"Error al actualizar venta: {e}")
-            self.connection.rollback()
             return False
 
     def get_detalles(self, folio: int) -> List[Dict]:
@@ -156,16 +337,10 @@ class VentaDAO:
         :param folio: Folio de la venta.
         :return: Lista de diccionarios con los detalles de la venta.
         """
-        query = """
-            SELECT dv.articuloid, a.descripcion, dv.cantidad, a.precio_venta
-            FROM det_venta dv
-            JOIN articulos a ON dv.articuloid = a.articuloid
-            WHERE dv.folio = %s
-        """  # Corrected: Changed 'precio_proveedor' to 'precio_venta'
-        
         try:
-            self.connection.cursor.execute(query, (folio,))
-            return self.connection.cursor.fetchall()
+            with self.connection.cursor() as cursor:
+                cursor.execute(GET_DETALLES_QUERY, (folio,))
+                return cursor.fetchall()
         except Error as e:
             print(f"Error al obtener detalles de la venta: {e}")
             return []
@@ -185,10 +360,9 @@ class VentaDAO:
         """
         
         try:
-            self.connection.cursor.execute(query, (cantidad, articulo_id))
-            self.connection.commit()
+            with self.connection.transaction() as cursor:
+                cursor.execute(query, (cantidad, articulo_id))
             return True
         except Error as e:
             print(f"Error al actualizar stock: {e}")
-            self.connection.rollback()
             return False
\ No newline at end of file
@@ -0,0 +1,121 @@
+# explain_queries.py
+"""Imprime el plan de ejecución (EXPLAIN) de cada consulta de los DAOs.
+
+Marca como problema cualquier consulta frecuente que recorra una tabla completa
+(type = ALL). El optimizador prefiere recorridos completos en tablas pequeñas,
+así que los planes solo son representativos contra una base con volumen de
+producción (p. ej. una copia con más de 1M de filas en det_venta).
+
+Uso:
+    python explain_queries.py
+"""
+import datetime
+import sys
+from db.connection import Connection
+from db.batch import placeholders
+from db import articulo_dao, cliente_dao, compra_dao, descuento_dao, proveedor_dao, user_dao, venta_dao
+from db.articulo_dao import ArticuloDAO
+from db.cliente_dao import ClienteDAO
+from db.compra_dao import CompraDAO
+from db.venta_dao import VentaDAO
+
+# Las consultas son las mismas constantes que ejecutan los DAOs; las que llevan
+# {ids} se prueban con tres valores. Los cursores de página son de ejemplo.
+IDS = placeholders(3)
+FECHA = datetime.datetime(2024, 1, 1)
+_articulos_page = ArticuloDAO.page_sql(after=("M", 0), filters={'con_existencias': True})
+_clientes_page = ClienteDAO.page_sql(after=("M", 0))
+_compras_page = CompraDAO.page_sql(after=(FECHA, 1000))
+_ventas_page = VentaDAO.page_sql(after=(FECHA, 1000))
+
+# (método del DAO, consulta, parámetros de ejemplo, es ruta frecuente)
+QUERIES = [
+    ("ArticuloDAO.get_by_proveedor", articulo_dao.GET_BY_PROVEEDOR_QUERY, (1,), True),
+    ("ArticuloDAO.get_by_id", articulo_dao.GET_BY_ID_QUERY, {'articulo_id': 1}, True),
+    ("ArticuloDAO.get_many", articulo_dao.GET_MANY_QUERY.format(ids=IDS), (1, 2, 3), True),
+    ("ArticuloDAO.page", *_articulos_page, True),
+    ("ArticuloDAO.update_stock", articulo_dao.UPDATE_STOCK_QUERY, (-1, 1, -1), True),
+    # Checkout (VentaDAO.checkout / update_stock_many): bloqueo y descuento de existencias
+    ("ArticuloDAO.apply_stock_deltas (bloqueo)", articulo_dao.LOCK_STOCK_QUERY.format(ids=IDS),
+     (1, 2, 3), True),
+    ("ArticuloDAO.apply_stock_deltas (descuento)", articulo_dao.APPLY_STOCK_QUERY.format(
+        casos=" ".join(["WHEN %s THEN %s"] * 3), ids=IDS
+    ), (1, -1, 2, -1, 3, -1, 1, 2, 3), True),
+    ("ArticuloDAO.get_all", articulo_dao.GET_ALL_QUERY, (), False),
+    ("ArticuloDAO.iter_all", articulo_dao.ITER_ALL_QUERY, (), False),
+    # La búsqueda por subcadena se resuelve con el índice en memoria; a la base
+    # solo llegan los ids ya ordenados
+    ("ArticuloDAO.search", articulo_dao.SEARCH_BY_IDS_QUERY.format(ids=IDS), (1, 2, 3), True),
+    ("ArticuloDAO.search (índice)", articulo_dao.SEARCH_INDEX_QUERY, (), False),
+    ("ClienteDAO.get", cliente_dao.GET_QUERY, (1,), True),
+    ("ClienteDAO.get_many", cliente_dao.GET_MANY_QUERY.format(ids=IDS), (1, 2, 3), True),
+    ("ClienteDAO.get_all", cliente_dao.GET_ALL_QUERY, (), False),
+    ("ClienteDAO.page", *_clientes_page, True),
+    # ClienteDAO.search: una consulta por tipo de término, cada una con su índice
+    ("ClienteDAO.search (teléfono)", cliente_dao.TELEFONO_QUERY, ("5512345678",), True),
+    ("ClienteDAO.search (teléfono prefijo)", cliente_dao.TELEFONO_PREFIX_QUERY, ("551%", 50), True),
+    ("ClienteDAO.search (RFC)", cliente_dao.RFC_QUERY, ("GOMJ800101AB1",), True),
+    ("ClienteDAO.search (RFC prefijo)", cliente_dao.RFC_PREFIX_QUERY, ("GOMJ%", 50), True),
+    ("ClienteDAO.search (nombre prefijo)", cliente_dao.NOMBRE_PREFIX_QUERY, ("Jua%", 50), True),
+    ("ClienteDAO.search (nombre FULLTEXT)", cliente_dao.NOMBRE_FULLTEXT_QUERY,
+     ("+juan* +perez*", "+juan* +perez*", 50), True),
+    ("CompraDAO.get", compra_dao.GET_QUERY, (1,), True),
+    ("CompraDAO.get_all", compra_dao.GET_ALL_QUERY, (), False),
+    ("CompraDAO.page", *_compras_page, True),
+    # Los niveles de descuento se resuelven en memoria; solo se carga la tabla
+    ("DescuentoDAO.get_all", descuento_dao.GET_ALL_QUERY, (), False),
+    ("ProveedorDAO.get", proveedor_dao.GET_QUERY, {'proveedorid': 1}, True),
+    ("ProveedorDAO.get_many", proveedor_dao.GET_MANY_QUERY.format(ids=IDS), (1, 2, 3), True),
+    ("ProveedorDAO.get_all", proveedor_dao.GET_ALL_QUERY, (), False),
+    ("UserDAO.get_by_username", user_dao.GET_BY_USERNAME_QUERY, ("admin",), True),
+    ("UserDAO.get", user_dao.GET_QUERY, (1,), True),
+    ("UserDAO.get_many", user_dao.GET_MANY_QUERY.format(ids=IDS), (1, 2, 3), True),
+    ("UserDAO.get_all", user_dao.GET_ALL_QUERY, (), False),
+    ("UserDAO.save_many", user_dao.IDS_BY_USER_NAME_QUERY.format(ids=IDS),
+     ("ana", "luis", "maria"), False),
+    ("VentaDAO.get", venta_dao.GET_QUERY, (1,), True),
+    ("VentaDAO.get_detalles", venta_dao.GET_DETALLES_QUERY, (1,), True),
+    ("VentaDAO.get_full_many", venta_dao.GET_FULL_MANY_QUERY.format(ids=IDS), (1, 2, 3), True),
+    ("VentaDAO.page", *_ventas_page, True),
+    ("VentaDAO.get_all", venta_dao.GET_ALL_QUERY, (), False),
+]
+
+COLUMNS = ('table', 'type', 'key', 'rows', 'Extra')
+
+
+def explain(cursor, query: str, params) -> list:
+    cursor.execute(f"EXPLAIN {query}", params)
+    return cursor.fetchall()
+
+
+def print_plan(nombre: str, plan: list) -> None:
+    print(f"\n== {nombre}")
+    print("  " + " | ".join(f"{c:<22}" for c in COLUMNS))
+    for row in plan:
+        print("  " + " | ".join(f"{str(row.get(c) or ''):<22}" for c in COLUMNS))
+
+
+def main() -> int:
+    connection = Connection()
+    full_scans = []
+
+    with connection.cursor() as cursor:
+        for nombre, query, params, hot in QUERIES:
+            plan = explain(cursor, query, params)
+            print_plan(nombre, plan)
+            if hot and any(row.get('type') == 'ALL' for row in plan):
+                full_scans.append(nombre)
+
+    print()
+    if full_scans:
+        print("Consultas frecuentes con recorrido completo de tabla:")
+        for nombre in full_scans:
+            print(f"  - {nombre}")
+        return 1
+
+    print("Ninguna consulta frecuente recorre una tabla completa")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
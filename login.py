@@ -1,20 +1,30 @@
 import tkinter as tk
+from concurrent.futures import Future
 from tkinter import ttk, messagebox
+from typing import Callable, Optional
 from views.base_form import BaseForm
-from db.user_dao import UserDAO
 from config import Config
+from views.styles import THEME
+from auth import authenticate_async
 
 class LoginForm(BaseForm):
-    def __init__(self, parent):
+    def __init__(self, parent, db_ready: Optional[Future] = None):
         self.username_var = tk.StringVar()
         self.password_var = tk.StringVar()
         super().__init__(parent, "Inicio de Sesión", 350, 300)
-        
-        self.dao = UserDAO()
+        # Se llama cuando la ventana ya se puede usar (base de datos lista o con error)
+        self.on_interactive: Optional[Callable] = None
+
         self._create_widgets()
         self._center_window()
         self.bind("<Return>", lambda event: self._login())  # Bind Enter key to login
 
+        if db_ready is not None:
+            # La conexión se abre en segundo plano; el botón se habilita al terminar
+            self.status_label.config(text="Conectando a la base de datos...")
+            self.run_async(db_ready, on_done=self._on_db_ready, on_error=self._on_db_error,
+                           widgets=[self.login_btn])
+
     def _create_widgets(self):
         main_frame = ttk.Frame(self, padding=20)
         main_frame.pack(fill='both', expand=True)
@@ -24,7 +34,7 @@ class LoginForm(BaseForm):
             main_frame, 
             text=Config.APP_TITLE,
             font=('Arial', 16, 'bold'),
-            foreground=Config.THEME['button_bg']
+            foreground=THEME['button_bg']
         ).pack(pady=(0, 20))
 
         # Campo Usuario
@@ -47,16 +57,26 @@ class LoginForm(BaseForm):
         self.password_entry.pack(fill='x', pady=5)
 
         # Botón Login
-        ttk.Button(
+        self.login_btn = ttk.Button(
             main_frame,
             text="Iniciar Sesión",
             command=self._login,
             style='Accent.TButton'
-        ).pack(fill='x', pady=(20, 0))
+        )
+        self.login_btn.pack(fill='x', pady=(20, 0))
+
+        self.status_label = ttk.Label(main_frame, text="")
+        self.status_label.pack(pady=(10, 0))
+
+        # Indicador mientras se verifica la contraseña; solo se muestra durante el intento
+        self.progress = ttk.Progressbar(main_frame, mode='indeterminate')
 
         self.username_entry.focus()
 
     def _login(self):
+        if self._busy:
+            return  # ya hay un intento en curso
+        
         username = self.username_var.get().strip()
         password = self.password_var.get()
         
@@ -68,17 +88,47 @@ class LoginForm(BaseForm):
             messagebox.showerror("Error", "Contraseña es requerida")
             return
             
-        try:
-            user = self.dao.get_by_username(username)
-            if user and user.check_password(password):
-                self.destroy()
-                from menu import MenuApp
-                #show menu app on top when login is successful
-                
-                MenuApp(self.master, user)
+        # La consulta y la verificación del hash (bcrypt) corren fuera del hilo de Tk
+        self._show_progress(True)
+        self.run_async(
+            authenticate_async(username, password),
+            on_done=self._on_authenticated,
+            on_error=self._on_login_error,
+            widgets=[self.login_btn, self.username_entry, self.password_entry]
+        )
+
+    def _on_db_ready(self, _):
+        self.status_label.config(text="")
+        if self.on_interactive:
+            self.on_interactive()
+
+    def _on_db_error(self, error: Exception):
+        # Se puede intentar de nuevo: el inicio de sesión vuelve a abrir la conexión
+        self.status_label.config(text=f"Sin conexión: {error}", style='Error.TLabel', wraplength=300)
+        if self.on_interactive:
+            self.on_interactive()
+
+    def _show_progress(self, visible: bool):
+        if visible:
+            self.progress.pack(fill='x', pady=(10, 0))
+            self.progress.start(15)
+        else:
+            self.progress.stop()
+            self.progress.pack_forget()
+
+    def _on_login_error(self, error: Exception):
+        self._show_progress(False)
+        messagebox.showerror("Error", f"Error al conectar: {str(error)}")
+
+    def _on_authenticated(self, user):
+        self._show_progress(False)
+        if user:
+            self.destroy()
+            from menu import MenuApp
+            #show menu app on top when login is successful
             
-            else:
-                messagebox.showerror("Error", "Credenciales inválidas")
-                self.password_var.set('')
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al conectar: {str(e)}")
\ No newline at end of file
+            MenuApp(self.master, user)
+        
+        else:
+            messagebox.showerror("Error", "Credenciales inválidas")
+            self.password_var.set('')
\ No newline at end of file
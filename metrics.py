@@ -0,0 +1,262 @@
+# metrics.py
+"""Métricas del punto de venta en formato de texto de Prometheus.
+
+Contadores, medidores e histogramas en memoria, más un servidor HTTP en un hilo
+daemon (independiente del ciclo de Tk) que los expone en ``/metrics``::
+
+    import metrics
+    metrics.start_http_server(9108)
+
+En app.py el servidor arranca solo si ``METRICS_PORT`` es distinto de 0. Por
+omisión escucha en 127.0.0.1; para que Prometheus lea cada terminal desde la red
+use ``METRICS_HOST=0.0.0.0``.
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pares = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} espera las etiquetas {self.labelnames}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Contador incrementado con ``inc`` o leído de otro componente que ya lleva la cuenta (``callback``)."""
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 callback: Optional[Callable[[], float]] = None):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._callback = callback
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if amount < 0:
+            raise ValueError("Un contador no puede disminuir")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        if self._callback is not None:
+            try:
+                values = {(): self._callback()}
+            except Exception:
+                return []  # sin dato (p. ej. la base de datos aún no se conecta)
+        else:
+            with self._lock:
+                values = dict(self._values) or ({(): 0} if not self.labelnames else {})
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, key)} {_number(v)}" for key, v in values.items()
+        ]
+
+
+class Gauge(_Metric):
+    """Medidor con valor fijado a mano o calculado al momento de leerlo (``callback``)."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, callback: Optional[Callable[[], float]] = None):
+        super().__init__(name, help_text)
+        self._value = 0.0
+        self._callback = callback
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self._value = value
+
+    def render(self) -> List[str]:
+        if self._callback is not None:
+            try:
+                value = self._callback()
+            except Exception:
+                return []  # sin dato (p. ej. la base de datos aún no se conecta)
+        else:
+            with self._lock:
+                value = self._value
+        return self.header() + [f"{self.name} {_number(value)}"]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float]):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._counts = [0] * len(self.buckets)
+        self._sum = 0.0
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._sum += value
+            for i, limite in enumerate(self.buckets):
+                if value <= limite:
+                    self._counts[i] += 1
+                    break
+
+    @contextmanager
+    def time(self):
+        """Observa la duración del bloque en segundos."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - inicio)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            counts, total = list(self._counts), self._sum
+        lines = self.header()
+        acumulado = 0
+        for limite, n in zip(self.buckets, counts):
+            acumulado += n
+            lines.append(f'{self.name}_bucket{{le="{_number(limite)}"}} {acumulado}')
+        lines.append(f"{self.name}_sum {_number(total)}")
+        lines.append(f"{self.name}_count {acumulado}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], List[str]]) -> None:
+        """Agrega una función que produce líneas ya formateadas al momento de exportar."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+CHECKOUTS = REGISTRY.register(Counter(
+    "farmacia_checkouts_total", "Ventas registradas con VentaDAO.checkout", ("resultado",)))
+CHECKOUT_LINES = REGISTRY.register(Histogram(
+    "farmacia_checkout_lineas", "Líneas por ticket registrado", (1, 2, 3, 5, 8, 13, 21, 34, 55)))
+CHECKOUT_SECONDS = REGISTRY.register(Histogram(
+    "farmacia_checkout_seconds", "Duración de VentaDAO.checkout", LATENCY_BUCKETS))
+LOGIN_SECONDS = REGISTRY.register(Histogram(
+    "farmacia_login_seconds", "Duración de la autenticación (consulta + bcrypt)", LATENCY_BUCKETS))
+STOCK_REJECTIONS = REGISTRY.register(Counter(
+    "farmacia_stock_rechazos_total", "Artículos rechazados por la validación de existencias", ("origen",)))
+
+
+def _pool_stat(key: str) -> Callable[[], float]:
+    def read() -> float:
+        from db.connection import Connection
+        if Connection._instance is None:
+            raise LookupError("pool no inicializado")
+        return Connection._instance.pool.stats()[key]
+    return read
+
+
+def _pool_saturation() -> float:
+    from db.connection import Connection
+    if Connection._instance is None:
+        raise LookupError("pool no inicializado")
+    stats = Connection._instance.pool.stats()
+    return stats['in_use'] / stats['max_size']
+
+
+REGISTRY.register(Gauge("farmacia_pool_conexiones_en_uso", "Conexiones prestadas", _pool_stat('in_use')))
+REGISTRY.register(Gauge("farmacia_pool_conexiones_max", "Tamaño máximo del pool", _pool_stat('max_size')))
+REGISTRY.register(Gauge("farmacia_pool_esperando", "Hilos esperando una conexión", _pool_stat('waiting')))
+REGISTRY.register(Gauge("farmacia_pool_saturacion", "Fracción del pool en uso (0-1)", _pool_saturation))
+REGISTRY.register(Counter("farmacia_pool_timeouts_total", "Esperas de conexión agotadas desde el arranque",
+                          callback=_pool_stat('timeouts')))
+
+
+def _query_stats() -> List[str]:
+    """Tiempos por método de DAO de db.instrumentation, como resumen con cuantiles."""
+    from db import instrumentation
+    snapshot = instrumentation.stats.snapshot()
+    if not snapshot:
+        return []
+    name = "farmacia_db_query_seconds"
+    lines = [f"# HELP {name} Latencia de las sentencias SQL por método de DAO", f"# TYPE {name} summary"]
+    for method, s in sorted(snapshot.items()):
+        for quantile, key in (('0.5', 'p50_ms'), ('0.95', 'p95_ms'), ('0.99', 'p99_ms')):
+            labels = _labels(("metodo",), (method,), f'quantile="{quantile}"')
+            lines.append(f"{name}{labels} {s[key] / 1000!r}")
+        lines.append(f"{name}_sum{_labels(('metodo',), (method,))} {s['total_ms'] / 1000!r}")
+        lines.append(f"{name}_count{_labels(('metodo',), (method,))} {s['count']}")
+    return lines
+
+
+REGISTRY.add_collector(_query_stats)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # cada lectura de Prometheus no debe llenar la consola
+
+
+def start_http_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Sirve ``/metrics`` en un hilo daemon y devuelve el servidor (``shutdown()`` para detenerlo)."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="metrics", daemon=True)
+    thread.start()
+    return server
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from typing import Optional, Literal
+from config import Config
 
 PerfilType = Literal["admin", "cajero", "gerente"]
 
@@ -20,9 +21,17 @@ class User:
             return False
         return True
     
-    def set_password(self, password: str) -> None:
+    def set_password(self, password: str, rounds: Optional[int] = None) -> None:
         import bcrypt
-        self.password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        salt = bcrypt.gensalt(rounds=rounds or Config.BCRYPT_ROUNDS)
+        self.password = bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+    def needs_rehash(self, rounds: Optional[int] = None) -> bool:
+        """True si el hash guardado usa un costo distinto al configurado (``$2b$<costo>$...``)."""
+        try:
+            return int(self.password.split('$')[2]) != (rounds or Config.BCRYPT_ROUNDS)
+        except (AttributeError, IndexError, ValueError):
+            return False
 
     def check_password(self, password: str) -> bool:
         import bcrypt
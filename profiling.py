@@ -0,0 +1,198 @@
+# profiling.py
+"""Perfilado de la aplicación en ejecución.
+
+Dos modos, ambos configurables desde ``.env`` o desde la línea de comandos:
+
+* Por formulario (``PROFILE_FORMS=VentaForm`` o ``python app.py --profile-form
+  VentaForm``; ``*`` para todos): mientras la ventana está abierta se corre
+  cProfile en el hilo de Tk y un muestreador rápido sobre todos los hilos. Al
+  cerrarla se escriben en ``PROFILE_DIR`` un ``.pstats`` (``python -m pstats`` o
+  snakeviz) y un ``.folded`` de pilas colapsadas (flamegraph.pl, speedscope).
+
+* Muestreo continuo (``PROFILE_SAMPLE_MS=50`` o ``--sample-ms 50``): solo el
+  muestreador, con costo bajo para dejarlo un día en una terminal. Las pilas se
+  acumulan y se reescriben en ``PROFILE_DIR/muestreo-<pid>.folded`` cada
+  ``FLUSH_SECONDS`` y al salir.
+
+cProfile solo ve el hilo en el que se activa; lo que corre en los hilos de
+``db.async_dao`` aparece únicamente en las pilas del muestreador.
+"""
+import atexit
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional, Set
+from config import Config
+
+# Intervalo del muestreador durante una sesión de formulario (ms)
+FORM_SAMPLE_MS = 5
+# Cada cuánto el muestreo continuo reescribe su archivo (s)
+FLUSH_SECONDS = 300
+
+# Marcos que indican un hilo ocioso (Tk esperando eventos, ejecutor esperando
+# trabajo); esas muestras se descartan para que no dominen la gráfica
+_IDLE = {
+    ('tkinter', 'mainloop'),
+    ('concurrent.futures.thread', '_worker'),
+    ('threading', 'wait'),
+    ('selectors', 'select'),
+}
+
+form_names: Set[str] = {n.strip() for n in Config.PROFILE_FORMS.split(',') if n.strip()}
+output_dir = Config.PROFILE_DIR
+_form_active = False
+_continuous: Optional['Sampler'] = None
+
+
+def _frame_label(code) -> str:
+    name = getattr(code, 'co_qualname', code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _is_idle(frame) -> bool:
+    # Nombre completo del módulo: el archivo de tkinter es tkinter/__init__.py
+    return (frame.f_globals.get('__name__'), frame.f_code.co_name) in _IDLE
+
+
+class Sampler:
+    """Muestrea periódicamente la pila de cada hilo con ``sys._current_frames``."""
+
+    def __init__(self, interval_ms: float):
+        self.interval = interval_ms / 1000
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self) -> None:
+        propio = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.sample(skip=propio)
+
+    def sample(self, skip: Optional[int] = None) -> None:
+        nombres = {t.ident: t.name for t in threading.enumerate()}
+        frames = sys._current_frames()
+        muestra = []
+        for tid, frame in frames.items():
+            if tid == skip or _is_idle(frame):
+                continue
+            pila = []
+            while frame is not None:
+                pila.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            pila.append(nombres.get(tid, str(tid)))
+            muestra.append(";".join(reversed(pila)))
+        with self._lock:
+            self.samples += 1
+            self.stacks.update(muestra)
+
+    def collapsed(self) -> str:
+        """Pilas en formato colapsado: ``hilo;raíz;...;hoja cuenta`` por línea."""
+        with self._lock:
+            return "".join(f"{pila} {n}\n" for pila, n in self.stacks.most_common())
+
+    def write(self, path: str) -> None:
+        tmp = path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(self.collapsed())
+        os.replace(tmp, path)
+
+
+class FormSession:
+    """Perfil de la vida de un formulario; ``stop()`` escribe los resultados."""
+
+    def __init__(self, form_name: str):
+        self.form_name = form_name
+        self.started = time.time()
+        self.profile = cProfile.Profile()
+        self.sampler = Sampler(FORM_SAMPLE_MS)
+        self.sampler.start()
+        self.profile.enable()
+
+    def stop(self) -> Dict[str, str]:
+        self.profile.disable()
+        self.sampler.stop()
+        os.makedirs(output_dir, exist_ok=True)
+        base = os.path.join(
+            output_dir, f"{self.form_name}-{time.strftime('%Y%m%d-%H%M%S', time.localtime(self.started))}"
+        )
+        rutas = {'pstats': base + ".pstats", 'folded': base + ".folded"}
+        self.profile.dump_stats(rutas['pstats'])
+        self.sampler.write(rutas['folded'])
+        print(f"Perfil de {self.form_name}: {rutas['pstats']}, {rutas['folded']}")
+        return rutas
+
+
+def start_form(form_name: str) -> Optional[FormSession]:
+    """Inicia una sesión si ``form_name`` está en ``form_names`` y no hay otra activa.
+
+    cProfile admite un solo perfil activo por hilo, así que si ya se está
+    perfilando otra ventana la nueva se ignora.
+    """
+    global _form_active
+    if not ('*' in form_names or form_name in form_names) or _form_active:
+        return None
+    try:
+        session = FormSession(form_name)
+    except ValueError as e:  # otro perfilador ya está activo en este hilo
+        print(f"Error al perfilar {form_name}: {e}")
+        return None
+    _form_active = True
+    return session
+
+
+def stop_form(session: FormSession) -> None:
+    global _form_active
+    try:
+        session.stop()
+    except OSError as e:
+        print(f"Error al guardar el perfil de {session.form_name}: {e}")
+    finally:
+        _form_active = False
+
+
+def start_sampling(interval_ms: float) -> Sampler:
+    """Arranca el muestreo continuo de todo el proceso."""
+    global _continuous
+    if _continuous is not None:
+        return _continuous
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"muestreo-{os.getpid()}.folded")
+    sampler = _continuous = Sampler(interval_ms)
+    sampler.start()
+
+    def flush_periodically():
+        while not sampler._stop.wait(FLUSH_SECONDS):
+            _write_continuous(sampler, path)
+
+    def flush_at_exit():
+        sampler.stop()
+        _write_continuous(sampler, path)
+
+    threading.Thread(target=flush_periodically, name="profiler-flush", daemon=True).start()
+    atexit.register(flush_at_exit)
+    return sampler
+
+
+def _write_continuous(sampler: Sampler, path: str) -> None:
+    try:
+        sampler.write(path)
+    except OSError as e:
+        print(f"Error al guardar el muestreo: {e}")
+
+
+if Config.PROFILE_SAMPLE_MS > 0:
+    start_sampling(Config.PROFILE_SAMPLE_MS)
@@ -0,0 +1,38 @@
+# tests/conftest.py
+"""Las pruebas corren los DAOs contra SQLite en memoria, sin servidor MySQL.
+
+La configuración se lee de variables de entorno al importar ``config``, así que
+se fija aquí antes de cualquier import del proyecto.
+"""
+import os
+import sys
+
+os.environ['DB_BACKEND'] = 'sqlite'
+os.environ['SQLITE_PATH'] = ':memory:'
+os.environ['BCRYPT_ROUNDS'] = '4'
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from db.connection import Connection
+from db.cache import catalog_cache
+from db import articulo_dao, descuento_dao
+
+
+def _reset_estado():
+    if Connection._instance is not None:
+        Connection._instance.close()
+        Connection._instance = None
+    catalog_cache.clear()
+    articulo_dao._search_index = None
+    articulo_dao._search_built_at = 0.0
+    articulo_dao._search_pending = None
+    descuento_dao._index = None
+
+
+@pytest.fixture
+def connection():
+    """Base en memoria nueva, ya migrada, para cada prueba."""
+    _reset_estado()
+    yield Connection()
+    _reset_estado()
@@ -0,0 +1,93 @@
+import pytest
+from db import cache
+from db.cache import CatalogCache
+
+
+class _Reloj:
+    """Sustituye time.monotonic para avanzar el tiempo sin esperar."""
+
+    def __init__(self):
+        self.ahora = 1000.0
+
+    def __call__(self) -> float:
+        return self.ahora
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    reloj = _Reloj()
+    monkeypatch.setattr(cache.time, "monotonic", reloj)
+    return reloj
+
+
+def test_expira_tras_ttl(reloj):
+    c = CatalogCache(max_entries=10, ttl=60)
+    c.set(('proveedor', 1), "Farma SA")
+
+    reloj.ahora += 60
+    assert c.get(('proveedor', 1)) == "Farma SA"
+    reloj.ahora += 0.001
+    assert c.get(('proveedor', 1)) is None
+    assert c.stats()['entries'] == 0
+
+
+def test_set_renueva_el_ttl(reloj):
+    c = CatalogCache(max_entries=10, ttl=60)
+    c.set(('proveedor', 1), "Farma SA")
+    reloj.ahora += 50
+    c.set(('proveedor', 1), "Farma del Norte")
+    reloj.ahora += 50
+    assert c.get(('proveedor', 1)) == "Farma del Norte"
+
+
+def test_desaloja_el_usado_hace_mas_tiempo(reloj):
+    c = CatalogCache(max_entries=2, ttl=60)
+    c.set(('articulo', 1), "a")
+    c.set(('articulo', 2), "b")
+    c.get(('articulo', 1))  # ahora el menos reciente es el 2
+    c.set(('articulo', 3), "c")
+
+    assert c.get(('articulo', 2)) is None
+    assert c.get(('articulo', 1)) == "a"
+    assert c.get(('articulo', 3)) == "c"
+    assert c.stats()['evictions'] == 1
+
+
+def test_no_guarda_none(reloj):
+    c = CatalogCache()
+    c.set(('articulo', 1), None)
+    assert c.stats()['entries'] == 0
+
+
+def test_invalidate_e_invalidate_kind(reloj):
+    c = CatalogCache()
+    c.set(('proveedor', 1), "p1")
+    c.set(('proveedor', 2), "p2")
+    c.set(('proveedores',), ["p1", "p2"])
+    c.set(('articulo', 1), "a1")
+
+    c.invalidate(('proveedor', 1), ('no-existe',))
+    assert c.get(('proveedor', 1)) is None
+    assert c.get(('proveedor', 2)) == "p2"
+
+    c.invalidate_kind('proveedor', 'proveedores')
+    assert c.get(('proveedor', 2)) is None
+    assert c.get(('proveedores',)) is None
+    assert c.get(('articulo', 1)) == "a1"
+
+
+def test_stats(reloj):
+    c = CatalogCache(max_entries=1, ttl=60)
+    assert c.stats()['hit_ratio'] == 0.0
+
+    c.set(('articulo', 1), "a")
+    c.get(('articulo', 1))
+    c.get(('articulo', 2))
+    c.set(('articulo', 3), "c")
+    reloj.ahora += 61
+    c.get(('articulo', 3))  # expirado: cuenta como fallo
+
+    assert c.stats() == {'hits': 1, 'misses': 2, 'hit_ratio': 1 / 3, 'entries': 0, 'evictions': 1}
+
+    c.reset_stats()
+    assert c.stats()['hits'] == c.stats()['misses'] == c.stats()['evictions'] == 0
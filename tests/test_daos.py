@@ -0,0 +1,366 @@
+import datetime
+import time
+from decimal import Decimal
+import pytest
+from db import articulo_dao
+from db.articulo_dao import ArticuloDAO
+from db.cliente_dao import ClienteDAO
+from db.proveedor_dao import ProveedorDAO
+from db.user_dao import UserDAO
+from db.venta_dao import VentaDAO
+from models.articulo import Articulo
+from models.cliente import Cliente
+from models.proveedor import Proveedor
+from models.user import User
+from models.venta import Venta
+
+
+@pytest.fixture
+def usuario(connection):
+    user = User(nombre="Cajero", user_name="cajero1", perfil="cajero")
+    user.set_password("secreto")
+    assert UserDAO().save(user)
+    return user
+
+
+@pytest.fixture
+def cliente(usuario):
+    cliente = Cliente(usuario_id=usuario.usuario_id, nombre="Juan Perez",
+                      telefono="5512345678", rfc="PEJU800101AB1")
+    assert ClienteDAO().save(cliente)
+    return cliente
+
+
+@pytest.fixture
+def proveedor(connection):
+    proveedor = Proveedor(None, "Distribuidora", "Farma SA", "5550001111", "Av. Central 10")
+    assert ProveedorDAO().save(proveedor)
+    return proveedor
+
+
+@pytest.fixture
+def articulos(proveedor):
+    """Tres artículos con 5 piezas en existencia cada uno."""
+    dao = ArticuloDAO()
+    creados = []
+    for descripcion, precio in [("Paracetamol 500 mg", "25.50"), ("Ibuprofeno 400 mg", "40.00"),
+                                ("Omeprazol 20 mg", "60.00")]:
+        articulo = Articulo(None, descripcion, Decimal(precio), Decimal("10.00"), proveedor.proveedor_id)
+        assert dao.save(articulo)
+        creados.append(articulo)
+    assert dao.update_stock_many({a.articulo_id: 5 for a in creados}) == []
+    return creados
+
+
+def _existencias(connection, articulo_id: int) -> int:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT existencias FROM det_art WHERE articuloid = %s", (articulo_id,))
+        return cursor.fetchone()['existencias']
+
+
+def _esperar_indice(dao: ArticuloDAO) -> None:
+    """Lanza la construcción del índice de búsqueda y espera a que termine."""
+    dao._get_search_index()
+    limite = time.monotonic() + 5
+    while articulo_dao._search_index is None and time.monotonic() < limite:
+        time.sleep(0.01)
+    assert articulo_dao._search_index is not None
+
+
+def _venta(usuario, cliente) -> Venta:
+    return Venta(fecha=datetime.date(2024, 5, 1), usuario_id=usuario.usuario_id,
+                 cliente_id=cliente.cliente_id, total=100.0)
+
+
+# CRUD
+
+def test_cliente_crud(cliente):
+    dao = ClienteDAO()
+    assert dao.get(cliente.cliente_id) == cliente
+
+    cliente.nombre = "Juan Perez Lopez"
+    assert dao.update(cliente)
+    assert dao.get(cliente.cliente_id).nombre == "Juan Perez Lopez"
+
+    assert dao.delete(cliente.cliente_id)
+    assert dao.get(cliente.cliente_id) is None
+
+
+def test_proveedor_crud(proveedor):
+    dao = ProveedorDAO()
+    assert dao.get(proveedor.proveedor_id) == proveedor
+
+    proveedor.empresa = "Farma del Norte"
+    assert dao.update(proveedor)
+    assert dao.get(proveedor.proveedor_id).empresa == "Farma del Norte"
+    assert [p.proveedor_id for p in dao.get_all()] == [proveedor.proveedor_id]
+
+    assert dao.delete(proveedor.proveedor_id)
+    assert dao.get(proveedor.proveedor_id) is None
+
+
+def test_proveedor_en_cache_no_se_altera_desde_fuera(proveedor):
+    dao = ProveedorDAO()
+    dao.get_all()  # llena la caché
+    for obtenido in (dao.get(proveedor.proveedor_id), dao.get_all()[0],
+                     dao.get_many([proveedor.proveedor_id])[proveedor.proveedor_id]):
+        obtenido.empresa = "Modificado"
+    assert dao.get(proveedor.proveedor_id).empresa == "Farma SA"
+    assert dao.get_all()[0].empresa == "Farma SA"
+
+
+def test_articulo_en_cache_no_se_altera_desde_fuera(articulos, proveedor):
+    dao = ArticuloDAO()
+    articulo_id = articulos[0].articulo_id
+    dao.get_by_id(articulo_id)['precio_venta'] = Decimal("0")
+    dao.get_by_id(articulo_id)['precio_venta'] = Decimal("0")
+    assert dao.get_by_id(articulo_id)['precio_venta'] == Decimal("25.50")
+
+    dao.get_by_proveedor(proveedor.proveedor_id)[0]['descripcion'] = "Modificado"
+    assert "Modificado" not in [a['descripcion'] for a in dao.get_by_proveedor(proveedor.proveedor_id)]
+
+
+def test_articulo_crud(articulos, proveedor):
+    dao = ArticuloDAO()
+    articulo = articulos[0]
+    guardado = dao.get(articulo.articulo_id)
+    assert guardado.descripcion == "Paracetamol 500 mg"
+    assert guardado.precio_venta == Decimal("25.50")
+    assert guardado.proveedor_nombre == proveedor.nombre
+
+    articulo.precio_venta = Decimal("27.00")
+    assert dao.update(articulo)
+    assert dao.get(articulo.articulo_id).precio_venta == Decimal("27.00")
+
+    ids = [a.articulo_id for a in articulos]
+    assert set(dao.get_many(ids + [999])) == set(ids)
+
+
+def test_update_stock_no_deja_negativos(connection, articulos):
+    dao = ArticuloDAO()
+    articulo_id = articulos[0].articulo_id
+    assert dao.update_stock(articulo_id, -5)
+    assert not dao.update_stock(articulo_id, -1)
+    assert _existencias(connection, articulo_id) == 0
+
+
+# Checkout
+
+def test_checkout_registra_venta_y_descuenta_stock(connection, usuario, cliente, articulos):
+    venta = _venta(usuario, cliente)
+    detalles = [
+        {'articulo_id': articulos[0].articulo_id, 'cantidad': 2},
+        {'articulo_id': articulos[1].articulo_id, 'cantidad': 1},
+        {'articulo_id': articulos[0].articulo_id, 'cantidad': 1},
+    ]
+    assert VentaDAO().checkout(venta, detalles)
+    assert venta.folio is not None
+
+    assert _existencias(connection, articulos[0].articulo_id) == 2
+    assert _existencias(connection, articulos[1].articulo_id) == 4
+    assert _existencias(connection, articulos[2].articulo_id) == 5
+
+    completa = VentaDAO().get_full(venta.folio)
+    assert completa['cliente'].cliente_id == cliente.cliente_id
+    assert [d['cantidad'] for d in completa['detalles']] == [2, 1, 1]
+
+
+def test_checkout_sin_stock_no_guarda_nada(connection, usuario, cliente, articulos):
+    venta = _venta(usuario, cliente)
+    detalles = [
+        {'articulo_id': articulos[0].articulo_id, 'cantidad': 1},
+        {'articulo_id': articulos[1].articulo_id, 'cantidad': 6},
+    ]
+    assert not VentaDAO().checkout(venta, detalles)
+    assert venta.folio is None
+
+    assert _existencias(connection, articulos[0].articulo_id) == 5
+    assert _existencias(connection, articulos[1].articulo_id) == 5
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) AS n FROM ventas")
+        assert cursor.fetchone()['n'] == 0
+        cursor.execute("SELECT COUNT(*) AS n FROM det_venta")
+        assert cursor.fetchone()['n'] == 0
+
+
+def test_update_stock_many_rechaza_todo_el_lote(connection, articulos):
+    ids = [a.articulo_id for a in articulos]
+    rechazados = ArticuloDAO().update_stock_many({ids[0]: -1, ids[1]: -10, 999: 1})
+    assert sorted(rechazados) == sorted([ids[1], 999])
+    assert _existencias(connection, ids[0]) == 5
+
+
+# Paginación por llave
+
+def test_paginas_de_clientes_sin_huecos_ni_repetidos(usuario):
+    dao = ClienteDAO()
+    for i in range(25):
+        # Nombres repetidos: el desempate por clienteid debe mantener el orden
+        assert dao.save(Cliente(usuario_id=usuario.usuario_id, nombre=f"Cliente {i % 7}",
+                                telefono=f"55000000{i:02d}", rfc=f"CLIE8001{i:02d}A01"))
+
+    vistos, after = [], None
+    while True:
+        pagina, after = dao.page(after, limit=10)
+        vistos.extend(pagina)
+        if after is None:
+            break
+
+    esperados = sorted(dao.get_all(), key=lambda c: (c.nombre, c.cliente_id))
+    assert [c.cliente_id for c in vistos] == [c.cliente_id for c in esperados]
+
+
+def test_paginas_de_ventas_mas_recientes_primero(usuario, cliente):
+    dao = VentaDAO()
+    for dia in [1, 3, 3, 2, 5, 5, 5, 4]:
+        assert dao.save(Venta(fecha=datetime.date(2024, 5, dia), usuario_id=usuario.usuario_id,
+                              cliente_id=cliente.cliente_id, total=10.0))
+
+    vistos, after = [], None
+    while True:
+        pagina, after = dao.page(after, limit=3, filters={'cliente_id': cliente.cliente_id})
+        vistos.extend(pagina)
+        if after is None:
+            break
+
+    llaves = [(v['fecha'], v['folio']) for v in vistos]
+    assert llaves == sorted(llaves, reverse=True)
+    assert len(set(llaves)) == 8
+
+
+def test_pagina_de_articulos_con_existencias(connection, articulos):
+    dao = ArticuloDAO()
+    dao.update_stock(articulos[1].articulo_id, -5)
+    pagina, after = dao.page(limit=10, filters={'con_existencias': True})
+    assert after is None
+    assert [a.descripcion for a in pagina] == ["Omeprazol 20 mg", "Paracetamol 500 mg"]
+
+
+# save_many
+
+def test_save_many_descarta_repetidos(usuario):
+    nuevos = []
+    for user_name in ["ana01", "luis02", "ANA01", "Cajero1", "x"]:
+        user = User(nombre="Usuario", user_name=user_name, password="hash", perfil="cajero")
+        nuevos.append(user)
+
+    fallidos = UserDAO().save_many(nuevos)
+
+    assert set(fallidos) == {2, 3, 4}
+    assert "repetido en el lote" in fallidos[2]
+    assert fallidos[3] == "user_name ya existe"
+    assert nuevos[0].usuario_id is not None and nuevos[1].usuario_id is not None
+    assert {u.user_name for u in UserDAO().get_all()} == {"cajero1", "ana01", "luis02"}
+
+
+def test_save_many_repetidos_segun_la_base(usuario):
+    # "Pedro" solo choca con "pedro" por la colación de la columna, sin comparar en Python
+    nombres = ["pedro", "maria", "Pedro", "rosa"]
+    nuevos = [User(nombre="Usuario", user_name=n, password="hash", perfil="cajero") for n in nombres]
+
+    fallidos = UserDAO().save_many(nuevos)
+
+    assert fallidos == {2: "user_name repetido en el lote (igual que la posición 0)"}
+    dao = UserDAO()
+    for i in (0, 1, 3):
+        assert nuevos[i].usuario_id == dao.get_by_username(nombres[i]).usuario_id
+    assert nuevos[2].usuario_id is None
+
+
+def test_save_many_asigna_ids_sin_repetidos(connection):
+    nuevos = [User(nombre="Usuario", user_name=f"user{i:02d}", password="hash", perfil="cajero")
+              for i in range(5)]
+    assert UserDAO().save_many(nuevos) == {}
+    dao = UserDAO()
+    assert [u.usuario_id for u in nuevos] == [dao.get_by_username(u.user_name).usuario_id for u in nuevos]
+
+
+def test_update_password_solo_si_no_cambio(usuario):
+    dao = UserDAO()
+    anterior = usuario.password
+    assert dao.update_password(usuario.usuario_id, "nuevo-hash", anterior)
+    # Un segundo recálculo con el hash viejo no pisa el cambio
+    assert not dao.update_password(usuario.usuario_id, "otro-hash", anterior)
+    guardado = dao.get(usuario.usuario_id)
+    assert guardado.password == "nuevo-hash"
+    assert guardado.nombre == usuario.nombre
+
+
+# Búsqueda de clientes
+
+@pytest.mark.parametrize("term, es_rfc", [
+    ("JUAN", False),
+    ("PEREZ", False),
+    ("PEJU8", True),
+    ("PEJU800101", True),
+    ("PEJU800101AB1", True),
+    ("ABC800101XY", True),
+    ("PEJU80A", False),
+])
+def test_rfc_pattern(term, es_rfc):
+    from db.cliente_dao import RFC_PATTERN
+    assert bool(RFC_PATTERN.match(term)) == es_rfc
+
+
+def test_search_cliente_por_rfc_y_nombre(cliente):
+    dao = ClienteDAO()
+    assert [c.cliente_id for c in dao.search("peju80")] == [cliente.cliente_id]
+    assert [c.cliente_id for c in dao.search("juan")] == [cliente.cliente_id]
+
+
+def test_update_articulo_renombrado_se_encuentra_en_el_indice(articulos):
+    dao = ArticuloDAO()
+    _esperar_indice(dao)
+    articulo = articulos[0]
+
+    # Mismos precio de compra y proveedor: solo cambia la descripción
+    articulo.descripcion = "Acetaminofen 500 mg"
+    assert dao.update(articulo)
+
+    assert [a['articulo_id'] for a in dao.search("acetaminofen")] == [articulo.articulo_id]
+    assert dao.search("paracetamol") == []
+
+
+def test_update_articulo_sin_det_art_se_reindexa(connection, proveedor):
+    # El UPDATE de det_art no encuentra fila: el de articulos basta para reportar éxito
+    with connection.transaction() as cursor:
+        cursor.execute("INSERT INTO articulos (descripcion, precio_venta) VALUES ('Loratadina 10 mg', 30)")
+        articulo_id = cursor.lastrowid
+    dao = ArticuloDAO()
+    _esperar_indice(dao)
+
+    articulo = Articulo(articulo_id, "Desloratadina 5 mg", Decimal("35.00"), Decimal("12.00"),
+                        proveedor.proveedor_id)
+    assert dao.update(articulo)
+    assert [a['articulo_id'] for a in dao.search("desloratadina")] == [articulo_id]
+
+
+def test_iter_all_propaga_error_a_medio_recorrido(cliente, monkeypatch):
+    import sqlite3
+    from db.connection import Connection
+
+    def stream(self, query, params=None, batch_size=500):
+        yield {'clienteid': 1, 'usuarioid': 1, 'nombre': "Juan Perez", 'telefono': "5512345678",
+               'RFC': "PEJU800101AB1"}
+        raise sqlite3.OperationalError("conexión perdida")
+
+    monkeypatch.setattr(Connection, "stream", stream)
+    recorridos = []
+    with pytest.raises(sqlite3.OperationalError):
+        for c in ClienteDAO().iter_all():
+            recorridos.append(c)
+    assert len(recorridos) == 1
+
+
+def test_search_fuzzy_espera_el_primer_indice(articulos):
+    # Primera búsqueda del proceso: el índice aún no existe
+    assert articulo_dao._search_index is None
+    resultados = ArticuloDAO().search_fuzzy("paracetamo1")
+    assert [a['articulo_id'] for a in resultados][:1] == [articulos[0].articulo_id]
+
+
+def test_search_fuzzy_sin_indice_usa_like(articulos, monkeypatch):
+    monkeypatch.setattr(ArticuloDAO, "_get_search_index", lambda self: None)
+    monkeypatch.setattr(ArticuloDAO, "_wait_search_index", staticmethod(lambda timeout: None))
+    resultados = ArticuloDAO().search_fuzzy("Omeprazol")
+    assert [(a['articulo_id'], a['score']) for a in resultados] == [(articulos[2].articulo_id, 1.0)]
@@ -0,0 +1,62 @@
+import pytest
+from db.descuento_index import DescuentoIndex
+from models.descuento_puntos import DescuentoPuntos
+
+
+@pytest.fixture
+def index():
+    return DescuentoIndex([
+        DescuentoPuntos(1, 100, 499, 5.0),
+        DescuentoPuntos(2, 500, 999, 10.0),
+        DescuentoPuntos(3, 1000, 5000, 15.0),
+        # Promoción que se traslapa con los niveles 2 y 3
+        DescuentoPuntos(4, 800, 1200, 12.0),
+    ])
+
+
+def _ids(descuentos):
+    return [d.descuento_id for d in descuentos]
+
+
+@pytest.mark.parametrize("puntos, esperados", [
+    (0, []),
+    (99, []),
+    (100, [1]),
+    (499, [1]),
+    (500, [2]),
+    (799, [2]),
+    (800, [4, 2]),
+    (999, [4, 2]),
+    (1000, [3, 4]),
+    (1200, [3, 4]),
+    (1201, [3]),
+    (5000, [3]),
+    (5001, []),
+])
+def test_for_puntos_en_los_limites(index, puntos, esperados):
+    assert _ids(index.for_puntos(puntos)) == esperados
+
+
+def test_hueco_entre_niveles():
+    index = DescuentoIndex([DescuentoPuntos(1, 0, 99, 5.0), DescuentoPuntos(2, 200, 299, 10.0)])
+    assert _ids(index.for_puntos(99)) == [1]
+    assert index.for_puntos(100) == []
+    assert index.for_puntos(199) == []
+    assert _ids(index.for_puntos(200)) == [2]
+
+
+def test_for_puntos_devuelve_copia(index):
+    index.for_puntos(100).clear()
+    assert _ids(index.for_puntos(100)) == [1]
+
+
+def test_get_y_all(index):
+    assert index.get(3).porcentaje_descuento == 15.0
+    assert index.get(99) is None
+    assert _ids(index.all()) == [1, 2, 4, 3]
+
+
+def test_sin_niveles():
+    index = DescuentoIndex([])
+    assert index.for_puntos(100) == []
+    assert index.all() == []
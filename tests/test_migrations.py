@@ -0,0 +1,53 @@
+from db.migrations import MIGRATIONS, latest_version, migrate
+
+
+def _version(connection) -> int:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT MAX(version) AS version FROM schema_version")
+        return cursor.fetchone()['version']
+
+
+def _indices(connection) -> set:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'")
+        return {row['name'] for row in cursor.fetchall()}
+
+
+def test_aplica_todas_las_migraciones(connection):
+    assert latest_version() == 4
+    assert _version(connection) == 4
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT version FROM schema_version ORDER BY version")
+        assert [row['version'] for row in cursor.fetchall()] == [n for n, _, _ in MIGRATIONS]
+
+
+def test_crea_indices(connection):
+    indices = _indices(connection)
+    assert {
+        'idx_det_art_proveedor_stock',
+        'idx_articulos_descripcion',
+        'idx_ventas_cliente_fecha',
+        'idx_clientes_telefono',
+    } <= indices
+
+
+def test_indice_de_descripcion_sirve_a_la_paginacion(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA index_info(idx_articulos_descripcion)")
+        assert [row['name'] for row in cursor.fetchall()] == ['descripcion', 'articuloid']
+
+
+def test_esquema_al_dia_no_hace_nada(connection):
+    assert migrate(connection) == 4
+    assert _version(connection) == 4
+
+
+def test_reintenta_migracion_a_medias(connection):
+    # Simula que la migración 3 creó sus índices pero no alcanzó a registrarse
+    with connection.transaction() as cursor:
+        cursor.execute("DELETE FROM schema_version WHERE version >= 3")
+    indices = _indices(connection)
+
+    assert migrate(connection) == 4
+    assert _version(connection) == 4
+    assert _indices(connection) == indices
@@ -0,0 +1,144 @@
+import threading
+import pytest
+from db import pool
+from db.errors import DatabaseError, PoolError
+from db.pool import ConnectionPool
+
+
+class _Conexion:
+    def __init__(self, n: int):
+        self.n = n
+        self.cerrada = False
+
+    def close(self):
+        self.cerrada = True
+
+
+class _Backend:
+    """Backend falso: cuenta conexiones y decide qué responde el ping."""
+
+    def __init__(self):
+        self.creadas = []
+        self.pings = 0
+        self.vivas = True
+        self.falla_reset = False
+
+    def connect(self):
+        con = _Conexion(len(self.creadas))
+        self.creadas.append(con)
+        return con
+
+    def ping(self, con) -> bool:
+        self.pings += 1
+        return self.vivas
+
+    def reset(self, con) -> None:
+        if self.falla_reset:
+            raise DatabaseError("sin conexión")
+
+
+class _Reloj:
+    def __init__(self):
+        self.ahora = 1000.0
+
+    def __call__(self) -> float:
+        return self.ahora
+
+
+@pytest.fixture
+def backend():
+    return _Backend()
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    reloj = _Reloj()
+    monkeypatch.setattr(pool.time, "monotonic", reloj)
+    return reloj
+
+
+@pytest.mark.parametrize("min_size, max_size", [(-1, 5), (0, 0), (3, 2)])
+def test_tamano_invalido(backend, min_size, max_size):
+    with pytest.raises(ValueError):
+        ConnectionPool(backend, min_size=min_size, max_size=max_size)
+
+
+def test_abre_el_minimo_y_reutiliza(backend):
+    p = ConnectionPool(backend, min_size=2, max_size=3)
+    assert len(backend.creadas) == 2
+
+    con = p.acquire()
+    p.release(con)
+    assert p.acquire() is con
+    assert p.stats() == {'size': 2, 'idle': 1, 'in_use': 1, 'max_size': 3, 'waiting': 0, 'timeouts': 0}
+
+
+def test_agota_el_tiempo_de_espera(backend):
+    p = ConnectionPool(backend, min_size=0, max_size=1, checkout_timeout=0.05)
+    p.acquire()
+    with pytest.raises(PoolError):
+        p.acquire()
+    assert p.stats()['timeouts'] == 1
+    assert p.stats()['waiting'] == 0
+
+
+def test_release_despierta_al_que_espera(backend):
+    p = ConnectionPool(backend, min_size=0, max_size=1, checkout_timeout=5)
+    con = p.acquire()
+    obtenidas = []
+    hilo = threading.Thread(target=lambda: obtenidas.append(p.acquire()))
+    hilo.start()
+    p.release(con)
+    hilo.join(5)
+    assert obtenidas == [con]
+
+
+def test_valida_solo_las_inactivas(backend, reloj):
+    p = ConnectionPool(backend, min_size=1, max_size=2, validate_after=5)
+    con = p.acquire()
+    p.release(con)
+
+    reloj.ahora += 4
+    assert p.acquire() is con
+    assert backend.pings == 0
+    p.release(con)
+
+    reloj.ahora += 6
+    assert p.acquire() is con
+    assert backend.pings == 1
+
+
+def test_descarta_la_que_no_responde(backend, reloj):
+    p = ConnectionPool(backend, min_size=1, max_size=2, validate_after=5)
+    vieja = backend.creadas[0]
+    reloj.ahora += 10
+    backend.vivas = False
+
+    nueva = p.acquire()
+    assert nueva is not vieja and vieja.cerrada
+    assert p.stats()['size'] == 1
+
+
+def test_cierra_las_inactivas_respetando_el_minimo(backend, reloj):
+    p = ConnectionPool(backend, min_size=1, max_size=3, idle_timeout=60)
+    cons = [p.acquire() for _ in range(3)]
+    for con in cons:
+        p.release(con)
+
+    reloj.ahora += 61
+    p.release(p.acquire())
+    assert p.stats()['size'] == 1
+    assert sum(con.cerrada for con in cons) == 2
+
+
+def test_release_rota_o_sin_reset_se_cierra(backend):
+    p = ConnectionPool(backend, min_size=0, max_size=2)
+    rota = p.acquire()
+    p.release(rota, broken=True)
+    assert rota.cerrada
+
+    backend.falla_reset = True
+    otra = p.acquire()
+    p.release(otra)
+    assert otra.cerrada
+    assert p.stats()['size'] == 0
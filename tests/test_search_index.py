@@ -0,0 +1,99 @@
+import pytest
+from db.search_index import TrigramIndex, normalize, trigrams
+
+
+@pytest.fixture
+def index():
+    index = TrigramIndex()
+    index.build([
+        (1, "Paracetamol 500 mg"),
+        (2, "Ibuprofeno 400 mg"),
+        (3, "Naproxeno con paracetamol"),
+        (4, "Jarabe infantil paracetamol 120 mg"),
+        (5, "Ácido acetilsalicílico 100 mg"),
+    ])
+    return index
+
+
+def _ids(resultados):
+    return [r[0] for r in resultados]
+
+
+def test_normalize():
+    assert normalize("  Ácido   ACETILsalicílico ") == "acido acetilsalicilico"
+    assert normalize(None) == ""
+
+
+def test_trigrams():
+    assert trigrams("mg") == set()
+    assert trigrams("abcd") == {"abc", "bcd"}
+
+
+def test_search_ordena_por_relevancia(index):
+    # Empieza con el término, luego palabra que empieza con él (el texto más corto primero)
+    assert _ids(index.search("parac")) == [1, 3, 4]
+
+
+def test_search_coincidencia_interna_al_final(index):
+    index.add(6, "Antiparacetamol")
+    assert _ids(index.search("parac")) == [1, 3, 4, 6]
+
+
+def test_search_todas_las_palabras(index):
+    assert _ids(index.search("paracetamol 500")) == [1]
+    assert _ids(index.search("paracetamol ibuprofeno")) == []
+
+
+def test_search_palabras_cortas_solo_acotan(index):
+    assert _ids(index.search("mg")) == []
+    assert _ids(index.search("paracetamol mg")) == [1, 4]
+
+
+def test_search_sin_acentos_ni_mayusculas(index):
+    assert _ids(index.search("ACIDO")) == [5]
+
+
+def test_search_respeta_limite(index):
+    assert _ids(index.search("parac", limit=2)) == [1, 3]
+
+
+def test_add_reemplaza_y_remove_quita(index):
+    index.add(2, "Ketorolaco 10 mg")
+    assert index.search("ibuprofeno") == []
+    assert _ids(index.search("ketorolaco")) == [2]
+
+    index.remove(2)
+    assert index.search("ketorolaco") == []
+    assert len(index) == 4
+    index.remove(99)  # no existe: no hace nada
+
+
+def test_search_fuzzy_tolera_errores(index):
+    resultados = index.search_fuzzy("ibuprofen0")
+    assert _ids(resultados)[:1] == [2]
+    assert 0.4 <= resultados[0][2] < 1.0
+
+
+def test_search_fuzzy_prefijo_vale_uno(index):
+    resultados = index.search_fuzzy("ibupro")
+    assert [(r[0], r[2]) for r in resultados] == [(2, 1.0)]
+
+
+def test_search_fuzzy_promedia_por_palabra(index):
+    # "paracetamol" coincide completo, "jarabe" con error: el promedio queda entre ambos
+    resultados = index.search_fuzzy("paracetamol jarave")
+    assert _ids(resultados) == [4]
+    assert 0.4 < resultados[0][2] < 1.0
+
+
+def test_search_fuzzy_ordena_por_calificacion_y_largo(index):
+    resultados = index.search_fuzzy("paracetamo1")
+    calificaciones = [r[2] for r in resultados]
+    assert calificaciones == sorted(calificaciones, reverse=True)
+    # Misma calificación: primero el texto más corto
+    assert _ids(resultados) == [1, 3, 4]
+
+
+def test_search_fuzzy_sin_coincidencias(index):
+    assert index.search_fuzzy("xyzwq") == []
+    assert index.search_fuzzy("   ") == []
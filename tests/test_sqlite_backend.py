@@ -0,0 +1,34 @@
+import pytest
+from db.backends.sqlite import fulltext_match, translate
+
+
+@pytest.mark.parametrize("mysql, sqlite", [
+    ("SELECT * FROM t WHERE a = %s AND b = %s", "SELECT * FROM t WHERE a = ? AND b = ?"),
+    ("SELECT * FROM t WHERE a = %(valor)s", "SELECT * FROM t WHERE a = :valor"),
+    ("id INT AUTO_INCREMENT PRIMARY KEY", "id INTEGER PRIMARY KEY AUTOINCREMENT"),
+    ("perfil ENUM('admin', 'cajero') NOT NULL", "perfil TEXT CHECK (perfil IN ('admin', 'cajero')) NOT NULL"),
+    ("user_name VARCHAR(50) NOT NULL UNIQUE", "user_name VARCHAR(50) COLLATE NOCASE NOT NULL UNIQUE"),
+    ("fecha DATE DEFAULT CURDATE()", "fecha DATE DEFAULT CURRENT_DATE"),
+    ("SELECT NOW()", "SELECT CURRENT_TIMESTAMP"),
+    ("SELECT * FROM t WHERE id IN (%s) FOR UPDATE", "SELECT * FROM t WHERE id IN (?)"),
+    ("DROP INDEX idx_a ON t", "DROP INDEX IF EXISTS idx_a"),
+    ("WHERE nombre LIKE %s", "WHERE nombre LIKE ? ESCAPE '\\'"),
+    ("WHERE MATCH(nombre) AGAINST (%s IN BOOLEAN MODE)", "WHERE fulltext_match(nombre, ?)"),
+])
+def test_translate(mysql, sqlite):
+    assert translate(mysql) == sqlite
+
+
+def test_translate_omite_fulltext_index():
+    assert translate("CREATE FULLTEXT INDEX ft_a ON t (nombre)") is None
+
+
+@pytest.mark.parametrize("texto, consulta, esperado", [
+    ("Juan Perez Lopez", "+juan* +per*", 2.0),
+    ("Juan Perez Lopez", "+juan* +garcia*", 0.0),
+    ("Juan Perez Lopez", "+juan* -lopez", 0.0),
+    ("Juan Perez Lopez", "juan", 1.0),
+    (None, "+juan*", 0.0),
+])
+def test_fulltext_match(texto, consulta, esperado):
+    assert fulltext_match(texto, consulta) == esperado
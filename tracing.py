@@ -0,0 +1,240 @@
+# tracing.py
+"""Trazas anidadas desde la acción en la interfaz hasta cada sentencia SQL.
+
+Con ``TRACE_FILE`` (o ``python app.py --trace ARCHIVO``) cada callback de Tk, cada
+método de DAO que toma una conexión y cada execute/commit queda registrado como
+un intervalo con su duración. El archivo usa el formato de eventos de Chrome: un
+``[`` seguido de un evento JSON por línea, que se abre directamente en
+https://ui.perfetto.dev o en chrome://tracing (el ``]`` final es opcional).
+
+Las tareas enviadas a ``db.async_dao`` se enlazan con una flecha al callback
+que las originó, aunque corran en otro hilo. Deshabilitado, el costo se reduce
+a revisar ``tracing.enabled``.
+"""
+import atexit
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Callable, List, Optional
+from config import Config
+from db import instrumentation
+from db.instrumentation import _compact
+
+# Callbacks de Tk que no se trazan: el sondeo de tareas cada ASYNC_POLL_MS llenaría
+# la traza; sus on_done/on_error se trazan por separado en BaseForm
+_UNTRACED = ('BaseForm._poll_future',)
+
+enabled = False
+_writer: Optional['TraceWriter'] = None
+_exit_registered = False
+_local = threading.local()
+_flow_ids = itertools.count(1)
+_NULL = nullcontext()
+
+
+def _now_us() -> float:
+    return time.perf_counter_ns() / 1000
+
+
+class TraceWriter:
+    """Escribe eventos de traza en un archivo, un evento por línea."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'w', encoding='utf-8')
+        self._file.write("[\n")
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._threads = set()
+
+    def emit(self, event: dict) -> None:
+        tid = threading.get_ident()
+        event['pid'] = self._pid
+        event['tid'] = tid
+        line = json.dumps(event, ensure_ascii=False, default=str)
+        with self._lock:
+            if self._file.closed:
+                return
+            if tid not in self._threads:
+                # Nombre del hilo (MainThread, dao_0, ...) para el visor
+                self._threads.add(tid)
+                self._file.write(json.dumps({
+                    'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': tid,
+                    'args': {'name': threading.current_thread().name},
+                }) + ",\n")
+            self._file.write(line + ",\n")
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def _stack() -> List['Span']:
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+class Span:
+    """Intervalo con nombre; al cerrarse se escribe como evento completo ("X")."""
+
+    __slots__ = ('name', 'cat', 'args', 'start')
+
+    def __init__(self, name: str, cat: str = 'app', **args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self) -> 'Span':
+        _stack().append(self)
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        fin = _now_us()
+        stack = _stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        writer = _writer
+        if writer is not None:
+            writer.emit({
+                'name': self.name, 'cat': self.cat, 'ph': 'X',
+                'ts': self.start, 'dur': fin - self.start, 'args': self.args,
+            })
+
+
+def span(name: str, cat: str = 'app', **args):
+    """Context manager que mide el bloque; no hace nada si el trazado está apagado."""
+    if not enabled:
+        return _NULL
+    return Span(name, cat, **args)
+
+
+def dao_span():
+    """Intervalo con el nombre del método de DAO que está tomando la conexión."""
+    if not enabled:
+        return _NULL
+    return Span(instrumentation.caller_method(), 'dao')
+
+
+def current() -> Optional[Span]:
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+def propagate(fn: Callable) -> Callable:
+    """Envuelve ``fn`` para que, al correr en otro hilo, quede enlazada al intervalo actual."""
+    if not enabled or current() is None:
+        return fn
+
+    flow = next(_flow_ids)
+    name = getattr(fn, '__qualname__', None) or repr(fn)
+    _emit_flow('s', flow)
+
+    def traced(*args, **kwargs):
+        with Span(name, 'async'):
+            _emit_flow('f', flow)
+            return fn(*args, **kwargs)
+
+    return traced
+
+
+def _emit_flow(phase: str, flow: int) -> None:
+    writer = _writer
+    if writer is not None:
+        event = {'name': 'async', 'cat': 'flow', 'ph': phase, 'id': flow, 'ts': _now_us()}
+        if phase == 'f':
+            event['bp'] = 'e'
+        writer.emit(event)
+
+
+class TracedCursor:
+    """Envuelve un cursor registrando un intervalo por cada execute/executemany."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        return self._trace(self._cursor.execute, operation, params, args, kwargs)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        return self._trace(self._cursor.executemany, operation, seq_params, args, kwargs)
+
+    def _trace(self, fn, operation, params, args, kwargs):
+        sql = _compact(operation)
+        # Solo la forma de los parámetros: los valores pueden traer datos personales
+        with Span(sql.split(' ', 1)[0].upper(), 'sql', sql=sql,
+                  params=instrumentation.params_shape(params)) as s:
+            result = fn(operation, params, *args, **kwargs)
+            s.args['rows'] = self._cursor.rowcount
+            return result
+
+
+def _install_tk_hook() -> None:
+    """Traza cada callback de Tk (botones, eventos, after) con el nombre de la función."""
+    try:
+        import tkinter
+    except ImportError:
+        return
+    original = tkinter.CallWrapper.__call__
+    if getattr(original, '_traced', False):
+        return
+
+    def __call__(self, *args):
+        name = getattr(self.func, '__qualname__', None)
+        if not enabled or name is None or name.startswith(_UNTRACED):
+            return original(self, *args)
+        with Span(name, 'tk'):
+            return original(self, *args)
+
+    __call__._traced = True
+    tkinter.CallWrapper.__call__ = __call__
+
+
+def enable(path: str) -> None:
+    """Empieza a escribir la traza en ``path``; se cierra al terminar el proceso."""
+    global enabled, _writer, _exit_registered
+    if _writer is not None:
+        disable()
+    _writer = TraceWriter(path)
+    _install_tk_hook()
+    enabled = True
+    if not _exit_registered:
+        _exit_registered = True
+        atexit.register(disable)
+
+
+def disable() -> None:
+    global enabled, _writer
+    enabled = False
+    writer, _writer = _writer, None
+    if writer is not None:
+        writer.close()
+
+
+def flush() -> None:
+    writer = _writer
+    if writer is not None:
+        writer.flush()
+
+
+if Config.TRACE_FILE:
+    enable(Config.TRACE_FILE)
@@ -1,19 +1,23 @@
-from .base_form import BaseForm
-from .frm_articulo import ArticuloForm
-from .frm_cliente import ClienteForm
-from .frm_compra import CompraForm
-from .frm_descuento import DescuentoForm
-from .frm_proveedor import ProveedorForm
-from. frm_user import UserForm
-from .frm_venta import VentaForm
+# Los formularios se cargan al primer uso (PEP 562) para que la ventana de inicio
+# de sesión no importe todos los DAOs al arrancar.
+_EXPORTS = {
+    "BaseForm": ".base_form",
+    "ArticuloForm": ".frm_articulo",
+    "ClienteForm": ".frm_cliente",
+    "CompraForm": ".frm_compra",
+    "DescuentoForm": ".frm_descuento",
+    "ProveedorForm": ".frm_proveedor",
+    "UserForm": ".frm_user",
+    "VentaForm": ".frm_venta",
+}
 
-__all__ = [
-    "BaseForm",
-    "ArticuloForm",
-    "ClienteForm",
-    "CompraForm",
-    "DescuentoForm",
-    "ProveedorForm",
-    "UserForm",
-    "VentaForm",
-]
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
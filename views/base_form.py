@@ -1,20 +1,38 @@
 import tkinter as tk
+from concurrent.futures import Future
 from tkinter import ttk, messagebox
-from typing import Optional
+from typing import Callable, Optional, Sequence, Union
 from config import Config
+from views.styles import THEME, setup_styles
+from db.async_dao import submit
+import profiling
+import tracing
 
 class BaseForm(tk.Toplevel):
+    # Cada cuánto se revisa si una tarea en segundo plano ya terminó (ms)
+    ASYNC_POLL_MS = 30
+
     def __init__(self, parent, title: str, width: int = 600, height: int = 400):
         super().__init__(parent)
+        self._busy = 0
+        self._pending_polls = set()
+        self._closed = False
+        # Solo activo si el formulario está en PROFILE_FORMS / --profile-form
+        self._profile = profiling.start_form(type(self).__name__)
         self.title(f"{Config.APP_TITLE} - {title}")
         self.geometry(f"{width}x{height}")
-        self.configure(bg=Config.THEME['bg'])
+        self.configure(bg=THEME['bg'])
         
         self.style = ttk.Style()
-        Config.setup_styles(self.style)
+        setup_styles(self.style)
         
         self._center_window()
         self.resizable(False, False)
+
+        # Cerrar con la "X" del gestor de ventanas destruye la ventana desde Tcl
+        # sin pasar por destroy(); la limpieza va en <Destroy> para cubrir ambos casos
+        self.protocol("WM_DELETE_WINDOW", self.destroy)
+        self.bind('<Destroy>', self._on_destroy, add='+')
     
     def _create_widgets(self):
         """Método que deben implementar las subclases para crear los widgets"""
@@ -29,6 +47,74 @@ class BaseForm(tk.Toplevel):
         y = (screen_height // 2) - (self.winfo_height() // 2)
         self.geometry(f"+{x}+{y}")
     
+    def run_async(self, task: Union[Future, Callable], on_done: Optional[Callable] = None,
+                  on_error: Optional[Callable] = None, widgets: Sequence[tk.Widget] = ()) -> Future:
+        """
+        Ejecuta ``task`` (un Future de ``AsyncDAO`` o una función sin argumentos) sin
+        bloquear la interfaz. Mientras corre, la ventana muestra el cursor de espera y
+        ``widgets`` quedan deshabilitados. Al terminar llama, en el hilo de Tk,
+        ``on_done(resultado)`` u ``on_error(excepción)`` (por omisión ``show_error``).
+        """
+        future = task if isinstance(task, Future) else submit(task)
+        estados = self._set_busy(widgets)
+        self._poll_future(future, on_done, on_error, estados)
+        return future
+
+    def _poll_future(self, future: Future, on_done, on_error, estados):
+        # Los resultados que lleguen después de cerrar la ventana se descartan
+        if self._closed or not self.winfo_exists():
+            return
+        if not future.done():
+            def again():
+                self._pending_polls.discard(after_id)
+                self._poll_future(future, on_done, on_error, estados)
+
+            after_id = self.after(self.ASYNC_POLL_MS, again)
+            self._pending_polls.add(after_id)
+            return
+
+        self._clear_busy(estados)
+        error = future.exception()
+        if error is not None:
+            if on_error:
+                with tracing.span(getattr(on_error, '__qualname__', 'on_error'), 'tk'):
+                    on_error(error)
+            else:
+                self.show_error(f"Error al consultar la base de datos: {error}")
+        elif on_done:
+            with tracing.span(getattr(on_done, '__qualname__', 'on_done'), 'tk'):
+                on_done(future.result())
+
+    def _set_busy(self, widgets: Sequence[tk.Widget]) -> dict:
+        """Activa el estado ocupado y devuelve el estado previo de cada widget."""
+        self._busy += 1
+        self.configure(cursor='watch')
+        estados = {}
+        for widget in widgets:
+            estados[widget] = str(widget.cget('state')) or 'normal'
+            widget.configure(state='disabled')
+        return estados
+
+    def _clear_busy(self, estados: dict):
+        self._busy -= 1
+        if not self._busy:
+            self.configure(cursor='')
+        for widget, estado in estados.items():
+            if widget.winfo_exists():
+                widget.configure(state=estado)
+
+    def _on_destroy(self, event):
+        # <Destroy> también llega por cada widget hijo; solo interesa la ventana
+        if event.widget is not self:
+            return
+        self._closed = True
+        for after_id in self._pending_polls:
+            self.after_cancel(after_id)
+        self._pending_polls.clear()
+        if self._profile is not None:
+            profiling.stop_form(self._profile)
+            self._profile = None
+    
     def show_error(self, message: str):
         """Muestra un mensaje de error"""
         messagebox.showerror("Error", message)
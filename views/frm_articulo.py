@@ -96,13 +96,24 @@ class ArticuloForm(BaseForm):
         if not term:
             return
         
+        aproximados = False
         try:
             # Attempt to search by ID if the term is numeric
             if term.isdigit():
                 articulo = self.dao.get_by_id(int(term))
                 articulos = [articulo] if articulo else []
+            elif len(term) < ArticuloDAO.MIN_SEARCH_LENGTH:
+                messagebox.showinfo(
+                    "Información",
+                    f"Escriba al menos {ArticuloDAO.MIN_SEARCH_LENGTH} caracteres para buscar"
+                )
+                return
             else:
                 articulos = self.dao.search(term)
+                if not articulos:
+                    # Sin coincidencia exacta: probablemente un error de captura
+                    articulos = self.dao.search_fuzzy(term)
+                    aproximados = True
         except Exception as e:
             messagebox.showerror("Error", f"Error al buscar artículos: {e}")
             return
@@ -112,11 +123,11 @@ class ArticuloForm(BaseForm):
             return
             
         # Mostrar resultados en diálogo de selección
-        self._show_search_results(articulos)
+        self._show_search_results(articulos, aproximados)
     
-    def _show_search_results(self, articulos):
+    def _show_search_results(self, articulos, aproximados: bool = False):
         dialog = tk.Toplevel(self)
-        dialog.title("Resultados de búsqueda")
+        dialog.title("Resultados aproximados" if aproximados else "Resultados de búsqueda")
         
         tree = ttk.Treeview(dialog, columns=('id', 'descripcion', 'precio'), show='headings')
         tree.heading('id', text='ID')
@@ -7,6 +7,7 @@ from models.user import User
 from db.compra_dao import CompraDAO
 from db.proveedor_dao import ProveedorDAO
 from db.articulo_dao import ArticuloDAO
+from db.async_dao import AsyncDAO
 from views.base_form import BaseForm
 
 class CompraForm(BaseForm):
@@ -16,6 +17,7 @@ class CompraForm(BaseForm):
         self._setup_permissions()
         self.compra_dao = CompraDAO()
         self.proveedor_dao = ProveedorDAO()
+        self.async_proveedor_dao = AsyncDAO(self.proveedor_dao)
         self.articulo_dao = ArticuloDAO()
         self.compra = None
         self.folio = folio
@@ -101,7 +103,9 @@ class CompraForm(BaseForm):
             self.delete_btn.pack(side='left', padx=5)
     
     def _load_proveedores(self):
-        proveedores = self.proveedor_dao.get_all()
+        self.run_async(self.async_proveedor_dao.get_all(), on_done=self._show_proveedores)
+    
+    def _show_proveedores(self, proveedores):
         self.proveedores = {f"{p.nombre} - {p.empresa}": p.proveedor_id for p in proveedores}
         self.proveedor_combo['values'] = list(self.proveedores.keys())
         
@@ -248,11 +252,16 @@ class CompraForm(BaseForm):
             if not self.compra_dao.save_detalle(compra.folio, detalle):
                 self.show_error("Error al guardar detalles de compra")
                 return
-            
-            # Actualizar stock
-            if not self.articulo_dao.update_stock(detalle['articulo_id'], detalle['cantidad']):
-                self.show_error("Error al actualizar stock")
-                return
+        
+        # Actualizar stock de todos los artículos en una sola transacción
+        deltas: Dict[int, int] = {}
+        for detalle in self.detalles:
+            deltas[detalle['articulo_id']] = deltas.get(detalle['articulo_id'], 0) + detalle['cantidad']
+        
+        rechazados = self.articulo_dao.update_stock_many(deltas)
+        if rechazados:
+            self.show_error(f"Error al actualizar stock de los artículos: {', '.join(map(str, rechazados))}")
+            return
         
         self.show_success(f"Compra {'actualizada' if self.folio else 'registrada'} correctamente")
         self.destroy()
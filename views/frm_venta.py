@@ -1,3 +1,4 @@
+import copy
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import date
@@ -9,6 +10,7 @@ from db.cliente_dao import ClienteDAO
 from db.articulo_dao import ArticuloDAO
 from db.proveedor_dao import ProveedorDAO
 from db.descuento_dao import DescuentoDAO
+from db.async_dao import AsyncDAO
 from views.base_form import BaseForm
 from decimal import Decimal  # Add this import at the top of the file
 
@@ -21,6 +23,9 @@ class VentaForm(BaseForm):
         self.articulo_dao = ArticuloDAO()
         self.proveedor_dao = ProveedorDAO()
         self.descuento_dao = DescuentoDAO()
+        self.async_venta_dao = AsyncDAO(self.venta_dao)
+        self.async_cliente_dao = AsyncDAO(self.cliente_dao)
+        self.async_proveedor_dao = AsyncDAO(self.proveedor_dao)
         
         self.venta = Venta(
             fecha=date.today(),
@@ -28,6 +33,7 @@ class VentaForm(BaseForm):
         )
         self.detalles: List[Dict] = []
         self.articulos_disponibles: List[Dict] = []
+        self.descuentos_disponibles = []
         
         self._create_widgets()
         self._setup_permissions()
@@ -190,15 +196,18 @@ class VentaForm(BaseForm):
 
         self.cancel_btn.pack(side='left', padx=5)
         
-        ttk.Button(
+        self.registrar_btn = ttk.Button(
             action_frame, 
             text="Registrar Venta", 
             command=self._registrar_venta,
             style='Accent.TButton'
-        ).pack(side='left', padx=5)
+        )
+        self.registrar_btn.pack(side='left', padx=5)
     
     def _load_proveedores(self):
-        proveedores = self.proveedor_dao.get_all()
+        self.run_async(self.async_proveedor_dao.get_all(), on_done=self._show_proveedores)
+    
+    def _show_proveedores(self, proveedores):
         self.proveedores = {f"{p.nombre} - {p.empresa}": p.proveedor_id for p in proveedores}
         self.proveedor_combo['values'] = list(self.proveedores.keys())
         
@@ -231,10 +240,12 @@ class VentaForm(BaseForm):
     def _load_clientes(self):
         """Carga los clientes en el combobox según el perfil del usuario."""
         if self.user.perfil == 'admin':
-            clientes = self.cliente_dao.get_all()
+            future = self.async_cliente_dao.get_all()
         else:
-            clientes = self.cliente_dao.search_by_user(self.user.usuario_id)
-        
+            future = self.async_cliente_dao.search_by_user(self.user.usuario_id)
+        self.run_async(future, on_done=self._show_clientes)
+    
+    def _show_clientes(self, clientes):
         self.clientes = {f"{c.nombre} - {c.rfc}": c for c in clientes}
         self.cliente_combo['values'] = list(self.clientes.keys())
         
@@ -262,7 +273,14 @@ class VentaForm(BaseForm):
             return
         
         folio = int(folio_str)
-        venta = self.venta_dao.get(folio)
+        # Encabezado, cliente y líneas en una sola consulta
+        self.run_async(
+            self.async_venta_dao.get_full(folio),
+            on_done=lambda venta: self._show_venta(folio, venta),
+            widgets=[self.buscar_btn]
+        )
+    
+    def _show_venta(self, folio: int, venta: Optional[Dict]):
         if not venta:
             messagebox.showerror("Error", f"No se encontró la venta con folio {folio}")
             return
@@ -274,12 +292,12 @@ class VentaForm(BaseForm):
         self.venta.cliente_id = venta['clienteid']
         
         # Actualizar cliente
-        cliente = self.cliente_dao.get(self.venta.cliente_id)
+        cliente = venta['cliente']
         self.cliente_combo.set(f"{cliente.nombre} - {cliente.rfc}")
         self._on_cliente_selected()
         
         # Cargar detalles de la venta
-        self.detalles = self.venta_dao.get_detalles(folio)
+        self.detalles = venta['detalles']
         self._actualizar_lista_articulos()
         
         # Calcular subtotal, IVA y total
@@ -390,6 +408,7 @@ class VentaForm(BaseForm):
             cliente = self.cliente_dao.get(self.venta.cliente_id)
             if cliente and hasattr(cliente, 'puntos'):
                 descuentos = self.descuento_dao.get_for_puntos(cliente.puntos)
+                self.descuentos_disponibles = descuentos
                 
                 self.descuento_combo['values'] = [
                     f"{d.porcentaje_descuento}% (requiere {d.puntos_minimos}-{d.puntos_maximos} puntos)"
@@ -421,12 +440,9 @@ class VentaForm(BaseForm):
             self.iva_label.config(text=f"${iva:.2f}")
             self.total_label.config(text=f"${total:.2f}", font=('Arial', 10, 'bold'))
             
-            # Guardar el descuento aplicado
-            descuentos = self.descuento_dao.get_all()
-            selected = next(
-                (d for d in descuentos if f"{d.porcentaje_descuento}%" in descuento_str),
-                None
-            )
+            # Guardar el descuento aplicado (mismo orden que las opciones del combo)
+            index = self.descuento_combo.current()
+            selected = self.descuentos_disponibles[index] if 0 <= index < len(self.descuentos_disponibles) else None
             self.venta.descuento_id = selected.descuento_id if selected else None
         except:
             self._update_totales()
@@ -461,19 +477,27 @@ class VentaForm(BaseForm):
         # Calcular puntos (1 punto por cada 10 centavos, sin contar descuentos)
         self.venta.puntos = int(self.venta.subtotal * 10)
         
-        try:
-            # Registrar o actualizar la venta
-            if self.venta.folio:
-                if not self.venta_dao.update(self.venta):
-                    raise Exception("No se pudo actualizar la venta")
-            else:
-                if not self.venta_dao.save(self.venta):
-                    raise Exception("No se pudo guardar la venta")
+        # El hilo de la base de datos trabaja sobre una copia: la lista sigue siendo
+        # editable mientras se guarda y lo registrado debe ser lo que se confirmó
+        venta = copy.deepcopy(self.venta)
+        detalles = copy.deepcopy(self.detalles)
+        self.run_async(
+            lambda: self._guardar_venta(venta, detalles),
+            on_done=lambda guardada: self._venta_registrada(guardada, cambio),
+            on_error=lambda e: messagebox.showerror("Error", f"No se pudo completar la venta: {str(e)}"),
+            widgets=[self.registrar_btn, self.buscar_btn]
+        )
+    
+    def _guardar_venta(self, venta: Venta, detalles: List[Dict]) -> Venta:
+        """Registra o actualiza la venta (se ejecuta fuera del hilo de Tk) y la devuelve con su folio."""
+        if venta.folio:
+            if not self.venta_dao.update(venta):
+                raise Exception("No se pudo actualizar la venta")
             
             # Registrar los detalles
-            for detalle in self.detalles:
+            for detalle in detalles:
                 det = {
-                    'folio': self.venta.folio,
+                    'folio': venta.folio,
                     'articulo_id': detalle['articulo_id'],
                     'cantidad': detalle['cantidad'],
                 }
@@ -484,11 +508,16 @@ class VentaForm(BaseForm):
                 # Actualizar stock
                 if not self.articulo_dao.update_stock(det['articulo_id'], -det['cantidad']):
                     raise Exception("No se pudo actualizar el stock")
-            
-            messagebox.showinfo("Éxito", f"Venta registrada con folio: {self.venta.folio}\nCambio: ${cambio:.2f}")
-            self.destroy()
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo completar la venta: {str(e)}")
+        else:
+            # Encabezado, detalles y stock en una sola transacción
+            if not self.venta_dao.checkout(venta, detalles):
+                raise Exception("No se pudo guardar la venta (verifique existencias)")
+        return venta
+    
+    def _venta_registrada(self, venta: Venta, cambio: float):
+        self.venta.folio = venta.folio
+        messagebox.showinfo("Éxito", f"Venta registrada con folio: {venta.folio}\nCambio: ${cambio:.2f}")
+        self.destroy()
     
     def _eliminar_venta(self):
         """Elimina una venta y sus detalles."""
@@ -0,0 +1,38 @@
+# views/styles.py (farmacia)
+from tkinter import ttk
+from typing import TypedDict
+
+class ThemeConfig(TypedDict):
+    bg: str
+    fg: str
+    font: tuple[str, int]
+    button_bg: str
+    button_fg: str
+    error: str
+    success: str
+
+THEME: ThemeConfig = {
+    'bg': '#1E1E1E',
+    'fg': '#E0E0E0',
+    'font': ('Segoe UI', 11),
+    'button_bg': '#4CAF50',  # Verde farmacia
+    'button_fg': '#000000',
+    'error': '#FF5252',
+    'success': '#69F0AE',
+    'warning': '#FFD740',
+    'accent': '#8BC34A',     # Verde claro
+    'border': '#424242',
+}
+
+def setup_styles(style: ttk.Style) -> None:
+    style.configure('TFrame', background=THEME['bg'])
+    style.configure('TLabel', 
+                  background=THEME['bg'],
+                  foreground=THEME['fg'],
+                  font=THEME['font'])
+    style.configure('TButton',
+                  background=THEME['button_bg'],
+                  foreground=THEME['button_fg'],
+                  font=THEME['font'])
+    style.configure('Error.TLabel', foreground=THEME['error'])
+    style.configure('Success.TLabel', foreground=THEME['success'])